@@ -10,10 +10,61 @@ Source: https://github.com/sdp8483/windaq3
 '''
 
 #!/usr/bin/python
+import os
+import mmap
 import struct
 import datetime
+import functools
+import collections
 import numpy
 
+# event marker record in the trailer: bit 31 of the marker long flags a following time and date stamp long,
+# bit 30 flags a following event marker comment pointer long, bits 0-29 hold the ADC data point location
+_EVENT_STAMPED  = 1 << 31
+_EVENT_COMMENT  = 1 << 30
+_EVENT_LOCATION = (1 << 30) - 1
+EVENT_DTYPE = numpy.dtype([('index', '<i8'), ('timestamp', '<i8'), ('comment', object)])
+
+WindaqInfo = collections.namedtuple('WindaqInfo', ['nChannels', 'sampleRate', 'duration', 'annotations', 'fileCreated'])
+
+def probe(filename):
+    ''' return a WindaqInfo summary (channel count, per channel sample rate in Hz, duration in seconds,
+        channel annotations and creation time) reading only the header and the annotation block.
+        Results are cached per (path, modification time, size) so probing the same file again is free
+    '''
+    stat = os.stat(filename)
+    return _probe(os.path.abspath(filename), stat.st_mtime_ns, stat.st_size)
+
+@functools.lru_cache(maxsize=64)
+def _probe(filename, mtime, size):
+    ''' read the header fields windaq.__init__ reads, then seek straight past the data and trailer to the annotations '''
+    with open(filename, 'rb') as file:
+        head = file.read(8)
+        headSize = struct.unpack_from("<h", head, 6)[0]
+        head += file.read(headSize - len(head))
+
+        if struct.unpack_from("B", head, 1)[0]:                                                         # max channels >= 144
+            nChannels = struct.unpack_from("B", head, 0)[0]
+        else:
+            nChannels = struct.unpack_from("B", head, 0)[0] & 31
+        dataSize    = struct.unpack_from("<L", head, 8)[0]
+        trailerSize = struct.unpack_from("<L", head, 12)[0]
+        annoSize    = struct.unpack_from("<H", head, 16)[0]
+        timeStep    = struct.unpack_from("<d", head, 28)[0]
+        e14         = struct.unpack_from("<l", head, 36)[0]
+
+        file.seek(headSize + dataSize + trailerSize)
+        annotations = file.read(annoSize).decode("utf-8", errors="replace").split('\x00')
+
+    nSample = dataSize / (2 * nChannels)
+    return WindaqInfo(
+        nChannels   = nChannels,
+        sampleRate  = 1 / timeStep,
+        duration    = int(nSample) * timeStep,
+        annotations = (annotations + [''] * nChannels)[:nChannels],
+        fileCreated = datetime.datetime.fromtimestamp(e14).strftime('%Y-%m-%d %H:%M:%S'),
+    )
+
 class windaq(object):
     '''
     Read windaq files (.wdq extension) without having to convert them to .csv or other human readable text
@@ -22,8 +73,12 @@ class windaq(object):
     and python library https://www.socsci.ru.nl/wilberth/python/wdq.py that does not appear to support the .wdq files created by WINDAQ/PRO+
     '''
 
-    def __init__(self, filename):
-        ''' Define data types based off convention used in documentation from Dataq '''
+    def __init__(self, filename, use_mmap=True):
+        ''' Define data types based off convention used in documentation from Dataq
+
+            use_mmap: map the file into memory instead of reading it. Only the header and channel tables are
+                      touched up front, channel data is paged in from disk as it is accessed.
+        '''
         UI = "<H" # unsigned integer, little endian
         I  = "<h" # integer, little endian
         B  = "B"  # unsigned byte, kind of redundant but lets keep consistent with the documentation
@@ -34,7 +89,10 @@ class windaq(object):
 
         ''' Open file as binary '''
         with open(filename, 'rb') as self._file:
-            self._fcontents = self._file.read()
+            if use_mmap:
+                self._fcontents = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)    # mapping stays valid after the file is closed
+            else:
+                self._fcontents = self._file.read()
 
         ''' Read Header Info '''
         if (struct.unpack_from(B, self._fcontents, 1)[0]):                                              # max channels >= 144
@@ -82,21 +140,42 @@ class windaq(object):
 
         ''' read user annotations '''
         aOffset = self._headSize + self._dataSize + self._trailerSize
-        aTemp = ''
-        for i in range(0, self._annoSize):
-            aTemp += struct.unpack_from('c', self._fcontents, aOffset + i)[0].decode("utf-8")
-        self._annotations = aTemp.split('\x00')
-        #create a numpy view into the data for efficient reading
+        self._annotations = bytes(self._fcontents[aOffset:aOffset + self._annoSize]).decode("utf-8", errors="replace").split('\x00')
+        self._commentOffset = aOffset + self._annoSize                                                  # event marker comment text follows the user annotations
+        self._eventMarkers = None                                                                       # trailer is parsed on first call to event_markers()
+        #create a numpy view into the data for efficient reading (no copy, backed by the file mapping when use_mmap is set)
         dt = numpy.dtype(numpy.int16)
         dt = dt.newbyteorder('<')
         self.npdata =  numpy.frombuffer(self._fcontents, dtype=dt,count = int(self.nSample*self.nChannels),offset = self._headSize)
 
-    def data(self, channelNumber):
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def close(self):
+        ''' release the file mapping, if any. Channel views handed out earlier keep it alive until they are freed '''
+        self.npdata = None
+        if isinstance(self._fcontents, mmap.mmap):
+            try:
+                self._fcontents.close()
+            except BufferError:
+                pass                                    # a view is still exported, the mapping is released when it is garbage collected
+
+    def raw(self, channelNumber, start=None, stop=None):
+        ''' return a strided int16 view of the requested channel without copying or calibrating.
+            start and stop are sample indices, only the pages holding those samples are read from disk
+        '''
+        return self.npdata[(channelNumber-1)::self.nChannels][start:stop]
+
+    def data(self, channelNumber, start=None, stop=None):
         ''' return the data for the channel requested
             data format is saved CH1tonChannels one sample at a time.
             each sample is read as a 16bit word and then shifted to a 14bit value
+            start and stop optionally limit the result to a range of sample indices
         '''
-        data = self.npdata[(channelNumber-1)::self.nChannels]
+        data = self.raw(channelNumber, start, stop)
         if self._HiRes:
             temp = data * 0.25            # multiply by 0.25 for HiRes data
         else:
@@ -106,6 +185,94 @@ class windaq(object):
 
         return temp2
 
+    def data_many(self, channelNumbers):
+        ''' return the calibrated float32 data for several channels as a contiguous (samples, channels) array
+            the interleaved buffer is de-interleaved in a single vectorized pass instead of one strided pass per channel
+        '''
+        channelNumbers = list(channelNumbers)
+        columns = numpy.asarray(channelNumbers) - 1
+        return self._calibrate(self._scans()[:, columns], channelNumbers)
+
+    def to_array(self):
+        ''' return the calibrated float32 data for all channels as a contiguous (samples, nChannels) array '''
+        return self.data_many(range(1, self.nChannels + 1))
+
+    def iter_chunks(self, channels, chunk_samples=1000000):
+        ''' yield calibrated float32 blocks of at most chunk_samples samples for the requested channel(s)
+            channels may be a single channel number, giving 1-D blocks, or a list of channel numbers,
+            giving (samples, channels) blocks. Memory use is bounded by the chunk size, not the file size
+        '''
+        single = numpy.isscalar(channels)
+        channelNumbers = [channels] if single else list(channels)
+        columns = numpy.asarray(channelNumbers) - 1
+        scans = self._scans()
+        for start in range(0, scans.shape[0], chunk_samples):
+            block = self._calibrate(scans[start:start + chunk_samples, columns], channelNumbers)
+            yield block[:, 0] if single else block
+
+    def _scans(self):
+        ''' view of the interleaved data with one row per sample and one column per channel '''
+        n = int(self.nSample)
+        return self.npdata[:n*self.nChannels].reshape(n, self.nChannels)
+
+    def _calibrate(self, counts, channelNumbers):
+        ''' convert raw int16 counts (one column per entry of channelNumbers) to calibrated float32 values '''
+        if self._HiRes:
+            values = counts.astype(numpy.float32, order='C')
+            values *= numpy.float32(0.25)                           # multiply by 0.25 for HiRes data
+        else:
+            values = numpy.right_shift(counts, 2).astype(numpy.float32, order='C')    # arithmetic shift, same as floor(data*0.25)
+        columns = numpy.asarray(channelNumbers) - 1
+        values *= numpy.asarray(self.calScaling, dtype=numpy.float32)[columns]
+        values += numpy.asarray(self.calIntercept, dtype=numpy.float32)[columns]
+        return values
+
+    def event_markers(self):
+        ''' return the event markers stored in the trailer as a structured array of EVENT_DTYPE
+            index: sample index (per channel) the marker points to
+            timestamp: time and date stamp in seconds since jan 1 1970, -1 if the marker has none
+            comment: event marker comment text, None if the marker has none
+        '''
+        if self._eventMarkers is None:
+            self._eventMarkers = self._parse_trailer()
+        return self._eventMarkers
+
+    def _parse_trailer(self):
+        ''' decode the whole trailer at once instead of walking it one record at a time.
+            records are 1-3 longs long, but stamps never have bit 31 set and comment pointers never have bits 30/31 set,
+            so the role of every long can be worked out from its predecessors with shifted masks
+        '''
+        words = numpy.frombuffer(self._fcontents, dtype='<u4', count=self._trailerSize // 4, offset=self._headSize + self._dataSize)
+        stamped = (words & _EVENT_STAMPED) != 0
+        isStamp = numpy.zeros(len(words), dtype=bool)
+        isStamp[1:] = stamped[:-1]
+        hasComment = ((words & _EVENT_COMMENT) != 0) & ~isStamp
+        isPointer = numpy.zeros(len(words), dtype=bool)
+        isPointer[1:] |= (hasComment & ~stamped)[:-1]                                              # marker, pointer
+        isPointer[2:] |= (hasComment & stamped)[:-2]                                               # marker, stamp, pointer
+        isMarker = ~(isStamp | isPointer)
+
+        positions = numpy.flatnonzero(isMarker)
+        markerWords = words[positions]
+        markerStamped = stamped[positions]
+        markerCommented = hasComment[positions]
+
+        markers = numpy.empty(len(positions), dtype=EVENT_DTYPE)
+        markers['index'] = (markerWords & _EVENT_LOCATION) // self.nChannels                           # ADC data point -> sample per channel
+        markers['timestamp'] = -1
+        markers['timestamp'][markerStamped] = words[positions[markerStamped] + 1]
+        markers['comment'] = None
+
+        if markerCommented.any():
+            pointers = words[positions[markerCommented] + 1 + markerStamped[markerCommented]].astype(numpy.int64)
+            block = numpy.frombuffer(self._fcontents, dtype=numpy.uint8, offset=min(self._commentOffset, len(self._fcontents)))
+            nulls = numpy.append(numpy.flatnonzero(block == 0), len(block))                    # comments are null terminated
+            ends = nulls[numpy.searchsorted(nulls, pointers)]
+            raw = bytes(block)
+            markers['comment'][markerCommented] = [raw[a:b].decode("utf-8", errors="replace") for a, b in zip(pointers, ends)]
+
+        return markers
+
     def time(self):
         ''' return time '''
         
@@ -181,10 +181,13 @@ def wdq_parser(bug_id: str, label_df: pd.DataFrame):
                 else:
                     return f"{bug_id}: Channel not found"
 
-        df = pd.DataFrame(columns=["time", "pre_rect", "post_rect", "labels"])
-        df["time"] = daq.time().astype("float32").round(3)
-        df["pre_rect"] = daq.data(channel_id - 1).astype("float32")
-        df["post_rect"] = daq.data(channel_id).astype("float32")
+        # de-interleave both channels in one pass, already calibrated float32
+        volts = daq.data_many([channel_id - 1, channel_id])
+        df = pd.DataFrame({
+            "time": daq.time().astype("float32").round(3),
+            "pre_rect": volts[:, 0],
+            "post_rect": volts[:, 1],
+        })
 
         # Get label data for this bug ID
         bug_labels = label_df[label_df["insectno"] == csv_id]
@@ -1,5 +1,6 @@
 import os
 import pandas as pd
+import pyarrow.parquet as pq
 from pathlib import Path
 from typing import Union, Optional
 from collections import Counter
@@ -54,7 +55,9 @@ def import_data(
             df = pd.read_csv(filepath, index_col=0, engine="pyarrow")
             df.drop(columns=["post_rect"], errors="ignore", inplace=True)
         elif filepath.endswith(".parquet"):
-            df = pd.read_parquet(filepath, columns=["time", "pre_rect", "labels"], engine="pyarrow")
+            # files saved from the GUI call the voltage column "voltage"
+            voltage = "voltage" if "voltage" in pq.read_schema(filepath).names else "pre_rect"
+            df = pd.read_parquet(filepath, columns=["time", voltage, "labels"], engine="pyarrow")
             df.reset_index(drop=True, inplace=True)
         else:
             return None
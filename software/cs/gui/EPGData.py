@@ -1,9 +1,16 @@
-from pandas import read_csv, DataFrame
+from pandas import DataFrame
 import numpy as np
 import pandas as pd
 import re
 import windaq
+from LabelIntervals import LabelIntervals
+from EditJournal import EditJournal, LabelEdit
+from RecordingCache import RecordingCache
+from settings import settings
 import os
+import pyarrow as pa
+import pyarrow.csv as pa_csv
+import pyarrow.parquet as pq
 
 
 class EPGData:
@@ -12,7 +19,18 @@ class EPGData:
     """
 
     def __init__(self):
-        self.dfs = {}  # A dictionary of filename : pandas dataframe objects
+        # A dictionary of filename : pandas dataframe objects, bounded by the
+        # recording cache budget. The file on screen is never evicted.
+        self.dfs = RecordingCache(
+            settings.get("recording_cache_mb") * 1024 ** 2,
+            pinned=lambda file: file == self.current_file,
+        )
+        self.channel_indices = {}  # filename : WinDaq channel it was loaded from
+        self.label_intervals = {}  # filename : LabelIntervals, the source of truth for labels
+        self.comments = {}  # filename : {row : comment text}, only the commented rows
+        self.versions = {}  # filename : number of edits made since it was loaded
+        self.journal = EditJournal(settings.get("undo_history_mb") * 1024 ** 2)  # undo/redo history of label and comment edits
+        self.stale_labels = {}  # filename : (start, end) time span where its dense labels column lags label_intervals, None for all of it
         self.label_column = "labels"
         self.probe_column = "probes"
         #self.prepost_suffix = "_rect"
@@ -26,83 +44,33 @@ class EPGData:
         #     r"Data\Sharpshooter Data - HPR 2017\sharpshooter_labeled\sharpshooter_a01_labeled.csv"
         #     #r"/Users/cole/coding/bugs2025/USDA-Auburn-Su25/GUI/test_sharpshooter.csv"
         # )          
+        settings.settingChanged.connect(self.on_setting_changed)
+
+    def on_setting_changed(self, key: str, value):
+        if key == "recording_cache_mb":
+            self.dfs.set_budget(value * 1024 ** 2)
+        elif key == "undo_history_mb":
+            self.journal.set_budget(value * 1024 ** 2)
 
     def load_data(self, file, channel_index: int = None):
         """
-        load_data takes in either a Windaq or CSV file, converts it
+        load_data takes in either a Windaq, CSV or Parquet file, converts it
         into a pandas dataframe, and makes it available for use
         Inputs:
-                files: a filenames (either .DAQ or .csv) as a string
+                files: a filenames (either .DAQ, .csv or .parquet) as a string
         Returns:
                 True if successful, False otherwise
         """
         import time
         start_time = time.perf_counter()
 
-        if re.search(r"\.(WDQ|DAQ|WDH)$", file, re.IGNORECASE):
-            windaq_file = windaq.windaq(file)
-            # TODO: don't hardcode channel count and names
-            # TODO: add event markers as column
-            df = DataFrame(
-                # {
-                #     "time": windaq_file.time(),
-                #     "pre_rect": windaq_file.data(1),
-                #     "post_rect": windaq_file.data(2),
-                # }
-                {
-                    "time": windaq_file.time(),
-                    "voltage": windaq_file.data(channel_index),
-                }
-            )
-            # This will overwrite if there are multiple
-            # markers pointing to the same index
-            comments = [None for i in range(len(df))]
-            # for event in windaq_file.eventmarkers:
-            #     if "comment" in event:
-            #         comments[event["index"]] = event["comment"]
-            #     elif "timestamp" in event:
-            #         comments[event["index"]] = event["timestamp"]
-            #     else:
-            #         comments[event["index"]] = ""
-            df["comments"] = comments
-
-            labels = [None for i in range(len(df))]
-            df["labels"] = labels
-            self.dfs[file] = df
-        elif re.search(r"\.csv$", file, re.IGNORECASE):
-            full_path = os.path.join(self.dir_path, file)
-            try:
-                # self.dfs[file]
-                orig_df = read_csv(full_path, engine="pyarrow")
-                self.dfs[file] = pd.DataFrame(columns=["time", "voltage", "labels", "comments"])
-
-                if 'time' not in orig_df.columns:
-                    raise ValueError("No Time Data")
-                else:
-                    self.dfs[file]['time'] = orig_df['time']
-                
-                if 'voltage' not in orig_df.columns:
-                    if 'pre_rect' in orig_df.columns:
-                        self.dfs[file]['voltage'] = orig_df['pre_rect']
-                    else:
-                        raise ValueError("No Voltage Data")
-                else:
-                    self.dfs[file]['voltage'] = orig_df['voltage']
-                
-                if 'labels' in orig_df.columns:
-                    self.dfs[file]['labels'] = orig_df['labels']
-                else:
-                    self.dfs[file]['labels'] = np.nan
-
-                if 'comments' in orig_df.columns:
-                    self.dfs[file]['comments'] = orig_df['comments']
-                else:
-                    self.dfs[file]['comments'] = np.nan
-
-            except FileNotFoundError:
-                print(f"Could not find {full_path}")
-                return False
-        else:
+        full_path = os.path.join(self.dir_path, file)
+        try:
+            df, comments = self.read_recording(file, channel_index)
+        except FileNotFoundError:
+            print(f"Could not find {full_path}")
+            return False
+        if df is None:
             # unknown file extension
             print(f"Unknown file extension for: {file}")
             return False
@@ -110,13 +78,195 @@ class EPGData:
         print(f"Data loaded in {time.perf_counter() - start_time:.4f}s")
 
         self.current_file = file
-        if not self.label_column in self.dfs[file]:
-            self.dfs[file][self.label_column] = np.nan
+        self.channel_indices[file] = channel_index
+        # unmodified recordings are evicted by dropping them and re-reading the file
+        self.dfs.add(file, df, reload=lambda: self.read_recording(file, channel_index)[0])
+        self.comments[file] = comments
+        labels = df[self.label_column].array
+        self.label_intervals[file] = LabelIntervals.from_codes(df["time"].values, labels.codes, labels.categories)
+        self.stale_labels.pop(file, None)
+        self.journal.forget(file)
         return True
 
+    def read_recording(self, file, channel_index: int = None) -> tuple[DataFrame, dict]:
+        """
+        read_recording reads a Windaq, CSV or Parquet file from disk
+        into a dataframe with time, voltage and labels columns, and its
+        comments. Comments are kept out of the dataframe since only a
+        handful of rows carry one.
+        Inputs:
+                file: a filename (either .DAQ, .csv or .parquet) as a string
+                channel_index: the WinDaq channel to read as voltage
+        Returns:
+                the dataframe and a dict of row : comment text, or
+                (None, None) if the file type is unknown
+        """
+        if re.search(r"\.(WDQ|DAQ|WDH)$", file, re.IGNORECASE):
+            # everything kept is computed into new arrays, so the file mapping
+            # can be released (and the file unlocked on Windows) right away
+            with windaq.windaq(file) as windaq_file:
+                # TODO: don't hardcode channel count and names
+                df = DataFrame(
+                    # {
+                    #     "time": windaq_file.time(),
+                    #     "pre_rect": windaq_file.data(1),
+                    #     "post_rect": windaq_file.data(2),
+                    # }
+                    {
+                        "time": windaq_file.time(),
+                        "voltage": windaq_file.data(channel_index),
+                    }
+                )
+                comments = self.event_marker_comments(windaq_file, len(df))
+            df["labels"] = None
+        elif re.search(r"\.csv$", file, re.IGNORECASE):
+            df = self.read_csv(os.path.join(self.dir_path, file))
+            comments = self.sparse_comments(df.pop("comments"))
+        elif re.search(r"\.parquet$", file, re.IGNORECASE):
+            df = self.read_parquet(os.path.join(self.dir_path, file))
+            comments = self.sparse_comments(df.pop("comments"))
+        else:
+            return None, None
+
+        if not self.label_column in df:
+            df[self.label_column] = np.nan
+        df[self.label_column] = self.to_label_categorical(df[self.label_column])
+        return df, comments
+
+    def mark_modified(self, file: str) -> None:
+        """
+        mark_modified records that a recording was edited (its labels or
+        comments), bumping its version and making the cache spill it
+        instead of re-reading it.
+        Inputs:
+                file: string containing the key of the recording
+        Returns:
+                None
+        """
+        self.versions[file] = self.versions.get(file, 0) + 1
+        self.dfs.mark_modified(file)
+
+    def version(self, file: str) -> int:
+        """
+        version returns a counter that changes whenever file is edited,
+        so views can tell in O(1) whether anything happened since they
+        last saved.
+        Inputs:
+                file: string containing the key of the recording
+        Returns:
+                the number of edits made to file
+        """
+        return self.versions.get(file, 0)
+
+    @staticmethod
+    def to_label_categorical(labels) -> pd.Categorical:
+        """
+        to_label_categorical stores labels as small integer codes into a
+        label dictionary. Missing labels (None / NaN) get code -1.
+        Inputs:
+                labels: an array, Series or Categorical of label strings
+        Returns:
+                a pandas Categorical of the labels
+        """
+        if isinstance(labels, pd.Series):
+            labels = labels.array
+        if isinstance(labels, pd.Categorical):
+            return labels.remove_unused_categories()
+        return pd.Categorical(labels)
+
+    def event_marker_comments(self, windaq_file, length: int) -> dict:
+        """
+        event_marker_comments turns the event markers of a WinDaq file
+        into comments.
+        Inputs:
+                windaq_file: an open windaq.windaq object
+                length: number of rows in the recording
+        Returns:
+                a dict of row : comment text with an entry per marked
+                row (the marker's comment, else its time stamp, else "")
+        """
+        comments = {}
+        markers = windaq_file.event_markers()
+        markers = markers[(markers["index"] >= 0) & (markers["index"] < length)]
+        if len(markers) == 0:
+            return comments
+
+        stamps = pd.to_datetime(np.maximum(markers["timestamp"], 0), unit="s").strftime("%Y-%m-%d %H:%M:%S")
+        text = np.where(markers["timestamp"] >= 0, np.asarray(stamps, dtype=object), "")
+        has_comment = ~pd.isna(markers["comment"])
+        text[has_comment] = markers["comment"][has_comment]
+
+        # the last marker wins if several point to the same index
+        comments.update(zip(markers["index"].tolist(), text.tolist()))
+        return comments
+
+    @staticmethod
+    def sparse_comments(column) -> dict:
+        """
+        sparse_comments picks the commented rows out of a dense comments
+        column, as read from a CSV or Parquet file.
+        Inputs:
+                column: a Series of comment texts, null where there is none
+        Returns:
+                a dict of row : comment text
+        """
+        rows = np.flatnonzero(column.notna().to_numpy())
+        return dict(zip(rows.tolist(), column.to_numpy()[rows].tolist()))
+
+    def get_comment(self, file: str, row: int):
+        """
+        get_comment returns the comment at a row of file, or None.
+        """
+        return self.comments[file].get(row)
+
+    def set_comment(self, file: str, row: int, text) -> None:
+        """
+        set_comment adds, replaces or (with text None) removes the
+        comment at a row of file.
+        Inputs:
+                file: string containing the key of the recording
+                row: position of the sample in the recording
+                text: the comment, or None to remove it
+        Returns:
+                None
+        """
+        if text is None:
+            self.comments[file].pop(row, None)
+        else:
+            self.comments[file][row] = text
+
+    def comment_rows(self, file: str) -> tuple[np.ndarray, list]:
+        """
+        comment_rows returns the commented rows of file in ascending
+        order, with their texts.
+        Inputs:
+                file: string containing the key of the recording
+        Returns:
+                (an int array of rows, a list of their comment texts)
+        """
+        comments = self.comments[file]
+        rows = np.array(sorted(comments), dtype=np.int64)
+        return rows, [comments[row] for row in rows.tolist()]
+
+    def comment_column(self, file: str) -> np.ndarray:
+        """
+        comment_column expands the comments of file into a dense column,
+        None where there is no comment, for writing it out.
+        Inputs:
+                file: string containing the key of the recording
+        Returns:
+                an object array with a value for every row of file
+        """
+        column = np.full(len(self.dfs[file]), None, dtype=object)
+        rows, texts = self.comment_rows(file)
+        column[rows] = texts
+        return column
+
     def export_csv(self, file, destination):
         """
-        export_csv saves a CSV of loaded EPG data to disk.
+        export_csv saves a CSV of loaded EPG data to disk, with the
+        comments as a column. The row numbers are written as the first
+        column unless the recording has a custom index.
         Inputs:
                 file: string containing the key of the recording in
                       self.dfs
@@ -125,9 +275,116 @@ class EPGData:
                 True if successful, False otherwise
         """
 
+        self.materialize_labels(file)
+        df = self.dfs[file]
         try:
-            self.dfs[file].to_csv(destination)
-        except:
+            df.assign(comments=self.comment_column(file)).to_csv(
+                destination, index=isinstance(df.index, pd.RangeIndex)
+            )
+        except (OSError, ValueError) as e:
+            print(f"Could not export {file} to {destination}: {e}")
+            return False
+        return True
+
+    def read_csv(self, path) -> DataFrame:
+        """
+        read_csv reads a CSV recording with pyarrow, parsing only the
+        time, voltage (or pre_rect), labels and comments columns, and
+        converts the table to pandas once. Labels are read straight
+        into a categorical column.
+        Inputs:
+                path: path of the .csv file
+        Returns:
+                a dataframe with time, voltage, labels and comments columns
+        """
+        table = pa_csv.read_csv(
+            path,
+            convert_options=pa_csv.ConvertOptions(
+                include_columns=["time", "voltage", "pre_rect", self.label_column, "comments"],
+                include_missing_columns=True,
+                column_types={
+                    self.label_column: pa.dictionary(pa.int32(), pa.string()),
+                    "comments": pa.string(),
+                },
+                strings_can_be_null=True,
+            ),
+        )
+
+        if table.column("time").null_count == table.num_rows:
+            raise ValueError("No Time Data")
+        if table.column("voltage").null_count < table.num_rows:
+            voltage = "voltage"
+        elif table.column("pre_rect").null_count < table.num_rows:
+            voltage = "pre_rect"
+        else:
+            raise ValueError("No Voltage Data")
+        table = table.select(["time", voltage, self.label_column, "comments"])
+        table = table.rename_columns(["time", "voltage", self.label_column, "comments"])
+
+        # self_destruct frees each Arrow column as soon as it has been converted,
+        # so the load never holds the table and the dataframe in full at once
+        df = table.to_pandas(split_blocks=True, self_destruct=True)
+        del table
+        df["comments"] = df["comments"].astype(object)
+        return df
+
+    def read_parquet(self, path) -> DataFrame:
+        """
+        read_parquet reads a recording saved by export_parquet (or by the
+        ML pipeline, which calls the voltage column pre_rect). Only the
+        time, voltage, labels and comments columns are read from disk.
+        Inputs:
+                path: path of the .parquet file
+        Returns:
+                a dataframe with time, voltage, labels and comments columns
+        """
+        available = set(pq.read_schema(path).names)
+        if "time" not in available:
+            raise ValueError("No Time Data")
+        if "voltage" in available:
+            voltage = "voltage"
+        elif "pre_rect" in available:
+            voltage = "pre_rect"
+        else:
+            raise ValueError("No Voltage Data")
+
+        columns = ["time", voltage] + [c for c in (self.label_column, "comments") if c in available]
+        df = pd.read_parquet(path, columns=columns, engine="pyarrow")
+        df = df.rename(columns={voltage: "voltage"}).reset_index(drop=True)
+
+        if self.label_column not in df:
+            df[self.label_column] = np.nan
+        if "comments" not in df:
+            df["comments"] = None
+        df["comments"] = df["comments"].astype(object)
+        return df
+
+    def export_parquet(self, file, destination):
+        """
+        export_parquet saves a recording to disk as Parquet, with float32
+        voltage, dictionary encoded labels and comments that are null
+        everywhere except at the marked rows. Time stays float64 since
+        float32 can't hold 10 ms steps exactly over a long recording,
+        which would break set_transitions' time alignment.
+        Inputs:
+                file: string containing the key of the recording in
+                      self.dfs
+                destination: where the file should be saved
+        Returns:
+                True if successful, False otherwise
+        """
+        self.materialize_labels(file)
+        df = self.dfs[file]
+        out = DataFrame({
+            "time": df["time"].to_numpy(dtype=np.float64),
+            "voltage": df["voltage"].to_numpy(dtype=np.float32),
+            self.label_column: df[self.label_column].astype("category"),
+            "comments": self.comment_column(file),
+        })
+        try:
+            out.to_parquet(destination, engine="pyarrow", index=False)
+        except (OSError, ValueError) as e:
+            print(f"Could not export {file} to {destination}: {e}")
             return False
         return True
 
@@ -144,13 +401,14 @@ class EPGData:
                 True if successful, False otherwise
         """
         df = self.dfs[file]
-        df1 = df[:-1].reset_index()["labels"]
-        df2 = df[1:].reset_index()["labels"]
-        where = np.where(~((df1 == df2) | (df1.isna() & df2.isna())))[0]
+        codes, categories = self.get_label_codes(file, "labels")
+        where = np.flatnonzero(codes[:-1] != codes[1:])
         where = np.append(where, [len(df) - 1])
+        times = df["time"].values
         with open(destination, "w") as f:
-            for i, row in df.iloc[where].iterrows():
-                f.write(f'"{row["labels"]}"\n    {row["time"]:.02f}\n')
+            for i in where:
+                label = categories[codes[i]] if codes[i] >= 0 else np.nan
+                f.write(f'"{label}"\n    {times[i]:.02f}\n')
 
     def get_recording(self, file):
         """
@@ -177,9 +435,9 @@ class EPGData:
 
         Inputs:
                 file: string containing the key of the recording
-                labels: a numpy array containing label strings of
-                        the same length as the number of columns
-                        in the recording dataframe
+                labels: a numpy array (or Categorical) containing
+                        label strings of the same length as the number
+                        of columns in the recording dataframe
 
         Returns:
                 None
@@ -192,7 +450,159 @@ class EPGData:
                 f"but dataframe has length {self.dfs[file].shape[0]}"
             )
         else:
+            labels = self.to_label_categorical(labels)
             self.dfs[file][self.label_column] = labels
+            self.mark_modified(file)
+            self.dfs.resize(file)
+            intervals = LabelIntervals.from_codes(
+                self.dfs[file]["time"].values, labels.codes, labels.categories
+            )
+            previous = self.label_intervals.get(file)
+            if previous is not None:
+                self.record_label_edit(file, previous, intervals)
+            self.label_intervals[file] = intervals
+            self.stale_labels.pop(file, None)
+
+    def set_label_intervals(self, file: str, starts, ends, labels, record: bool = True) -> None:
+        """
+        set_label_intervals replaces the labels of file with the given
+        segments. Only the interval store is touched; the time span that
+        changed is remembered so materialize_labels can rewrite just that
+        part of the dense labels column when it is next needed.
+        Inputs:
+                file: string containing the key of the recording
+                starts: start time of each segment
+                ends: end time of each segment
+                labels: label string of each segment
+                record: whether to add the change to the undo journal
+        Returns:
+                None
+        """
+        if not file in self.dfs:
+            raise Exception(f"{file} is not a key in self.dfs")
+        self.replace_label_intervals(file, LabelIntervals(starts, ends, labels), record)
+
+    def replace_label_intervals(self, file: str, intervals: LabelIntervals, record: bool = True) -> None:
+        """
+        replace_label_intervals is set_label_intervals for an already
+        built LabelIntervals.
+        """
+        previous = self.label_intervals.get(file)
+        self.label_intervals[file] = intervals
+
+        if previous is None:
+            self.stale_labels[file] = None
+        else:
+            changed_slice = self.record_label_edit(file, previous, intervals) if record else None
+            span = previous.changed_span(intervals, changed_slice)
+            if span is None:
+                return  # nothing changed
+            if file not in self.stale_labels:
+                self.stale_labels[file] = span
+            elif self.stale_labels[file] is not None:
+                start, end = self.stale_labels[file]
+                self.stale_labels[file] = (min(start, span[0]), max(end, span[1]))
+        self.mark_modified(file)
+
+    def record_label_edit(self, file: str, previous: LabelIntervals, intervals: LabelIntervals) -> tuple[int, int]:
+        """
+        record_label_edit adds the change from previous to intervals to
+        the undo journal, unless they hold the same segments.
+        Inputs:
+                file: string containing the key of the recording
+                previous: the labels before the edit
+                intervals: the labels after the edit
+        Returns:
+                previous.changed_slice(intervals)
+        """
+        changed_slice = previous.changed_slice(intervals)
+        prefix, suffix = changed_slice
+        if prefix + suffix < max(len(previous), len(intervals)):
+            self.journal.record(file, LabelEdit.between(previous, intervals, changed_slice))
+        return changed_slice
+
+    def undo(self, file: str):
+        """
+        undo reverts the latest edit of file. Label edits are applied to
+        the interval store here; comment edits are returned for the view
+        holding the comment markers to apply.
+        Inputs:
+                file: string containing the key of the recording
+        Returns:
+                the LabelEdit or CommentEdit that was undone, or None
+        """
+        command = self.journal.undo(file)
+        if isinstance(command, LabelEdit):
+            self.replace_label_intervals(file, command.undo(self.get_label_intervals(file)), record=False)
+        return command
+
+    def redo(self, file: str):
+        """
+        redo applies the latest undone edit of file again, see undo.
+        Inputs:
+                file: string containing the key of the recording
+        Returns:
+                the LabelEdit or CommentEdit that was redone, or None
+        """
+        command = self.journal.redo(file)
+        if isinstance(command, LabelEdit):
+            self.replace_label_intervals(file, command.redo(self.get_label_intervals(file)), record=False)
+        return command
+
+    def get_label_intervals(self, file: str) -> LabelIntervals:
+        """
+        get_label_intervals returns the interval store of file, run-length
+        encoding its labels column the first time it is asked for.
+        Inputs:
+                file: string containing the key of the recording
+        Returns:
+                the LabelIntervals of file
+        """
+        if file not in self.label_intervals:
+            codes, categories = self.get_label_codes(file, "labels")
+            self.label_intervals[file] = LabelIntervals.from_codes(self.dfs[file]["time"].values, codes, categories)
+        return self.label_intervals[file]
+
+    def materialize_labels(self, file: str) -> None:
+        """
+        materialize_labels writes the interval store of file out to its
+        dense labels column if it has changed since the last time. Only
+        the samples in the changed time span are rewritten, unless the
+        column is missing or lacks one of the labels, in which case it is
+        rebuilt in full. Call before anything reads dfs[file]["labels"]
+        directly (exports, model input).
+        Inputs:
+                file: string containing the key of the recording
+        Returns:
+                None
+        """
+        if file not in self.stale_labels:
+            return
+        span = self.stale_labels.pop(file)
+        df = self.dfs[file]
+        times = df["time"].values
+        intervals = self.label_intervals[file]
+
+        column = df[self.label_column] if self.label_column in df.columns else None
+        if (
+            span is None
+            or column is None
+            or not isinstance(column.dtype, pd.CategoricalDtype)
+            or not intervals.categories.isin(column.cat.categories).all()
+        ):
+            df[self.label_column] = intervals.to_categorical(times)
+            self.dfs.resize(file)
+            return
+
+        lo = np.searchsorted(times, span[0], side="left")
+        hi = np.searchsorted(times, span[1], side="right")
+        codes = intervals.codes_between(times, lo, hi)
+
+        # recode into the column's categories; code -1 (unlabeled) maps to the appended -1
+        recode = np.append(column.cat.categories.get_indexer(intervals.categories), -1)
+        df.iloc[lo:hi, df.columns.get_loc(self.label_column)] = pd.Categorical.from_codes(
+            recode[codes], dtype=column.dtype
+        )
 
     def set_transitions(self, file, transitions, section_type):
         """
@@ -209,24 +619,27 @@ class EPGData:
             raise Exception(f"{file} is not a key in self.dfs")
         
 
-        df = self.dfs[file]
-        section_to_column = {"labels": self.label_column}
-        col = section_to_column[section_type]
+        if section_type != "labels":
+            raise ValueError(f"Unknown section_type: {section_type}")
 
-        cleaned_transitions = [(round(t, 2), label) for t, label in transitions]
+        df = self.dfs[file]
+        cleaned_transitions = sorted(
+            ((round(t, 2), label) for t, label in transitions), key=lambda transition: transition[0]
+        )
 
         if not cleaned_transitions:
             return
         
-        # Build Series of transitions indexed by time
+        # Each transition holds its label until the next one starts
         times, labels = zip(*cleaned_transitions)
-        transition_series = pd.Series(labels, index=times)
-
-        # Align with the time column (assumed to already match transition rounding)
-        aligned = transition_series.reindex(df["time"], method="ffill")
-
-        # Update label column
-        self.dfs[file][col] = aligned.reset_index(drop=True)
+        ends = times[1:] + (df["time"].iloc[-1],)
+        labelled = [label is not None and not pd.isna(label) for label in labels]
+        self.set_label_intervals(
+            file,
+            np.compress(labelled, times),
+            np.compress(labelled, ends),
+            np.compress(labelled, np.asarray(labels, dtype=object)),
+        )
 
         # df = self.dfs[file].copy()
         # df["time"] = df["time"].round(2)
@@ -257,27 +670,53 @@ class EPGData:
             raise Exception(f"{file} is not a key in self.dfs")
         
 
-        df: DataFrame = self.dfs[file]
-        times = df["time"].values
-
+        times = self.dfs[file]["time"].values
         if section_type == "labels":
-            values = df[self.label_column].values
-        elif section_type == "probes":
-            values = df[self.probe_column].values
-        else:
-            raise ValueError(f"Unknown section_type: {section_type}")
+            return self.get_label_intervals(file).transitions(times[0], times[-1])
 
+        codes, categories = self.get_label_codes(file, section_type)
         
-        if pd.isna(values).all():
+        if (codes == -1).all():
             return []
 
-        # Find where the value changes (i.e., transitions)
-        change_indices = np.flatnonzero(values[1:] != values[:-1]) + 1
+        # Find where the code changes (i.e., transitions)
+        change_indices = np.flatnonzero(codes[1:] != codes[:-1]) + 1
+        change_indices = np.insert(change_indices, 0, 0)
 
-        # Prepend time 0 with the initial label
-        initial = np.array([[0.0, values[0]]], dtype=object)
-        transitions = np.column_stack((times[change_indices], values[change_indices])) # combine elements pair-wise
+        labels = np.empty(len(change_indices), dtype=object)
+        change_codes = codes[change_indices]
+        labelled = change_codes >= 0
+        labels[labelled] = np.asarray(categories, dtype=object)[change_codes[labelled]]
 
-        transitions = np.vstack((initial, transitions)) # prepend initial zero
+        transitions = np.column_stack((times[change_indices].astype(object), labels)) # combine elements pair-wise
+        transitions[0, 0] = 0.0 # always start at time 0
 
-        return transitions
\ No newline at end of file
+        return transitions
+
+    def get_label_codes(self, file: str, section_type: str) -> tuple[np.ndarray, pd.Index]:
+        """
+        get_label_codes returns the integer label codes of file and the
+        label dictionary they index into. Unlabeled rows have code -1.
+        Inputs:
+                file: string containing the key of the recording
+                section_type: "labels" or "probes"
+        Outputs:
+                a (codes, categories) tuple
+        """
+        if not file in self.dfs:
+            raise Exception(f"{file} is not a key in self.dfs")
+
+        if section_type == "labels":
+            column = self.label_column
+            self.materialize_labels(file)
+        elif section_type == "probes":
+            column = self.probe_column
+        else:
+            raise ValueError(f"Unknown section_type: {section_type}")
+
+        values = self.dfs[file][column]
+        if not isinstance(values.dtype, pd.CategoricalDtype):
+            values = self.to_label_categorical(values)
+        else:
+            values = values.array
+        return values.codes, values.categories
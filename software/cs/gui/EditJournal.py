@@ -0,0 +1,165 @@
+import sys
+from itertools import count
+
+from LabelIntervals import LabelIntervals
+
+
+class LabelEdit:
+    """
+    A change to a recording's labels, stored as the run of segments it
+    replaced and the run it put in their place. Segments the edit did not
+    touch are not kept, so a drag or relabel costs a few segments however
+    long the recording is.
+    """
+
+    def __init__(self, index: int, before: LabelIntervals, after: LabelIntervals):
+        """
+        Inputs:
+                index: position of the first replaced segment
+                before: the segments the edit removed
+                after: the segments the edit inserted
+        """
+        self.index = index
+        self.before = before
+        self.after = after
+
+    @classmethod
+    def between(cls, previous: LabelIntervals, current: LabelIntervals, changed_slice=None) -> "LabelEdit":
+        """
+        between builds the edit that turns previous into current.
+        Inputs:
+                previous: the labels before the edit
+                current: the labels after the edit
+                changed_slice: previous.changed_slice(current), if known
+        Returns:
+                a LabelEdit
+        """
+        prefix, suffix = changed_slice or previous.changed_slice(current)
+        return cls(
+            prefix,
+            previous.segments(prefix, len(previous) - suffix),
+            current.segments(prefix, len(current) - suffix),
+        )
+
+    def undo(self, intervals: LabelIntervals) -> LabelIntervals:
+        return intervals.splice(self.index, len(self.after), self.before)
+
+    def redo(self, intervals: LabelIntervals) -> LabelIntervals:
+        return intervals.splice(self.index, len(self.before), self.after)
+
+    @property
+    def nbytes(self) -> int:
+        return self.before.nbytes + self.after.nbytes
+
+
+class CommentEdit:
+    """
+    A change to a recording's comments, stored as the text at each
+    affected time before and after it (None where there was no comment).
+    """
+
+    def __init__(self, before: dict, after: dict):
+        """
+        Inputs:
+                before: time : comment text (or None) before the edit
+                after: time : comment text (or None) after the edit
+        """
+        self.before = before
+        self.after = after
+
+    @property
+    def nbytes(self) -> int:
+        texts = (*self.before.values(), *self.after.values())
+        return sum(sys.getsizeof(text) for text in texts) + 64 * len(texts)
+
+
+class EditJournal:
+    """
+    Per-recording undo and redo stacks of LabelEdit and CommentEdit
+    commands. All stacks share a memory budget; when it is exceeded the
+    oldest commands, across every recording, are dropped first.
+    """
+
+    def __init__(self, budget_bytes: int):
+        """
+        Inputs:
+                budget_bytes: memory budget for all recorded commands
+        """
+        self.budget_bytes = budget_bytes
+        self._undo = {}  # filename : list of (sequence number, command), oldest first
+        self._redo = {}  # filename : list of (sequence number, command), most recently undone last
+        self._bytes = 0
+        self._sequence = count()
+
+    def record(self, file, command) -> None:
+        """
+        record pushes a command that was just applied to file. Anything
+        that could have been redone is discarded.
+        """
+        self._clear(self._redo, file)
+        self._undo.setdefault(file, []).append((next(self._sequence), command))
+        self._bytes += command.nbytes
+        self.evict()
+
+    def undo(self, file):
+        """
+        undo moves the latest command of file to its redo stack.
+        Returns:
+                the command, for the caller to revert, or None if there
+                is nothing to undo
+        """
+        return self._move(self._undo, self._redo, file)
+
+    def redo(self, file):
+        """
+        redo moves the latest undone command of file back to its undo stack.
+        Returns:
+                the command, for the caller to apply again, or None if
+                there is nothing to redo
+        """
+        return self._move(self._redo, self._undo, file)
+
+    def can_undo(self, file) -> bool:
+        return bool(self._undo.get(file))
+
+    def set_budget(self, budget_bytes: int) -> None:
+        self.budget_bytes = budget_bytes
+        self.evict()
+
+    def can_redo(self, file) -> bool:
+        return bool(self._redo.get(file))
+
+    def forget(self, file) -> None:
+        """
+        forget drops the history of file, e.g. when it is reloaded.
+        """
+        self._clear(self._undo, file)
+        self._clear(self._redo, file)
+
+    def evict(self) -> None:
+        """
+        evict drops the oldest commands until the journal fits in its
+        budget, then, if that is not enough, the furthest redo steps.
+        """
+        while self._bytes > self.budget_bytes:
+            stacks = [stack for stack in self._undo.values() if stack]
+            if stacks:
+                stack = min(stacks, key=lambda stack: stack[0][0])
+            else:
+                stacks = [stack for stack in self._redo.values() if stack]
+                if not stacks:
+                    return
+                stack = stacks[0]
+            _, command = stack.pop(0)
+            self._bytes -= command.nbytes
+
+    def _move(self, source: dict, target: dict, file):
+        if not source.get(file):
+            return None
+        entry = source[file].pop()
+        target.setdefault(file, []).append(entry)
+        return entry[1]
+
+    def _clear(self, stacks: dict, file) -> None:
+        for _, command in stacks.pop(file, []):
+            self._bytes -= command.nbytes
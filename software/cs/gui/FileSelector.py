@@ -52,7 +52,7 @@ class FileSelector:
     def export_labeled_data(epgdata: EPGData, file: str):
         file_dialog = QFileDialog()
         file_dialog.AcceptMode = 1 # save mode
-        file_url, selected_filter = file_dialog.getSaveFileUrl(filter="CSV files (*.csv);;text files (*.txt)")
+        file_url, selected_filter = file_dialog.getSaveFileUrl(filter="CSV files (*.csv);;Parquet files (*.parquet);;text files (*.txt)")
         file_path = file_url.toLocalFile()
         if selected_filter:
             extension = re.match(r'^.*\(\*\.(.*)\)$', selected_filter).group(1)
@@ -69,6 +69,8 @@ class FileSelector:
             full_path = os.path.join(dirname, basename)
             if extension.lower() == 'csv':
                 epgdata.export_csv(file, full_path)
+            elif extension.lower() == 'parquet':
+                epgdata.export_parquet(file, full_path)
             elif extension.lower() == 'txt':
                 epgdata.export_txt(file, full_path)
 
@@ -0,0 +1,243 @@
+import numpy as np
+import pandas as pd
+
+
+class LabelIntervals:
+    """
+    A run-length view of a recording's labels: sorted start times,
+    end times and integer codes into a label dictionary. Edits and
+    queries cost O(#segments); the dense per-sample column is only
+    built by to_categorical when something needs it.
+    """
+
+    def __init__(self, starts=(), ends=(), labels=()):
+        """
+        Inputs:
+                starts: start time of each labelled segment
+                ends: end time of each labelled segment
+                labels: label string of each segment
+        """
+        starts = np.asarray(starts, dtype=np.float64)
+        order = np.argsort(starts, kind="stable")
+        labels = pd.Categorical(np.asarray(labels, dtype=object)[order])
+
+        self.starts = starts[order]
+        self.ends = np.asarray(ends, dtype=np.float64)[order]
+        self.codes = labels.codes.astype(np.int16)
+        self.categories = labels.categories
+
+    @classmethod
+    def from_codes(cls, times, codes, categories) -> "LabelIntervals":
+        """
+        from_codes run-length encodes a dense label column. A segment
+        ends where the next one starts, the final one at the last sample.
+        Unlabeled runs (code -1) are left out.
+        Inputs:
+                times: sample times of the recording
+                codes: integer label code of every sample
+                categories: the labels the codes index into
+        Returns:
+                a LabelIntervals
+        """
+        intervals = cls()
+        if len(codes) == 0:
+            return intervals
+
+        starts = np.flatnonzero(codes[1:] != codes[:-1]) + 1
+        starts = np.insert(starts, 0, 0)
+        ends = np.append(times[starts[1:]], times[-1])
+        labelled = codes[starts] >= 0
+
+        intervals.starts = np.asarray(times[starts][labelled], dtype=np.float64)
+        intervals.ends = np.asarray(ends[labelled], dtype=np.float64)
+        intervals.codes = np.asarray(codes[starts][labelled], dtype=np.int16)
+        intervals.categories = pd.Index(categories)
+        return intervals
+
+    def __len__(self) -> int:
+        return len(self.starts)
+
+    def __eq__(self, other) -> bool:
+        if not isinstance(other, LabelIntervals):
+            return NotImplemented
+        return (
+            len(self) == len(other)
+            and np.array_equal(self.starts, other.starts)
+            and np.array_equal(self.ends, other.ends)
+            and np.array_equal(self.labels(), other.labels())
+        )
+
+    def copy(self) -> "LabelIntervals":
+        intervals = LabelIntervals()
+        intervals.starts = self.starts.copy()
+        intervals.ends = self.ends.copy()
+        intervals.codes = self.codes.copy()
+        intervals.categories = self.categories
+        return intervals
+
+    def labels(self) -> np.ndarray:
+        """
+        labels returns the label string of every segment.
+        """
+        return np.asarray(self.categories, dtype=object)[self.codes]
+
+    def transitions(self, start_time: float, end_time: float) -> np.ndarray:
+        """
+        transitions returns the segments in the format of
+        EPGData.get_transitions: (time, label) rows where each label
+        holds until the next row, with None marking unlabeled gaps.
+        Inputs:
+                start_time: time of the first sample of the recording
+                end_time: time of the last sample of the recording
+        Returns:
+                an object array of (time, label) rows, starting at time 0,
+                or an empty list if there are no labels
+        """
+        if len(self) == 0:
+            return []
+
+        labels = self.labels()
+        rows = []
+        if self.starts[0] > start_time:
+            rows.append((0.0, None))
+        for i in range(len(self)):
+            rows.append((self.starts[i], labels[i]))
+            next_start = self.starts[i + 1] if i + 1 < len(self) else end_time
+            if next_start - self.ends[i] > 1e-6:
+                rows.append((self.ends[i], None))
+
+        transitions = np.array(rows, dtype=object)
+        transitions[0, 0] = 0.0 # always start at time 0
+        return transitions
+
+    def changed_slice(self, other: "LabelIntervals") -> tuple[int, int]:
+        """
+        changed_slice counts the segments self and other share at the
+        start and at the end, which an edit left untouched.
+        Inputs:
+                other: the LabelIntervals after an edit
+        Returns:
+                (prefix, suffix): number of identical leading and trailing
+                segments, never overlapping in either of the two
+        """
+        n = min(len(self), len(other))
+        labels, other_labels = self.labels(), other.labels()
+
+        same = (
+            (self.starts[:n] == other.starts[:n])
+            & (self.ends[:n] == other.ends[:n])
+            & (labels[:n] == other_labels[:n])
+        )
+        prefix = n if same.all() else int(np.argmin(same))
+
+        same = (
+            (self.starts[len(self) - n:] == other.starts[len(other) - n:])
+            & (self.ends[len(self) - n:] == other.ends[len(other) - n:])
+            & (labels[len(self) - n:] == other_labels[len(other) - n:])
+        )[::-1]
+        suffix = n if same.all() else int(np.argmin(same))
+        return prefix, min(suffix, n - prefix)
+
+    def changed_span(self, other: "LabelIntervals", changed_slice: tuple[int, int] = None) -> tuple[float, float] | None:
+        """
+        changed_span finds the time span in which other differs from
+        self, skipping the segments both share at the start and end.
+        Inputs:
+                other: the LabelIntervals after an edit
+                changed_slice: the result of self.changed_slice(other),
+                        if already known
+        Returns:
+                (start, end) of the span covering every segment that was
+                added, removed, moved or relabelled, or None if the two
+                hold the same segments
+        """
+        prefix, suffix = changed_slice or self.changed_slice(other)
+
+        changed = [
+            (intervals.starts[prefix:len(intervals) - suffix], intervals.ends[prefix:len(intervals) - suffix])
+            for intervals in (self, other)
+        ]
+        starts = np.concatenate([starts for starts, _ in changed])
+        ends = np.concatenate([ends for _, ends in changed])
+        if len(starts) == 0:
+            return None
+        if suffix == 0 and prefix > 0:
+            # the final segment changed, so the sample at the end of the
+            # segment before it may have become the inclusive last one
+            starts = np.append(starts, self.ends[prefix - 1])
+        return float(starts.min()), float(ends.max())
+
+    def segments(self, start: int, stop: int) -> "LabelIntervals":
+        """
+        segments returns a copy of the segments [start, stop).
+        """
+        intervals = LabelIntervals()
+        intervals.starts = self.starts[start:stop].copy()
+        intervals.ends = self.ends[start:stop].copy()
+        intervals.codes = self.codes[start:stop].copy()
+        intervals.categories = self.categories
+        return intervals
+
+    def splice(self, index: int, count: int, segments: "LabelIntervals") -> "LabelIntervals":
+        """
+        splice returns a copy of self with the count segments starting
+        at index replaced by the given ones.
+        Inputs:
+                index: position of the first segment to replace
+                count: number of segments to replace
+                segments: the segments to put in their place
+        Returns:
+                a new LabelIntervals
+        """
+        labels = self.labels()
+        return LabelIntervals(
+            np.concatenate((self.starts[:index], segments.starts, self.starts[index + count:])),
+            np.concatenate((self.ends[:index], segments.ends, self.ends[index + count:])),
+            np.concatenate((labels[:index], segments.labels(), labels[index + count:])),
+        )
+
+    @property
+    def nbytes(self) -> int:
+        return self.starts.nbytes + self.ends.nbytes + self.codes.nbytes
+
+    def codes_between(self, times, lo: int, hi: int) -> np.ndarray:
+        """
+        codes_between computes the label code of the samples times[lo:hi],
+        following the same rules as to_categorical.
+        Inputs:
+                times: sample times of the recording
+                lo: index of the first sample
+                hi: index one past the last sample
+        Returns:
+                an array of hi - lo codes into categories, -1 where unlabeled
+        """
+        codes = np.full(hi - lo, -1, dtype=self.codes.dtype)
+        if hi <= lo or len(self) == 0:
+            return codes
+
+        # only the segments that can reach [times[lo], times[hi - 1]]
+        first = int(np.searchsorted(self.ends, times[lo], side="left"))
+        last = int(np.searchsorted(self.starts, times[hi - 1], side="right"))
+
+        start_idx = np.searchsorted(times, self.starts[first:last], side="left")
+        end_idx = np.searchsorted(times, self.ends[first:last], side="left")
+        if last == len(self) and last > first:
+            end_idx[-1] = np.searchsorted(times, self.ends[-1], side="right") # inclusive
+
+        start_idx = np.clip(start_idx, lo, hi) - lo
+        end_idx = np.clip(end_idx, lo, hi) - lo
+        for start, end, code in zip(start_idx, end_idx, self.codes[first:last]):
+            codes[start:end] = code
+        return codes
+
+    def to_categorical(self, times) -> pd.Categorical:
+        """
+        to_categorical materializes the dense label column. Each segment
+        covers the samples in [start, end), except the final one, which
+        also includes the sample at its end time.
+        Inputs:
+                times: sample times of the recording
+        Returns:
+                a pandas Categorical with one label per sample
+        """
+        return pd.Categorical.from_codes(self.codes_between(times, 0, len(times)), self.categories)
@@ -13,10 +13,11 @@ from PyQt6.QtWidgets import (
     QMenuBar,
     QMenu,
     QTabWidget,
-    QPushButton
+    QPushButton,
+    QFileDialog
 )
 from PyQt6.QtCore import pyqtSignal, QObject, QEvent, Qt, QTimer
-from PyQt6.QtGui import QIcon, QFontDatabase
+from PyQt6.QtGui import QIcon, QFontDatabase, QKeySequence
 
 
 from label_view.DataWindow import DataWindow
@@ -97,6 +98,8 @@ class MainWindow(QMainWindow):
         self.export_to_txt.triggered.connect(self.export_waveforms_to_txt)
         export_comment_csv = file_menu.addAction("Export Comments")
         export_comment_csv.triggered.connect(self.export_comments_from_current_tab)
+        export_trace = file_menu.addAction("Export Performance Trace")
+        export_trace.triggered.connect(self.export_trace_from_current_tab)
 
         
         file_menu.addSeparator()
@@ -105,8 +108,12 @@ class MainWindow(QMainWindow):
         file_menu.addAction("Exit App", self.close)
 
         edit_menu = QMenu("Edit", self)
-        placeholder = edit_menu.addAction("Nothing here yet!")
-        placeholder.setEnabled(False)
+        undo = edit_menu.addAction("Undo")
+        undo.setShortcut(QKeySequence.StandardKey.Undo)
+        undo.triggered.connect(lambda: self.label_tab.datawindow.undo() if self.tabs.currentWidget() is self.label_tab else None)
+        redo = edit_menu.addAction("Redo")
+        redo.setShortcut(QKeySequence.StandardKey.Redo)
+        redo.triggered.connect(lambda: self.label_tab.datawindow.redo() if self.tabs.currentWidget() is self.label_tab else None)
 
         view_menu = QMenu("View", self)
         placeholder = view_menu.addAction("Nothing here yet!")
@@ -191,6 +198,30 @@ class MainWindow(QMainWindow):
             msg.setStandardButtons(QMessageBox.StandardButton.Ok)
             msg.exec()
 
+    def export_trace_from_current_tab(self):
+        current_widget = self.tabs.currentWidget()
+        if not isinstance(current_widget, (LiveViewTab, LabelViewTab)):
+            return
+        instrumentation = current_widget.datawindow.instrumentation
+        if not instrumentation.trace:
+            msg = QMessageBox(self)
+            msg.setWindowTitle("No Performance Trace")
+            msg.setText("Nothing has been timed yet. Turn on \"Show Performance Overlay\" in Settings first.")
+            msg.setStandardButtons(QMessageBox.StandardButton.Ok)
+            msg.exec()
+            return
+
+        filename, _ = QFileDialog.getSaveFileName(
+            parent=self,
+            caption="Export Performance Trace As",
+            filter="Trace Files (*.json);;All Files (*)"
+        )
+        if filename:
+            try:
+                instrumentation.export_trace(filename)
+            except OSError as e:
+                QMessageBox.warning(self, "Export Failed", f"Could not write the trace:\n{e}")
+
     def export_waveforms_to_txt(self):
         current_widget = self.tabs.currentWidget()
         if isinstance(current_widget, LabelViewTab):
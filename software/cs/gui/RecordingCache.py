@@ -0,0 +1,148 @@
+import os
+import tempfile
+from collections import OrderedDict
+from collections.abc import MutableMapping
+
+import pandas as pd
+from pandas import DataFrame
+
+
+class RecordingCache(MutableMapping):
+    """
+    A dict of filename : DataFrame that keeps at most `budget_bytes` of
+    recordings in memory. When the budget is exceeded the least recently
+    used recordings are evicted: unmodified ones are simply dropped and
+    read again from their source file on next access, modified ones are
+    spilled to a temporary Parquet file first.
+    """
+
+    def __init__(self, budget_bytes: int, pinned=lambda key: False):
+        """
+        Inputs:
+                budget_bytes: memory budget for the resident recordings
+                pinned: callable taking a key, True if that recording
+                        must never be evicted (e.g. the one on screen)
+        """
+        self.budget_bytes = budget_bytes
+        self.pinned = pinned
+        self._resident = OrderedDict()  # key : DataFrame, least recently used first
+        self._sizes = {}                # key : bytes of the resident DataFrame
+        self._reloaders = {}            # key : callable re-reading an unmodified recording
+        self._spilled = {}              # key : path of its Parquet spill file
+        self._spill_dir = None
+        self._spill_count = 0           # spill files ever written, numbers their names
+
+    def add(self, key, df: DataFrame, reload=None) -> None:
+        """
+        add stores a recording, together with a way of reading it back
+        from disk while it is unmodified.
+        Inputs:
+                key: filename of the recording
+                df: the recording
+                reload: callable returning df again, or None if the
+                        recording can only be spilled
+        """
+        self._discard(key)
+        if reload is not None:
+            self._reloaders[key] = reload
+        self._resident[key] = df
+        self._sizes[key] = self.nbytes(df)
+        self.evict()
+
+    def mark_modified(self, key) -> None:
+        """
+        mark_modified records that a recording no longer matches its
+        source file, so evicting it has to spill it.
+        """
+        self._reloaders.pop(key, None)
+
+    def resize(self, key) -> None:
+        """
+        resize re-measures a resident recording after columns were added
+        or replaced, and evicts others if that broke the budget.
+        """
+        if key in self._resident:
+            self._sizes[key] = self.nbytes(self._resident[key])
+            self.evict()
+
+    def set_budget(self, budget_bytes: int) -> None:
+        self.budget_bytes = budget_bytes
+        self.evict()
+
+    def resident_bytes(self) -> int:
+        return sum(self._sizes.values())
+
+    def evict(self) -> None:
+        """
+        evict drops least recently used recordings until the resident
+        ones fit in the budget. The most recently used recording and
+        pinned ones are always kept.
+        """
+        for key in list(self._resident)[:-1]:
+            if self.resident_bytes() <= self.budget_bytes:
+                return
+            if self.pinned(key):
+                continue
+
+            df = self._resident.pop(key)
+            del self._sizes[key]
+            if key not in self._reloaders:
+                self._spill(key, df)
+
+    @staticmethod
+    def nbytes(df: DataFrame) -> int:
+        # shallow: comments live in EPGData, so there are no object columns to walk
+        return int(df.memory_usage(index=True, deep=False).sum())
+
+    def _spill(self, key, df: DataFrame) -> None:
+        if self._spill_dir is None:
+            self._spill_dir = tempfile.TemporaryDirectory(prefix="scido_spill_")
+        # recordings in different folders can share a basename, so number every spill
+        path = os.path.join(self._spill_dir.name, f"{self._spill_count}_{os.path.basename(key)}.parquet")
+        self._spill_count += 1
+        df.to_parquet(path, engine="pyarrow")
+        self._spilled[key] = path
+
+    def _discard(self, key) -> None:
+        self._resident.pop(key, None)
+        self._sizes.pop(key, None)
+        self._reloaders.pop(key, None)
+        path = self._spilled.pop(key, None)
+        if path is not None and os.path.exists(path):
+            os.remove(path)
+
+    def __getitem__(self, key) -> DataFrame:
+        if key in self._resident:
+            self._resident.move_to_end(key)
+            return self._resident[key]
+
+        if key in self._spilled:
+            path = self._spilled.pop(key)
+            df = pd.read_parquet(path, engine="pyarrow")
+            os.remove(path)
+        elif key in self._reloaders:
+            df = self._reloaders[key]()
+        else:
+            raise KeyError(key)
+
+        self._resident[key] = df
+        self._sizes[key] = self.nbytes(df)
+        self.evict()
+        return df
+
+    def __setitem__(self, key, df: DataFrame) -> None:
+        self.add(key, df)
+
+    def __delitem__(self, key) -> None:
+        if key not in self:
+            raise KeyError(key)
+        self._discard(key)
+
+    def __contains__(self, key) -> bool:
+        return key in self._resident or key in self._spilled or key in self._reloaders
+
+    def __iter__(self):
+        return iter(dict.fromkeys((*self._resident, *self._spilled, *self._reloaders)))
+
+    def __len__(self) -> int:
+        return sum(1 for _ in self)
@@ -0,0 +1,60 @@
+"""
+Times peak downsampling of 1M and 10M sample slices: the reshape /
+max / min / interleave code the windows used before, against the shared
+kernel in utils.PeakKernel (compiled if numba is installed).
+
+Run from this directory:
+    python bench_downsample.py
+"""
+import timeit
+
+import numpy as np
+
+from utils import PeakKernel
+from utils.PeakKernel import peaks
+
+MAX_POINTS = 4000
+REPEATS = 5
+
+
+def peaks_reshape(x, y, stride):
+    x = x.copy()
+    y = y.copy()
+    num_windows = len(y) // stride
+    x_win = x[stride // 2 : stride // 2 + num_windows * stride : stride]
+    y_reshaped = y[: num_windows * stride].reshape(num_windows, stride)
+    x_out = np.empty(num_windows * 2)
+    y_out = np.empty(num_windows * 2)
+    y_out[::2] = y_reshaped.max(axis=1)
+    y_out[1::2] = y_reshaped.min(axis=1)
+    x_out[::2] = x_win
+    x_out[1::2] = x_win
+    return x_out, y_out
+
+
+def best_ms(fn, *args) -> float:
+    return min(timeit.repeat(lambda: fn(*args), number=1, repeat=REPEATS)) * 1000
+
+
+if __name__ == "__main__":
+    rng = np.random.default_rng(0)
+    kernel = "numba" if PeakKernel._peaks_compiled is not None else "numpy"
+
+    for n in (1_000_000, 10_000_000):
+        x = np.arange(n) / 100.0
+        y = rng.standard_normal(n)
+        stride = max(1, n // (MAX_POINTS // 2))
+        x_buf = np.empty(MAX_POINTS)
+        y_buf = np.empty(MAX_POINTS)
+
+        expected = peaks_reshape(x, y, stride)
+        result = peaks(x, y, stride, x_buf, y_buf)
+        assert all(np.array_equal(e, r) for e, r in zip(expected, result))
+
+        peaks(x, y, stride, x_buf, y_buf)  # compile outside the timing
+        before = best_ms(peaks_reshape, x, y, stride)
+        after = best_ms(peaks, x, y, stride, x_buf, y_buf)
+        print(
+            f"{n:>10,} samples: reshape {before:8.2f} ms   "
+            f"{kernel} kernel {after:8.2f} ms   {before / after:5.1f}x"
+        )
@@ -0,0 +1,84 @@
+"""
+Times one live frame, appending a frame's worth of samples and reading
+the visible 10 s window back, as the recording grows: the np.concatenate
+storage LiveDataWindow used before against live_view.SegmentBuffer.
+
+Run from this directory:
+    python bench_live_storage.py [--rate HZ] [--concat-limit HOURS]
+
+The default sample rate keeps the 12 hour store under 1 GB; pass
+--rate 10000 for the device rate if there is memory for it (about 7 GB).
+The concatenate baseline is only run up to --concat-limit hours, since
+each of its frames copies the whole history.
+"""
+import argparse
+import timeit
+
+import numpy as np
+
+from live_view.SegmentBuffer import SegmentBuffer
+
+FPS = 60
+WINDOW_S = 10
+FRAMES = 30
+CHECKPOINTS = [("1 min", 60), ("10 min", 600), ("1 h", 3600), ("6 h", 6 * 3600), ("12 h", 12 * 3600)]
+
+
+def frame_rows(start_time: float, rate: int) -> np.ndarray:
+    n = rate // FPS
+    t = start_time + np.arange(1, n + 1) / rate
+    return np.column_stack((t, np.sin(t)))
+
+
+def concat_frame(xy, rows, rate):
+    xy[0] = np.concatenate((xy[0], rows[:, 0]))
+    xy[1] = np.concatenate((xy[1], rows[:, 1]))
+    end = xy[0][-1]
+    left = np.searchsorted(xy[0], end - WINDOW_S)
+    return xy[0][left:], xy[1][left:]
+
+
+def segment_frame(store, rows, rate):
+    store.append(rows)
+    end = rows[-1, 0]
+    left = store.searchsorted(end - WINDOW_S)
+    return store.columns(left)
+
+
+def per_frame_ms(frame, storage, rate, history_s) -> float:
+    t = [history_s]
+
+    def step():
+        rows = frame_rows(t[0], rate)
+        t[0] = rows[-1, 0]
+        frame(storage, rows, rate)
+
+    return min(timeit.repeat(step, number=1, repeat=FRAMES)) * 1000
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rate", type=int, default=1000, help="samples per second")
+    parser.add_argument("--concat-limit", type=float, default=1.0, help="hours of history to run the baseline up to")
+    args = parser.parse_args()
+
+    store = SegmentBuffer(num_columns=2)
+    filled = 0
+    print(f"{args.rate} Hz, {FPS} fps, {WINDOW_S} s window; best of {FRAMES} frames")
+    for name, history_s in CHECKPOINTS:
+        # grow the store to this point in the recording, in large blocks
+        target = history_s * args.rate
+        while filled < target:
+            n = min(1 << 20, target - filled)
+            t = (filled + np.arange(n)) / args.rate
+            store.append(np.column_stack((t, np.sin(t))))
+            filled += n
+
+        line = f"{name:>6}: segments {per_frame_ms(segment_frame, store, args.rate, history_s):7.3f} ms"
+        if history_s <= args.concat_limit * 3600:
+            t = np.arange(target) / args.rate
+            xy = [t, np.sin(t)]
+            line += f"   concatenate {per_frame_ms(concat_frame, xy, args.rate, history_s):9.3f} ms"
+            del xy, t
+        print(line)
+        filled = len(store)
@@ -151,9 +151,7 @@ class AddLabelManager:
 
             if start <= s0 and e0 <= end:
                 # Existing label fully contained - remove it
-                for item in la.getItems():
-                    if item.scene() is not None:
-                        item.scene().removeItem(item)
+                la.release()
                 continue
 
             elif s0 < start < e0 and s0 < end < e0:
@@ -194,6 +192,7 @@ class AddLabelManager:
 
         # Replace label list
         self.dw.labels = new_labels
+        self.dw.label_index.invalidate()
 
         if not inserted:
             new_label = LabelArea(start, duration, label, self.dw)
@@ -208,13 +207,13 @@ class AddLabelManager:
 
         new_labels.sort(key=lambda la: la.start_time)
         self.dw.labels = new_labels
+        self.dw.label_index.invalidate()
 
         # Merge if needed
         #self.dw.selection.merge_adjacent_labels(new_label)
 
         # Push to epgdata
-        transitions = [(la.start_time, la.label) for la in self.dw.labels]
-        self.dw.epgdata.set_transitions(self.dw.file, transitions, self.dw.transition_mode)
+        self.dw.update_label_intervals()
 
         self.dw.update_plot()
         self.cancel()
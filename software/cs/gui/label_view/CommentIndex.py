@@ -0,0 +1,98 @@
+import numpy as np
+from numpy.typing import NDArray
+
+
+class CommentIndex:
+    """
+    The comments of a recording as sorted times plus their texts, so the
+    DataWindow can find the ones on screen with a binary search and only
+    build CommentMarkers for those.
+    """
+    def __init__(self) -> None:
+        self.times: NDArray = np.empty(0)  # comment times, ascending
+        self.texts: list[str] = []  # text of the comment at each time
+
+    def load(self, times: NDArray, texts) -> None:
+        """
+        Replaces the index with the given comments.
+
+        Parameters:
+            times (NDArray): Comment times, in any order.
+            texts (Iterable[str]): Text of the comment at each time.
+        """
+        times = np.asarray(times, dtype=np.float64)
+        order = np.argsort(times, kind="stable")
+        texts = list(texts)
+        self.times = times[order]
+        self.texts = [texts[i] for i in order]
+
+    def __len__(self) -> int:
+        return len(self.texts)
+
+    def __contains__(self, time: float) -> bool:
+        return self.find(time) is not None
+
+    def find(self, time: float) -> int | None:
+        """
+        Returns the position of the comment at exactly `time`, or None if there is none.
+        """
+        i = int(np.searchsorted(self.times, time))
+        if i < len(self.times) and self.times[i] == time:
+            return i
+        return None
+
+    def get(self, time: float) -> str | None:
+        """
+        Returns the text of the comment at `time`, or None if there is none.
+        """
+        i = self.find(time)
+        return None if i is None else self.texts[i]
+
+    def set(self, time: float, text: str | None) -> None:
+        """
+        Adds, replaces or (with text None) removes the comment at `time`.
+        """
+        i = self.find(time)
+        if i is not None:
+            if text is None:
+                self.times = np.delete(self.times, i)
+                del self.texts[i]
+            else:
+                self.texts[i] = text
+        elif text is not None:
+            i = int(np.searchsorted(self.times, time))
+            self.times = np.insert(self.times, i, time)
+            self.texts.insert(i, text)
+
+    def items(self):
+        """
+        Yields (time, text) of every comment in time order.
+        """
+        return zip(self.times.tolist(), self.texts)
+
+    def as_dict(self) -> dict[float, str]:
+        """
+        Returns the text of every comment, keyed by time.
+        """
+        return dict(self.items())
+
+    def visible(self, x_min: float, x_max: float, px_per_sec: float) -> NDArray:
+        """
+        Returns the positions of the comments in [x_min, x_max], keeping only
+        the first comment of each pixel column so the result is bounded by the
+        plot width however densely the recording is marked.
+
+        Parameters:
+            x_min (float): Left edge of the view.
+            x_max (float): Right edge of the view.
+            px_per_sec (float): Screen pixels per second of the view.
+        """
+        lo = int(np.searchsorted(self.times, x_min, side="left"))
+        hi = int(np.searchsorted(self.times, x_max, side="right"))
+        if hi - lo <= 1 or not np.isfinite(px_per_sec):
+            return np.arange(lo, hi)
+
+        columns = np.floor((self.times[lo:hi] - x_min) * px_per_sec)
+        first = np.ones(hi - lo, dtype=bool)
+        first[1:] = columns[1:] != columns[:-1]
+        return np.flatnonzero(first) + lo
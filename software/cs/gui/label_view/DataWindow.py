@@ -2,6 +2,8 @@ import numpy as np
 from numpy.typing import NDArray
 import pandas as pd
 import csv
+import time
+from collections import OrderedDict
 import pandas as pd
 from pandas import DataFrame
 
@@ -15,7 +17,7 @@ from PyQt6.QtGui import (
     QKeyEvent, QWheelEvent, QMouseEvent, QColor, 
     QGuiApplication, QCursor, QAction
 )
-from PyQt6.QtCore import Qt, QPointF, QTimer, QObject, QEvent
+from PyQt6.QtCore import Qt, QPointF, QTimer, QObject, QEvent, QThread, pyqtSignal
 
 from PyQt6.QtWidgets import (
     QVBoxLayout, QLabel, QDialog, QMessageBox, QMenu, QDialogButtonBox, QFileDialog
@@ -23,13 +25,19 @@ from PyQt6.QtWidgets import (
 
 from settings import settings
 from EPGData import EPGData
+from EditJournal import CommentEdit
 from utils.PanZoomViewBox import PanZoomViewBox
+from utils.MinMaxPyramid import MinMaxPyramid, downsample
+from utils.Instrumentation import Instrumentation
+from label_view.DownsampleWorker import DownsampleWorker
 from label_view.LabelArea import LabelArea
+from label_view.LabelItemPool import LabelItemPool
+from label_view.LabelIndex import LabelIndex
+from label_view.CommentIndex import CommentIndex
 from utils.CommentMarker import CommentMarker
 from label_view.SelectionManager import Selection
 from label_view.AddLabelManager import AddLabelManager
 from utils.TextEdit import TextEdit
-from utils.ResourcePath import resource_path
 
 class DataWindow(PlotWidget):
     """
@@ -45,6 +53,8 @@ class DataWindow(PlotWidget):
 
     Also handles data loading, rendering, and downsampling for performance.
     """
+    downsampleRequested = pyqtSignal(int, object, object, object, str, object)  # request id, x, y, x range, method, pyramid
+    pyramidRequested = pyqtSignal(str, object)  # file, y
     def __init__(self, parent = None) -> None:
         """
         Initializes the DataWindow with plotting elements, UI overlays, and input handling.
@@ -67,7 +77,9 @@ class DataWindow(PlotWidget):
         self.epgdata: EPGData = self.parent().parent().epgdata
         self.file: str = None
         self.df = None
-        self.init_df = None
+        self.saved_version: int = None  # EPGData version of the file when it was loaded or last exported
+        self.init_labels = None  # label intervals at that point
+        self.init_comments: dict[float, str] = None  # comment texts at that point
         
         self.xy_data: list[NDArray] = [None, None]  # x and y data actually rendered to the screen
         self.curve: PlotDataItem = PlotDataItem(antialias=False, pen = settings.get("data_line_color")) 
@@ -75,6 +87,29 @@ class DataWindow(PlotWidget):
             symbol="o", size=4, brush=settings.get("data_line_color")
         )  # the discrete points shown at high zooms
         self.initial_downsampled_data: list[NDArray, NDArray]  # cache of the dataset after the initial downsample
+        self.pyramid: MinMaxPyramid = None  # min/max decimation levels of the current recording
+
+        # opt-in timing of the hot paths, shown next to the compression/zoom text
+        self.instrumentation = Instrumentation("DataWindow", enabled=settings.get("show_instrumentation"))
+        self.frame_start_ns: int = None  # when the viewport waiting to be drawn was first requested
+        self.instrumentation_refreshed: float = 0  # perf_counter() of the last overlay refresh
+
+        # downsampling runs on a worker thread; only the newest request is drawn
+        self.downsample_request: int = 0
+        self.downsample_method: str = 'peak'
+        self.downsample_key: tuple = None  # render cache key of the newest request
+        self.render_cache: OrderedDict[tuple, tuple[NDArray, NDArray]] = OrderedDict()  # viewport key : (x, y), least recently used first
+        self.render_cache_size: int = 32
+        self.downsample_thread = QThread(self)
+        self.downsample_worker = DownsampleWorker(self.instrumentation)
+        self.downsample_worker.moveToThread(self.downsample_thread)
+        self.downsampleRequested.connect(self.downsample_worker.downsample)
+        self.pyramidRequested.connect(self.downsample_worker.build_pyramid)
+        self.downsample_worker.resultReady.connect(self.on_downsample_ready)
+        self.downsample_worker.pyramidReady.connect(self.on_pyramid_ready)
+        self.downsample_thread.finished.connect(self.downsample_worker.deleteLater)
+        self.downsample_thread.start()
+        QGuiApplication.instance().aboutToQuit.connect(self.stop_downsample_thread)
         self.zero_line = InfiniteLine(
             pos = 0,
             angle = 90,
@@ -92,9 +127,12 @@ class DataWindow(PlotWidget):
         self.compression_text: TextItem = TextItem()
         self.zoom_level: float = 1
         self.zoom_text: TextItem = TextItem()
+        self.instrumentation_text: TextItem = TextItem()
         #self.transitions: list[tuple[float, str]] = []   # the x-values of each label transition
         self.transition_mode: str = 'labels'
         self.labels: list[LabelArea] = []  # the list of LabelAreas
+        self.label_pool: LabelItemPool = LabelItemPool(self.viewbox)  # graphics items of the on-screen LabelAreas
+        self.label_index: LabelIndex = LabelIndex(self)  # sorted label times for hit-testing
 
         # SELECTION
         self.selection: Selection = Selection(self)
@@ -119,7 +157,8 @@ class DataWindow(PlotWidget):
         self.baseline_preview_enabled: bool = False
 
         # COMMENTS
-        self.comments: dict[float, CommentMarker] = {} # the dict of CommentMarkers
+        self.comment_index: CommentIndex = CommentIndex()  # every comment of the recording
+        self.comments: dict[float, CommentMarker] = {} # CommentMarkers of the comments on screen
         self.comment_editing = False
 
         self.comment_preview: InfiniteLine = InfiniteLine(
@@ -172,7 +211,7 @@ class DataWindow(PlotWidget):
 
     def deferred_init(self) -> None:
         """
-        Defers adding compression/zoom overlays until the scene is ready.
+        Defers adding compression/zoom/instrumentation overlays until the scene is ready.
         """
         self.compression = 0
         self.compression_text = TextItem(
@@ -188,6 +227,11 @@ class DataWindow(PlotWidget):
         self.zoom_text.setPos(QPointF(80, 30))
         self.scene().addItem(self.zoom_text)
 
+        self.instrumentation_text = TextItem(text="", color="black", anchor=(0, 0))
+        self.instrumentation_text.setPos(QPointF(80, 45))
+        self.instrumentation_text.setVisible(self.instrumentation.enabled)
+        self.scene().addItem(self.instrumentation_text)
+
         self.viewbox.setXRange(0,10)
         self.update_plot_theme()
 
@@ -202,6 +246,7 @@ class DataWindow(PlotWidget):
 
         self.compression_text.setColor(plot_theme["FONT_COLOR_1"])
         self.zoom_text.setColor(plot_theme["FONT_COLOR_1"])
+        self.instrumentation_text.setColor(plot_theme["FONT_COLOR_1"])
 
         self.plot_item.getAxis("left").setPen(plot_theme["AXIS_COLOR"])
         self.plot_item.getAxis("bottom").setPen(plot_theme["AXIS_COLOR"])
@@ -211,7 +256,7 @@ class DataWindow(PlotWidget):
         self.plot_item.getAxis('right').setTicks([[]])
 
 
-        for label_area in self.labels:
+        for label_area in self.label_pool.in_use:
             label_area.refreshColor()
 
         for _, comment in self.comments.items():
@@ -225,16 +270,15 @@ class DataWindow(PlotWidget):
         elif key == "show_v_grid":
             self.plotItem.showGrid(x=value)
         elif key == "show_durations":
-            for label in self.labels:
+            for label in self.label_pool.in_use:
                 label.set_duration_visible(value)
         elif key == "show_labels":
-            for label_area in self.labels:
+            for label_area in self.label_pool.in_use:
                 label_area.setVisible(value)
                 if value:
                     label_area.update_label_area()
         elif key == "show_comments":
-            for _, comment in self.comments.items():
-                comment.set_visible(value)
+            self.update_comment_layer()
         elif key == "plot_theme":
             self.update_plot_theme()
         elif key in ("data_line_color", "data_line_width"):
@@ -243,8 +287,12 @@ class DataWindow(PlotWidget):
             pen = mkPen(color=color, width=width)
             self.curve.setPen(pen)
             self.scatter.setPen(pen)
+        elif key == "show_instrumentation":
+            self.instrumentation.set_enabled(value)
+            self.instrumentation_text.setText("")
+            self.instrumentation_text.setVisible(value)
         elif key == "label_colors":
-            for label_area in self.labels:
+            for label_area in self.label_pool.in_use:
                 label_area.refreshColor()
                 label_area.update_label_area()
 
@@ -253,10 +301,41 @@ class DataWindow(PlotWidget):
 
 
     def checkForUnsavedChanges(self) -> bool:
-        self.update_labels_column()
-        if self.init_df is None:
+        """
+        Returns True if the labels and comments match what was loaded or last exported.
+
+        O(1) when nothing was edited since; otherwise the label intervals
+        and comment texts are compared, in case the edits were undone.
+        """
+        if self.saved_version is None:
+            return True
+        self.update_label_intervals()
+        version = self.epgdata.version(self.file)
+        if version == self.saved_version:
             return True
-        return self.init_df.equals(self.df)
+
+        saved = (
+            self.init_labels == self.epgdata.get_label_intervals(self.file)
+            and self.init_comments == self.comment_texts()
+        )
+        if saved:
+            self.saved_version = version
+        return saved
+
+    def comment_texts(self) -> dict[float, str]:
+        """
+        Returns the text of every comment, keyed by time.
+        """
+        return self.comment_index.as_dict()
+
+    def mark_saved(self) -> None:
+        """
+        Records the current labels and comments as the saved state.
+        """
+        self.update_label_intervals()
+        self.saved_version = self.epgdata.version(self.file)
+        self.init_labels = self.epgdata.get_label_intervals(self.file).copy()
+        self.init_comments = self.comment_texts()
 
     def closeEvent(self, event): # not using, use in main.py
         """
@@ -272,8 +351,6 @@ class DataWindow(PlotWidget):
         """
 
         if not self.checkForUnsavedChanges(): # check if any new data or modifications
-            print("self.df (should be new file), ", self.df.head())
-            print("self.init_df (should be new file), ", self.init_df.head())
             msg_box = QMessageBox(self)
             msg_box.setWindowTitle("Unsaved Changes in Label View")
             msg_box.setText("You have unsaved changes in Label View. Do you want to save them before exiting?")
@@ -348,10 +425,8 @@ class DataWindow(PlotWidget):
             return
 
 
-        self.xy_data = [
-            self.initial_downsampled_data[0].copy(), 
-            self.initial_downsampled_data[1].copy()
-        ]
+        # rendered arrays are never modified in place, so no need to copy
+        self.xy_data = list(self.initial_downsampled_data)
 
         self.curve.setData(self.xy_data[0], self.xy_data[1])
 
@@ -375,44 +450,20 @@ class DataWindow(PlotWidget):
         if self.file is None or self.file not in self.epgdata.dfs:
             return  # no file displayed yet
 
+        start_ns = time.perf_counter_ns()
+        if self.frame_start_ns is None:
+            self.frame_start_ns = start_ns
         (x_min, x_max), _ = self.viewbox.viewRange()
 
         self.viewbox.setLimits(xMin=None, xMax=None, yMin=None, yMax=None) # clear stale data (avoids warning)
 
-        self.downsample_visible(x_range=(x_min, x_max))
-
-        x_data = self.xy_data[0]
-        y_data = self.xy_data[1]
-        self.curve.setData(x_data, y_data)
-        if len(x_data) <= 500:
-            self.scatter.setVisible(True)
-            self.scatter.setData(x_data, y_data)
-        else:
-            self.scatter.setVisible(False)
+        # the current curve stays on screen until the worker hands back this viewport
+        self.request_downsample(x_range=(x_min, x_max))
 
         self.update_compression()
         self.update_zoom()
-        for label_area in self.labels:
-            # Cull to visible labels
-            if label_area.start_time + label_area.duration < x_min:
-                continue
-            if label_area.start_time > x_max:
-                continue
-
-            # Don't render label areas <1 px wide
-            # NOTE: this can lead to multiple sequential short labels all being
-            # hidden, which can cause visible white regions, esp. when zoomed out.
-            # Not sure if there is a good fix for this, but it's pretty minor
-            left_px_loc = self.viewbox_to_window(QPointF(label_area.start_time,0)).x()
-            right_px_loc = self.viewbox_to_window(QPointF(label_area.start_time + label_area.duration, 0)).x()
-            label_width_px = right_px_loc - left_px_loc
-
-            if label_width_px < 1:
-                label_area.setVisible(False)     
-                continue           
-
-            label_area.setVisible(settings.get("show_labels"))
-            label_area.update_label_area()
+        self.update_label_layer(x_min, x_max)
+        self.update_comment_layer(x_min, x_max)
 
         self.viewbox.update()  # or anything that redraws
 
@@ -420,7 +471,91 @@ class DataWindow(PlotWidget):
             view_pos = self.window_to_viewbox(self.last_cursor_pos)
             self.selection.hover(view_pos.x(), view_pos.y())
 
-        
+        self.instrumentation.record("update_plot", start_ns, time.perf_counter_ns() - start_ns)
+
+    def request_downsample(self, x_range: tuple[float, float]) -> None:
+        """
+        Queues a downsample of the visible range on the worker thread.
+        Any request still waiting in the queue becomes stale and is skipped.
+
+        Parameters:
+            x_range (tuple[float, float]): Visible x-axis range.
+        """
+        self.downsample_request += 1
+        self.downsample_worker.latest_request = self.downsample_request
+        self.downsample_key = self.render_cache_key(x_range)
+
+        cached = self.render_cache.get(self.downsample_key)
+        if cached is not None:
+            # revisited viewport, nothing to compute (and anything queued is now stale)
+            self.render_cache.move_to_end(self.downsample_key)
+            self.draw_curve(*cached)
+            return
+
+        x, y = self.epgdata.get_recording(self.file)
+        if self.instrumentation.enabled:
+            samples = np.searchsorted(x, x_range[1], side="right") - np.searchsorted(x, x_range[0], side="left")
+            self.instrumentation.count("samples", int(samples))
+        self.downsampleRequested.emit(self.downsample_request, x, y, x_range, self.downsample_method, self.pyramid)
+
+    def render_cache_key(self, x_range: tuple[float, float]) -> tuple:
+        """
+        Returns the render cache key of a viewport: its edges quantized to
+        whole pixels, the plot width in pixels and the downsampling method.
+        """
+        x_min, x_max = x_range
+        pixel_width = max(1, int(self.viewbox.geometry().width() * self.devicePixelRatioF()))
+        pixel = (x_max - x_min) / pixel_width or 1.0
+        return (round(x_min / pixel), round(x_max / pixel), pixel_width, self.downsample_method)
+
+    def on_downsample_ready(self, request_id: int, x_data: NDArray, y_data: NDArray) -> None:
+        """
+        Draws a downsampled viewport from the worker, unless a newer one was requested since.
+        """
+        if request_id != self.downsample_request:
+            return
+
+        self.render_cache[self.downsample_key] = (x_data, y_data)
+        if len(self.render_cache) > self.render_cache_size:
+            self.render_cache.popitem(last=False)
+        self.draw_curve(x_data, y_data)
+
+    def draw_curve(self, x_data: NDArray, y_data: NDArray) -> None:
+        """
+        Puts downsampled data on screen, with discrete points at high zooms.
+        """
+        self.xy_data[0] = x_data
+        self.xy_data[1] = y_data
+        with self.instrumentation.timer("curve.setData"):
+            self.curve.setData(x_data, y_data)
+            if len(x_data) <= 500:
+                self.scatter.setVisible(True)
+                self.scatter.setData(x_data, y_data)
+            else:
+                self.scatter.setVisible(False)
+
+        if self.frame_start_ns is not None:
+            self.instrumentation.record("frame", self.frame_start_ns, time.perf_counter_ns() - self.frame_start_ns)
+            self.frame_start_ns = None
+        self.update_instrumentation_text()
+
+    def update_instrumentation_text(self) -> None:
+        """
+        Refreshes the instrumentation overlay, at most 4 times a second.
+        """
+        now = time.perf_counter()
+        if not self.instrumentation.enabled or now - self.instrumentation_refreshed < 0.25:
+            return
+        self.instrumentation_refreshed = now
+        self.instrumentation_text.setText(self.instrumentation.summary())
+
+    def on_pyramid_ready(self, file: str, pyramid: MinMaxPyramid) -> None:
+        if file == self.file:
+            self.pyramid = pyramid
+
+    def stop_downsample_thread(self) -> None:
+        self.downsample_thread.quit()
+        self.downsample_thread.wait(1000)
 
     def update_compression(self) -> None:
         """
@@ -501,8 +636,10 @@ class DataWindow(PlotWidget):
 
         if self.labels: # clear previous labels, if any
             self.selection.deselect_all()
-            for label_area in self.labels[::-1]:
-                self.selection.delete_label_area(label_area)
+            for label_area in self.labels:
+                label_area.release()
+            self.labels = []
+            self.label_index.invalidate()
 
         self.file = file
         times, volts = self.epgdata.get_recording(self.file)
@@ -511,20 +648,15 @@ class DataWindow(PlotWidget):
 
         self.xy_data[0] = times
         self.xy_data[1] = volts
+        self.pyramid = None  # raw decimation until the worker has built it
+        self.pyramidRequested.emit(file, volts)
+        self.render_cache.clear()
 
         self.downsample_visible()
         self.curve.setData(self.xy_data[0], self.xy_data[1])
-        init_x, init_y = self.xy_data[0].copy(), self.xy_data[1].copy()
-        self.initial_downsampled_data = [init_x, init_y]
+        self.initial_downsampled_data = [self.xy_data[0], self.xy_data[1]]
         self.df = self.epgdata.dfs[file]  
-    
 
-        # create a comments column if doesn't yet exist in df
-        if 'comments' not in self.df.columns:
-            self.df['comments'] = None
-            self.df['comments'] = self.df['comments'].astype(object)
-        
-        self.init_df = self.df.copy(deep = True)
 
         self.viewbox.setRange(
             xRange=(np.min(self.xy_data[0]), np.max(self.xy_data[0])), 
@@ -533,26 +665,30 @@ class DataWindow(PlotWidget):
         )
 
         self.update_plot()
-        self.plot_transitions(file)
+        with self.instrumentation.timer("plot_transitions"):
+            self.plot_transitions(file)
         self.plot_comments(file)
+        # snapshot what the LabelAreas hold so float rounding in their
+        # durations isn't mistaken for an edit
+        self.mark_saved()
         QGuiApplication.processEvents()
         QGuiApplication.restoreOverrideCursor()
 
     def plot_comments(self, file: str) -> None:
         """
-        Adds existing comment markers from the data file to the viewbox.
+        Indexes the comments of the data file and adds markers for the ones
+        on screen to the viewbox.
 
         Parameters:
             file (str): File identifier.
         """
-        
-        comments_df = self.df[~self.df["comments"].isnull()]
-        icon_path = resource_path("icons/message.svg")
-        for time, text in zip(comments_df["time"], comments_df["comments"]):
-            marker = CommentMarker(time, text, self, icon_path=icon_path)
-            self.comments[time] = marker
+        for marker in self.comments.values():
+            marker.remove()
+        self.comments.clear()
 
-        return
+        rows, texts = self.epgdata.comment_rows(file)
+        self.comment_index.load(self.df["time"].to_numpy()[rows], texts)
+        self.update_comment_layer()
 
     def add_comment_at_click(self, click_time: float) -> None:
         """
@@ -564,9 +700,10 @@ class DataWindow(PlotWidget):
 
         # find nearest time clicked
         nearest_idx, comment_time = self.find_nearest_idx_time(click_time)
-        existing = self.df.at[nearest_idx, 'comments']
+        existing = self.epgdata.get_comment(self.file, nearest_idx)
+        previous = self.comment_index.get(comment_time)
 
-        if pd.isna(existing) or str(existing).strip().lower() == "nan":
+        if existing is None or str(existing).strip().lower() == "nan":
             existing = False
 
         
@@ -605,15 +742,17 @@ class DataWindow(PlotWidget):
         text = text.toPlainText().strip()
     
         # create a new comment
-        self.df.at[nearest_idx, 'comments'] = text
+        self.epgdata.set_comment(self.file, nearest_idx, text)
+        self.comment_index.set(comment_time, text)
+        self.epgdata.mark_modified(self.file)
+        self.epgdata.journal.record(self.file, CommentEdit({comment_time: previous}, {comment_time: text}))
         marker = self.comments.get(comment_time)
         if marker:
             # if overwriting, edit text
             marker.set_text(text)
         else:
             # new comment
-            new_marker = CommentMarker(comment_time, text, self)
-            self.comments[comment_time] = new_marker
+            self.update_comment_layer()
         return
 
     def move_comment_helper(self, marker: CommentMarker):
@@ -632,29 +771,41 @@ class DataWindow(PlotWidget):
     def move_comment(self, marker: CommentMarker, click_time: float) -> None:
         new_idx, new_time = self.find_nearest_idx_time(click_time)
         old_time = marker.time
-        text = self.comments[old_time].text
-
-        # update df
-        self.df.loc[self.df['time'] == old_time, 'comments'] = None
-        self.df.at[new_idx, 'comments'] = text
-
-        # update comments dict
-        old_marker = self.comments.pop(old_time)
-        old_marker.remove()
-        new_marker = CommentMarker(new_time, text, self)
-        self.comments[new_time] = new_marker
+        text = self.comment_index.get(old_time)
+        before = {new_time: self.comment_index.get(new_time), old_time: text}
+        after = {old_time: None, new_time: text}
+
+        # update the stored comments
+        self.epgdata.set_comment(self.file, self.find_nearest_idx_time(old_time)[0], None)
+        self.epgdata.set_comment(self.file, new_idx, text)
+        self.comment_index.set(old_time, None)
+        self.comment_index.set(new_time, text)
+        self.epgdata.mark_modified(self.file)
+        if before != after:
+            self.epgdata.journal.record(self.file, CommentEdit(before, after))
+
+        # update comments dict, replacing any marker already at the new time
+        for time in (old_time, new_time):
+            if time in self.comments:
+                self.comments.pop(time).remove()
 
         marker.moving = False
         self.comment_preview_enabled = False
         self.comment_preview.setVisible(False)
+        self.update_comment_layer()
         return
 
     def edit_comment(self, marker: CommentMarker, new_text: str) -> None:
         # chck func
         nearest_idx = self.find_nearest_idx_time(marker.time)[0]
 
-        # update df
-        self.df.at[nearest_idx, 'comments'] = new_text
+        # update the stored comments
+        old_text = self.epgdata.get_comment(self.file, nearest_idx)
+        self.epgdata.set_comment(self.file, nearest_idx, new_text)
+        self.comment_index.set(marker.time, new_text)
+        self.epgdata.mark_modified(self.file)
+        if old_text != new_text:  # not already recorded by add_comment_at_click or set_comment_texts
+            self.epgdata.journal.record(self.file, CommentEdit({marker.time: old_text}, {marker.time: new_text}))
 
         # update comments dict
         time = marker.time
@@ -663,14 +814,77 @@ class DataWindow(PlotWidget):
         return
 
     def delete_comment(self, time: float) -> None:
-        # update df
-        self.df.loc[self.df["time"] == time, "comments"] = None
+        # update the stored comments
+        self.epgdata.set_comment(self.file, self.find_nearest_idx_time(time)[0], None)
+        self.epgdata.mark_modified(self.file)
+        self.epgdata.journal.record(self.file, CommentEdit({time: self.comment_index.get(time)}, {time: None}))
+        self.comment_index.set(time, None)
 
         # update dict
         marker = self.comments.pop(time)
         marker.remove()
         return
 
+    def set_comment_texts(self, texts: dict[float, str]) -> None:
+        """
+        Sets the comment at each given time, updating or removing its marker
+        and adding one if it is on screen. Used to apply undo and redo.
+
+        Parameters:
+            texts (dict[float, str]): Comment text by time, None to remove the comment.
+        """
+        for time, text in texts.items():
+            nearest_idx = self.find_nearest_idx_time(time)[0]
+            self.epgdata.set_comment(self.file, nearest_idx, text)
+            self.comment_index.set(time, text)
+
+            marker = self.comments.get(time)
+            if text is None:
+                if marker:
+                    self.comments.pop(time).remove()
+            elif marker:
+                marker.set_text(text)  # epgdata already holds text, so edit_comment records nothing
+        self.update_comment_layer()
+        self.epgdata.mark_modified(self.file)
+
+    def undo(self) -> None:
+        """
+        Reverts the latest label or comment edit of the displayed recording.
+        """
+        if self.file is None:
+            return
+        self.update_label_intervals()  # record an edit that wasn't pushed yet
+        self.show_edit(self.epgdata.undo(self.file), undo=True)
+
+    def redo(self) -> None:
+        """
+        Applies the latest undone label or comment edit again.
+        """
+        if self.file is None:
+            return
+        self.update_label_intervals()
+        self.show_edit(self.epgdata.redo(self.file), undo=False)
+
+    def show_edit(self, command, undo: bool) -> None:
+        """
+        Brings the plot in line with an edit EPGData just undid or redid.
+
+        Parameters:
+            command (LabelEdit | CommentEdit): The edit, or None if there was nothing to do.
+            undo (bool): Whether the edit was undone rather than redone.
+        """
+        if command is None:
+            return
+        if isinstance(command, CommentEdit):
+            self.set_comment_texts(command.before if undo else command.after)
+            return
+
+        # label edits are already applied to the interval store
+        self.selection.deselect_all()
+        with self.instrumentation.timer("plot_transitions"):
+            self.plot_transitions(self.file)
+        self.update_label_intervals(record=False)  # absorb float rounding in the rebuilt durations
+
     def find_nearest_idx_time(self, time: float) -> tuple[int, float]:
         """ EDIT 
         returns tuple of int for idx and float for time 
@@ -712,7 +926,7 @@ class DataWindow(PlotWidget):
     def export_comments(self):
         """ export comments in csv format """
         
-        if not self.comments:
+        if not self.comment_index:
             msg_box = QMessageBox(self)
             msg_box.setWindowTitle("No Comments")
             msg_box.setText("There are no comments to export from this live viewing.")
@@ -730,8 +944,8 @@ class DataWindow(PlotWidget):
             with open(filename, 'w', newline='', encoding='utf-8') as f:
                 writer = csv.writer(f)
                 writer.writerow(['comment_time', 'comment_text'])
-                for time, marker in self.comments.items():
-                    writer.writerow([time, marker.text])
+                for time, text in self.comment_index.items():
+                    writer.writerow([time, text])
         
         return
         
@@ -745,69 +959,9 @@ class DataWindow(PlotWidget):
             x_range (tuple[float, float]): Optional x-axis range to downsample.
             max_points (int): Max number of points to plot.
             method (str): 'subsample', 'mean', or 'peak' downsampling method.
-        
-        NOTE: 
-            `subsample` samples the first point of each bin (fastest)
-            `mean` averages each bin
-            `peak` returns the min and max point of each bin (slowest, best looking)
         """
         x, y = self.epgdata.get_recording(self.file)
-
-        # Filter to x_range if provided
-        if x_range is not None:
-            x_min, x_max = x_range
-
-            left_idx = np.searchsorted(x, x_min, side="left")
-            right_idx = np.searchsorted(x, x_max, side="right")
-
-            if right_idx - left_idx <= 250: 
-                # render additional point on each side at very high zooms
-                left_idx = max(0, left_idx - 1)
-                right_idx = min(len(x), right_idx + 1)
-  
-            x = x[left_idx:right_idx]
-            y = y[left_idx:right_idx]   
-
-    
-        num_points = len(x)
-
-        if num_points <= max_points or num_points < 2:  # no downsampling needed
-            self.xy_data[0] = x
-            self.xy_data[1] = y
-            return
-        
-
-        if method == 'subsampling': 
-            stride = num_points // max_points
-            x_out = x[::stride]
-            y_out = y[::stride]
-        elif method == 'mean':
-            stride = num_points // max_points
-            num_windows = num_points // stride
-            start_idx = stride // 2
-            x_out = x[start_idx : start_idx + num_windows * stride : stride] 
-            y_out = y[:num_windows * stride].reshape(num_windows,stride).mean(axis=1)
-        elif method == 'peak':
-            stride = max(1, num_points // (max_points // 2))  # each window gives 2 points
-            num_windows = num_points // stride
-
-            start_idx = stride // 2  # Choose a representative x (near center) for each window
-            x_win = x[start_idx : start_idx + num_windows * stride : stride]
-            x_out = np.repeat(x_win, 2)  # repeated for (x, y_min), (x, y_max)
-
-            y_reshaped = y[: num_windows * stride].reshape(num_windows, stride)
-
-            y_out = np.empty(num_windows * 2)
-            y_out[::2] = y_reshaped.max(axis=1)
-            y_out[1::2] = y_reshaped.min(axis=1)
-        else:
-            raise ValueError(
-                'Invalid "method" arugment. ' \
-                'Please select either "subsampling", "mean", or "peak".'
-            )
-
-        self.xy_data[0] = x_out
-        self.xy_data[1] = y_out
+        self.xy_data[0], self.xy_data[1] = downsample(x, y, x_range, max_points, method, self.pyramid)
 
     def plot_transitions(self, file: str) -> None:
         """
@@ -818,24 +972,17 @@ class DataWindow(PlotWidget):
         """
         # clear old labels if present
         for label_area in self.labels:
-            self.plot_item.removeItem(label_area.area)
-            self.plot_item.removeItem(label_area.transition_line)
-            self.plot_item.removeItem(label_area.label_text)
-            self.plot_item.removeItem(label_area.label_background)
-            self.plot_item.removeItem(label_area.duration_text)
-            self.plot_item.removeItem(label_area.duration_background)
-            if self.enable_debug:
-                self.plot_item.removeItem(label_area.label_debug_box)
-                self.plot_item.removeItem(label_area.duration_debug_box)
+            label_area.release()
             
         self.labels = []
+        self.label_index.invalidate()
 
         # load data
         times, _ = self.epgdata.get_recording(self.file)
         transitions = self.epgdata.get_transitions(self.file, self.transition_mode)
 
-        # only continue if the label column contains labels
-        if self.epgdata.dfs[file][self.transition_mode].isna().all():
+        # only continue if the recording has labels
+        if len(transitions) == 0:
             return
         
         durations = []  # elements of (label_start_time, label_duration, label)
@@ -848,20 +995,95 @@ class DataWindow(PlotWidget):
         for i, (time, dur, label) in enumerate(durations):
             if label == None:
                 continue
-            label_area = LabelArea(time, dur, label, self) # init. also adds items to viewbox
+            # items are only taken from the pool once the label is on screen (see update_label_layer)
+            label_area = LabelArea(time, dur, label, self, realize=False)
             self.labels.append(label_area)
+        self.label_index.invalidate()
         
         self.update_right_transition_lines()
         self.update_plot()
 
+    def update_label_layer(self, x_min: float, x_max: float) -> None:
+        """
+        Gives graphics items to the LabelAreas on screen and returns those of
+        the ones that scrolled away to the pool, so the scene only holds about
+        one set of items per visible label however many the recording has.
+
+        A label is realized if it is in [x_min, x_max] and at least 1px wide,
+        or borders such a label (so every drawn boundary can be grabbed).
+        Labels the selection refers to keep their items.
+
+        Parameters:
+            x_min (float): Left edge of the view.
+            x_max (float): Right edge of the view.
+        """
+        labels = self.labels
+        on_screen = set()
+
+        if labels and x_max > x_min:
+            lo, hi = self.label_index.visible_range(x_min, x_max)
+            lo, hi = max(0, lo - 1), min(len(labels), hi + 1)
+
+            # Don't render label areas <1 px wide
+            # NOTE: this can lead to multiple sequential short labels all being
+            # hidden, which can cause visible white regions, esp. when zoomed out.
+            # Not sure if there is a good fix for this, but it's pretty minor
+            view_px = self.viewbox_to_window(QPointF(x_max, 0)).x() - self.viewbox_to_window(QPointF(x_min, 0)).x()
+            px_per_sec = view_px / (x_max - x_min)
+            durations = self.label_index.ends[lo:hi] - self.label_index.starts[lo:hi]
+            wide = durations * px_per_sec >= 1
+            near_wide = wide.copy()
+            near_wide[1:] |= wide[:-1]
+            near_wide[:-1] |= wide[1:]
+
+            on_screen = {labels[i] for i in np.flatnonzero(near_wide) + lo}
+
+        for label_area in list(self.label_pool.in_use):
+            if label_area not in on_screen and not self.selection.holds(label_area):
+                label_area.release()
+
+        show_labels = settings.get("show_labels")
+        for label_area in on_screen:
+            label_area.realize()
+            label_area.setVisible(show_labels)
+            label_area.update_label_area()
+
+    def update_comment_layer(self, x_min: float = None, x_max: float = None) -> None:
+        """
+        Builds CommentMarkers for the comments on screen and removes those of
+        the ones that scrolled away, so the scene only holds markers that can
+        be seen however many comments the recording has. At most one marker
+        is kept per pixel column, and none while comments are hidden. A
+        comment being moved keeps its marker.
+
+        Parameters:
+            x_min (float): Left edge of the view, the current view if omitted.
+            x_max (float): Right edge of the view.
+        """
+        if x_min is None:
+            (x_min, x_max), _ = self.viewbox.viewRange()
+
+        on_screen = {}
+        if settings.get("show_comments") and self.comment_index and x_max > x_min:
+            view_px = self.viewbox_to_window(QPointF(x_max, 0)).x() - self.viewbox_to_window(QPointF(x_min, 0)).x()
+            index = self.comment_index
+            for i in index.visible(x_min, x_max, view_px / (x_max - x_min)):
+                on_screen[float(index.times[i])] = index.texts[i]
+
+        for time in list(self.comments):
+            if time not in on_screen and self.comments[time] is not self.moving_comment:
+                self.comments.pop(time).remove()
+
+        for time, text in on_screen.items():
+            if time not in self.comments:
+                self.comments[time] = CommentMarker(time, text, self)
+
     def update_right_transition_lines(self):
         """
         Shows all right transition lines of LabelAreas without a right neighbor,
         hides it otherwise.
         """
         for i, label_area in enumerate(self.labels):
-            label_area.remove_right_transition_line()
-
             end_time = label_area.start_time + label_area.duration
 
             # Check if next label starts at this one's end
@@ -870,7 +1092,9 @@ class DataWindow(PlotWidget):
                 abs(self.labels[i + 1].start_time - end_time) < 1e-6  # within float error
             )
 
-            if not has_adjacent_right:
+            if has_adjacent_right:
+                label_area.remove_right_transition_line()
+            else:
                 label_area.add_right_transition_line()
 
 
@@ -882,7 +1106,7 @@ class DataWindow(PlotWidget):
             label (str): Label type to update.
             color (QColor): Color to set the label areas to.
         """
-        for label_area in self.labels:
+        for label_area in self.label_pool.in_use:
             if label_area.label == label:
                 label_area.area.setBrush(mkBrush(color))
                 label_area.update_label_area()
@@ -904,7 +1128,7 @@ class DataWindow(PlotWidget):
         Parameters:
             visible (bool): Whether to show or hide the durations.
         """
-        for label_area in self.labels:
+        for label_area in self.label_pool.in_use:
             label_area.set_duration_visible(visible)
          
 
@@ -932,56 +1156,21 @@ class DataWindow(PlotWidget):
         Returns:
             (InfiniteLine, float): Closest transition line and pixel distance.
         """
-        if not self.labels:
+        hit = self.label_index.closest_boundary(x)
+        if hit is None:
             return None, float('inf')  # no labels present
-        
-        candidates = []
-        for label in self.labels:
-            # Add left/start transition line
-            if label.transition_line is not None:
-                candidates.append((label.transition_line, label.start_time))
-
-            # (maybe) add right/end transition line
-            if label.right_transition_line is not None:
-                end_time = label.start_time + label.duration
-                candidates.append((label.right_transition_line, end_time))
-
-        # Compute distances and find closest
-        closest_line = None
-        closest_dist_px = float('inf')
-
-        for line, t in candidates:
-            dist_px = abs(self.viewbox_to_window(QPointF(t, 0)).x() - self.viewbox_to_window(QPointF(x, 0)).x())
-            if dist_px < closest_dist_px:
-                closest_line = line
-                closest_dist_px = dist_px
-
-        return closest_line, closest_dist_px
-        
-        # transitions = np.array([label_area.start_time for label_area in self.labels])
-        # idx = np.searchsorted(transitions, x)
 
-        # zero_point = self.viewbox_to_window(QPointF(0,0)).x()
-        
-        # if idx == len(transitions):
-        #     transition = self.labels[idx-1].transition_line
-        #     dist = abs(transitions[idx-1] - x)
-        #     dist_px = self.viewbox_to_window(QPointF(dist, 0)).x() - zero_point
-        #     return transition, dist_px
-        
-        # else:
-        #     # Check which of the two neighbors is closer
-        #     dist_to_left = abs(x - transitions[idx-1])
-        #     dist_to_right = abs(transitions[idx] - x)
-
-        #     if dist_to_left <= dist_to_right:
-        #         transition = self.labels[idx-1].transition_line
-        #         dist_px = self.viewbox_to_window(QPointF(dist_to_left, 0)).x()- zero_point
-        #         return transition, dist_px
-        #     else:
-        #         transition = self.labels[idx].transition_line
-        #         dist_px = self.viewbox_to_window(QPointF(dist_to_right, 0)).x()- zero_point
-        #         return transition, dist_px
+        idx, is_right, t = hit
+        label = self.labels[idx]
+        (x_min, x_max), _ = self.viewbox.viewRange()
+        if x_min <= t <= x_max:
+            label.realize()  # may be too narrow to have been drawn at this zoom
+        line = label.right_transition_line if is_right else label.transition_line
+        if line is None:
+            return None, float('inf')  # off screen
+
+        dist_px = abs(self.viewbox_to_window(QPointF(t, 0)).x() - self.viewbox_to_window(QPointF(x, 0)).x())
+        return line, dist_px
             
     def get_baseline_distance(self, y: float) -> float:
         """
@@ -1007,15 +1196,9 @@ class DataWindow(PlotWidget):
         Returns:
             LabelArea: Label area the x-coordinate is part of.
         """
-        if not self.labels:
-            return None
-
-        if x < self.labels[0].start_time or x > (self.labels[-1].start_time + self.labels[-1].duration):
-            return None  # outside the labels
-        label_ends = np.array([label.start_time + label.duration for label in self.labels])
-        idx = np.searchsorted(label_ends, x)  # idk why this works
-        if idx >= len(self.labels):
-            return self.labels[-1]
+        idx = self.label_index.label_at(x)
+        if idx is None:
+            return None  # no labels, or outside the labels
         return self.labels[idx]
 
     def delete_all_label_instances(self, label: str) -> None:
@@ -1036,61 +1219,53 @@ class DataWindow(PlotWidget):
         self.baseline_preview_enabled = False
         self.baseline_preview.setVisible(False)
 
-    def update_labels_column(self) -> None:
+    def update_label_intervals(self, record: bool = True) -> None:
         """
-        Recomputes the 'labels' column in the DataFrame from the current LabelAreas.
-
-        Each LabelArea is assigned to all time rows >= start and < end,
-        except for the final LabelArea, which is inclusive of the end time.
+        Pushes the current LabelAreas to the EPGData interval store.
+        If they changed and `record` is set, the change becomes an undo step.
 
+        Costs O(#labels); the dense 'labels' column is only rebuilt
+        from the intervals when it is exported or fed to a model.
         """
         if self.df is None:
             return
 
-        times = self.df["time"].values
-        labels_array = np.full(len(times), np.nan, dtype=object)
-
-        for i, area in enumerate(self.labels):
-            start_time = area.start_time
-            end_time = start_time + area.duration
-            label = area.label
-
-            start_idx = np.searchsorted(times, start_time, side="left")
-
-            is_last_label = (i == len(self.labels) - 1)
-            if is_last_label:
-                end_idx = np.searchsorted(times, end_time, side="right")  # inclusive
-            else:
-                end_idx = np.searchsorted(times, end_time, side="left")   # exclusive
-
-            if start_idx < end_idx:
-                labels_array[start_idx:end_idx] = label
-
-            # Only clear exact edge on non-final labels
-            if not is_last_label and end_idx < len(times) and np.isclose(times[end_idx], end_time):
-                labels_array[end_idx] = np.nan
-
-        self.df["labels"] = labels_array
+        self.label_index.sync()
+        self.epgdata.set_label_intervals(
+            self.file,
+            self.label_index.starts.copy(),
+            self.label_index.ends.copy(),
+            [area.label for area in self.labels],
+            record,
+        )
 
     def export_df(self) -> bool:
         filename, _ = QFileDialog.getSaveFileName(
             parent=self,
             caption="Export Data As",
-            filter="CSV Files (*.csv);;All Files (*)"
+            filter="CSV Files (*.csv);;Parquet Files (*.parquet);;All Files (*)"
         )
         if not filename:
             return False
         
         QGuiApplication.setOverrideCursor(QCursor(Qt.CursorShape.WaitCursor))
-        self.init_df = self.df
-        df = self.df
+        try:
+            self.update_label_intervals()
+            if filename.lower().endswith(".parquet"):
+                exported = self.epgdata.export_parquet(self.file, filename)
+            else:
+                exported = self.epgdata.export_csv(self.file, filename)
+        finally:
+            QGuiApplication.restoreOverrideCursor()
 
-        if isinstance(df.index, pd.RangeIndex):
-            df.to_csv(filename, index=True)
-        else:
-            df.to_csv(filename, index=False)
+        if not exported:
+            # keep the unsaved changes, so closing still warns about them
+            QMessageBox.warning(
+                self, "Export Failed", f"Could not export to {filename}.\nSee the console output for details."
+            )
+            return False
 
-        QGuiApplication.restoreOverrideCursor()
+        self.mark_saved()
         return True
 
     def keyPressEvent(self, event: QKeyEvent) -> None:
@@ -1178,8 +1353,7 @@ class DataWindow(PlotWidget):
         if self.moving_mode:
             # if transition line was released, update data transition line
             if isinstance(self.selected_item, InfiniteLine) and self.selected_item is not self.baseline:
-                transitions = [(label_area.start_time, label_area.label) for label_area in self.labels]
-                self.epgdata.set_transitions(self.file, transitions, self.transition_mode)
+                self.update_label_intervals()
             return
         elif self.add_label_manager.active:
             x = self.window_to_viewbox(event.position()).x()
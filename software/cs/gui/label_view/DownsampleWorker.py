@@ -0,0 +1,57 @@
+from PyQt6.QtCore import QObject, pyqtSignal, pyqtSlot
+
+from utils.Instrumentation import Instrumentation
+from utils.MinMaxPyramid import MinMaxPyramid, downsample
+
+
+class DownsampleWorker(QObject):
+    """
+    Downsamples the waveform for DataWindow on a background QThread.
+
+    Requests are numbered by the DataWindow, which stores the newest number
+    in `latest_request` before queueing it. Any queued request older than
+    that is skipped, so a burst of range changes (wheel zoom, scrollbar
+    drag) only computes the last viewport.
+    """
+    resultReady = pyqtSignal(int, object, object)  # request id, x data, y data
+    pyramidReady = pyqtSignal(str, object)  # file, MinMaxPyramid
+
+    def __init__(self, instrumentation: Instrumentation = None) -> None:
+        """
+        Parameters:
+            instrumentation (Instrumentation): Optional timers of the DataWindow,
+                which also count skipped requests as dropped frames.
+        """
+        super().__init__()
+        self.latest_request = 0
+        self.instrumentation = instrumentation or Instrumentation("DownsampleWorker")
+
+    @pyqtSlot(int, object, object, object, str, object)
+    def downsample(self, request_id: int, x, y, x_range, method: str, pyramid) -> None:
+        """
+        Computes one viewport, unless a newer one was requested in the meantime.
+
+        Parameters:
+            request_id (int): Number of this request.
+            x (NDArray): Sample times of the full waveform.
+            y (NDArray): The full waveform.
+            x_range (tuple[float, float]): Visible x-axis range.
+            method (str): 'subsample', 'mean', or 'peak' downsampling method.
+            pyramid (MinMaxPyramid): Precomputed levels of y, or None.
+        """
+        if request_id != self.latest_request:
+            self.instrumentation.drop_frames()
+            return
+        with self.instrumentation.timer("downsample"):
+            x_out, y_out = downsample(x, y, x_range, method=method, pyramid=pyramid)
+        if request_id != self.latest_request:
+            self.instrumentation.drop_frames()
+            return
+        self.resultReady.emit(request_id, x_out, y_out)
+
+    @pyqtSlot(str, object)
+    def build_pyramid(self, file: str, y) -> None:
+        """
+        Builds the MinMaxPyramid of a newly plotted recording.
+        """
+        self.pyramidReady.emit(file, MinMaxPyramid(y))
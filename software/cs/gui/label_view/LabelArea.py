@@ -7,7 +7,7 @@ from pyqtgraph import (
 )
 from PyQt6.QtWidgets import QGraphicsRectItem
 from PyQt6.QtCore import QPointF, QRectF, Qt
-from PyQt6.QtGui import QFont, QFontMetricsF, QPen, QColor
+from PyQt6.QtGui import QFontMetricsF, QPen, QColor
 
 from settings import settings
 
@@ -21,8 +21,12 @@ class LabelArea:
     - A transition line (`InfiniteLine`)
     - Label and duration text (`TextItem`)
     - Background rectangles and optional debug boxes
+
+    The graphical elements are only held while the label is on screen
+    (see `realize` and `release`); otherwise they are None and the
+    LabelArea is just its start time, duration and label.
     """
-    def __init__(self, time: float, dur: float, label: str, datawindow):
+    def __init__(self, time: float, dur: float, label: str, datawindow, realize: bool = True):
         """
         Initializes a new LabelArea with a label, duration, and graphical elements.
 
@@ -31,9 +35,8 @@ class LabelArea:
             dur (float): Duration of the labeled region.
             label (str): Label string (e.g. "N", "B2").
             datawindow (DataWindow): The parent DataWnidow managing this label.
-
-        Notes:
-            Also connects to the viewbox's transformChanged signal.
+            realize (bool): Whether to take graphical elements from the pool right away.
+                If False, they are taken when the label is first scrolled into view.
         """
         self.datawindow: PlotWidget  # the parent DataWindow
         self.viewbox: ViewBox # the ViewBox object that the LabelArea is being rendered in
@@ -54,6 +57,7 @@ class LabelArea:
 
         self.transition_line: InfiniteLine  # the vertical line starting the LabelArea
         self.right_transition_line: InfiniteLine # optional vertical line if this LabelArea has no right neighbor
+        self.has_right_transition_line: bool  # whether this LabelArea has no right neighbor, realized or not
         self.area: LinearRegionItem   # the colored FillBetweenItem for the label
 
         self.enable_debug: bool # whether to show debug boxes
@@ -62,69 +66,121 @@ class LabelArea:
 
         self.datawindow = datawindow
         self.viewbox = self.datawindow.viewbox
-        self.start_time = time
+        self.text_metrics = self.datawindow.label_pool.text_metrics
+        self._start_time = time
+        self._duration = dur
+        self.label = label
+        self.enable_debug = self.datawindow.enable_debug
+
+        self.area = None
+        self.transition_line = None
+        self.right_transition_line = None
+        self.has_right_transition_line = False
+        self.label_text = None
+        self.duration_text = None
+        self.label_background = None
+        self.duration_background = None
+
+        if realize:
+            self.realize()
+
+    @property
+    def start_time(self) -> float:
+        return self._start_time
+
+    @start_time.setter
+    def start_time(self, value: float) -> None:
+        self._start_time = value
+        self.datawindow.label_index.update(self)
+
+    @property
+    def duration(self) -> float:
+        return self._duration
+
+    @duration.setter
+    def duration(self, value: float) -> None:
+        self._duration = value
+        self.datawindow.label_index.update(self)
+
+    def is_realized(self) -> bool:
+        """
+        Returns whether the LabelArea currently holds graphical elements.
+        """
+        return self.area is not None
+
+    def realize(self) -> None:
+        """
+        Takes graphical elements from the DataWindow's LabelItemPool and lays
+        them out for this label. Does nothing if already realized.
+        """
+        if self.is_realized():
+            return
+
+        pool = self.datawindow.label_pool
+        (
+            self.area, self.label_text, self.duration_text,
+            self.label_background, self.duration_background
+        ) = pool.acquire_area()
+        self.transition_line = pool.acquire_line()
+        pool.in_use.add(self)
 
         _, (y_min, y_max) = self.viewbox.viewRange()
 
-        centered_x = time + dur / 2
+        centered_x = self.start_time + self.duration / 2
         label_y = y_min + 0.05 * (y_max - y_min)
         duration_y = y_max - 0.05 * (y_max - y_min)
 
-        font = QFont('Sans', 10)
-        self.text_metrics = QFontMetricsF(font)
-
-        self.label = label   
-        self.label_text = TextItem(label, color=settings.get("plot_theme")["FONT_COLOR_1"], anchor=(0.5, 0.5))
-        self.label_text.setFont(font)
+        self.label_text.setText(self.label)
         self.label_text.setPos(centered_x, label_y)
-        
-        self.viewbox.addItem(self.label_text)
-
-        self.duration = dur
-        self.duration_text = TextItem(f"{dur:.2f}", color=settings.get("plot_theme")["FONT_COLOR_1"], anchor=(0.5, 0.5))
-        self.duration_text.setFont(font)
+        self.duration_text.setText(f"{self.duration:.2f}")
         self.duration_text.setPos(centered_x, duration_y)
-        self.viewbox.addItem(self.duration_text)
-
-        self.enable_debug = self.datawindow.enable_debug
 
-        self.transition_line = InfiniteLine(
-            pos=time,
-            angle=90,  # vertical
-            pen=mkPen(color=settings.get("plot_theme")["TRANSITION_LINE_COLOR"], width=2),
-            hoverPen=None,
-            movable=False,
-        )
-        self.viewbox.addItem(self.transition_line)
-        self.right_transition_line = None
-  
-        self.area = LinearRegionItem(
-            values = (time, time + dur),
-            orientation='vertical',
-            brush=mkBrush(color=settings.get_label_color(self.label)),
-            hoverBrush=None,
-            movable=False,
-        )
-        self.area.setZValue(-10)
-        self.viewbox.addItem(self.area)
+        self.transition_line.setValue(self.start_time)
+        self.area.setRegion((self.start_time, self.start_time + self.duration))
+        if self.has_right_transition_line:
+            self.attach_right_transition_line()
 
         self.label_bbox = self.bounding_box(self.label_text)
         self.duration_bbox = self.bounding_box(self.duration_text)
+        self.update_rect(self.label_background, self.label_bbox)
+        self.update_rect(self.duration_background, self.duration_bbox)
 
-        self.label_background = self.background_box(self.label_text)
-        self.viewbox.addItem(self.label_background)
-        
-        self.duration_background = self.background_box(self.duration_text)
-        self.viewbox.addItem(self.duration_background)
+        self.refreshColor()
+        self.setVisible(settings.get("show_labels"))
+        self.set_duration_visible(settings.get("show_durations"))
 
-        #QApplication.processEvents()
+    def release(self) -> None:
+        """
+        Returns the graphical elements to the DataWindow's LabelItemPool, leaving
+        only the label's interval data. Also drops them from the selection,
+        since the pool hands them to other labels.
+        """
+        if not self.is_realized():
+            return
 
-        self.set_duration_visible(settings.get("show_durations"))
+        self.datawindow.selection.discard(self)
 
-        #self.viewbox.sigTransformChanged.connect(self.update_label_area)   
+        pool = self.datawindow.label_pool
+        pool.release_area((
+            self.area, self.label_text, self.duration_text,
+            self.label_background, self.duration_background
+        ))
+        pool.release_line(self.transition_line)
+        if self.right_transition_line is not None:
+            pool.release_line(self.right_transition_line)
+        pool.in_use.discard(self)
 
-        if self.enable_debug:
-            self.toggle_debug_boxes()   
+        for box in (getattr(self, "label_debug_box", None), getattr(self, "duration_debug_box", None)):
+            if box is not None and box.scene() is not None:
+                box.scene().removeItem(box)
+
+        self.area = None
+        self.transition_line = None
+        self.right_transition_line = None
+        self.label_text = None
+        self.duration_text = None
+        self.label_background = None
+        self.duration_background = None
 
     def toggle_debug_boxes(self) -> None:
         """
@@ -154,6 +210,8 @@ class LabelArea:
                 self.viewbox.removeItem(self.duration_debug_box)
 
     def refreshColor(self) -> None:
+        if not self.is_realized():
+            return
         self.area.setBrush(mkBrush(color=settings.get_label_color(self.label)))
         self.label_background.setBrush(mkBrush(self.get_background_color()))
         self.duration_background.setBrush(mkBrush(self.get_background_color()))
@@ -179,6 +237,8 @@ class LabelArea:
         """
         Returns whether the LabelArea is curerntly set to visible or not.
         """
+        if not self.is_realized():
+            return False
         return self.area.isVisible() # as a proxy for the whole visibility
 
 
@@ -190,6 +250,8 @@ class LabelArea:
         Parameters:
             visible (bool): Whether to show or hide the duration.
         """
+        if not self.is_realized():
+            return
         self.duration_text.setOpacity(1.0 if visible else 0.0)
         self.duration_background.setOpacity(1.0 if visible else 0.0)
         self.update_label_area()
@@ -273,7 +335,7 @@ class LabelArea:
 
         Called automatically on `sigTransformChanged` or manually after edits.
         """
-        if not settings.get("show_labels"):
+        if not settings.get("show_labels") or not self.is_realized():
             return       
          
         self.viewbox = self.datawindow.viewbox
@@ -294,6 +356,8 @@ class LabelArea:
         # if self.duration_text.toPlainText() != f"{self.duration:.2f}":  # duration changed
         self.duration_text.setText(f"{self.duration:.2f}")
         self.area.setRegion((self.start_time, self.start_time + self.duration))
+        if self.right_transition_line is not None:
+            self.right_transition_line.setValue(self.start_time + self.duration)
 
         # update text pos
         self.label_text.setPos(centered_x, label_y)
@@ -366,8 +430,11 @@ class LabelArea:
         """
         Returns:
             list: All graphical elements (area, line, texts, backgrounds, and optional debug items)
-                that make up this LabelArea.
+                that make up this LabelArea, or an empty list if it is not realized.
         """
+        if not self.is_realized():
+            return []
+
         itemsToRemove = [
             self.area, self.transition_line, self.label_text, 
             self.duration_text,self.label_background, self.duration_background
@@ -391,26 +458,31 @@ class LabelArea:
             x (float): The x-value to set the vertical transition line to.
         """
         if line == "left":
-            self.transition_line.setValue(x)
+            if self.transition_line is not None:
+                self.transition_line.setValue(x)
             self.duration -= x - self.start_time
             self.start_time = x
-        elif self.right_transition_line:
-            self.right_transition_line.setValue(x)
+        elif self.has_right_transition_line:
+            if self.right_transition_line is not None:
+                self.right_transition_line.setValue(x)
             self.duration += x - (self.start_time + self.duration)
         self.update_label_area()
 
 
     def add_right_transition_line(self):
-        if self.right_transition_line is not None:
+        if self.has_right_transition_line:
             return
-        self.right_transition_line = InfiniteLine(
-            pos= self.start_time + self.duration,
-            angle=90,  # vertical
-            pen=mkPen(color=settings.get("plot_theme")["TRANSITION_LINE_COLOR"], width=2), # updated below
-            hoverPen=None,
-            movable=False,
-        )
-        self.viewbox.addItem(self.right_transition_line)
+        self.has_right_transition_line = True
+        self.datawindow.label_index.set_right(self, True)
+        if self.is_realized():
+            self.attach_right_transition_line()
+
+    def attach_right_transition_line(self):
+        """
+        Takes a line from the pool to draw the right transition line of a realized LabelArea.
+        """
+        self.right_transition_line = self.datawindow.label_pool.acquire_line()
+        self.right_transition_line.setValue(self.start_time + self.duration)
         selection = self.datawindow.selection
         if selection and selection.is_selected(self):
             self.right_transition_line.setPen(selection.selected_style['transition line'])
@@ -420,7 +492,11 @@ class LabelArea:
             self.right_transition_line.setPen(selection.default_style['transition line'])
 
     def remove_right_transition_line(self):
+        if self.has_right_transition_line:
+            self.has_right_transition_line = False
+            self.datawindow.label_index.set_right(self, False)
         if self.right_transition_line is None:
             return
-        self.viewbox.removeItem(self.right_transition_line)
-        self.right_transition_line = None
\ No newline at end of file
+        self.datawindow.selection.discard(self.right_transition_line)
+        self.datawindow.label_pool.release_line(self.right_transition_line)
+        self.right_transition_line = None
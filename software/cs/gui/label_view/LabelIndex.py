@@ -0,0 +1,236 @@
+import bisect
+
+import numpy as np
+from numpy.typing import NDArray
+
+
+class LabelIndex:
+    """
+    Sorted start and end times of a DataWindow's LabelAreas, so hover,
+    hit-testing and selection lookups are binary searches instead of loops
+    over every label.
+
+    Moving a label boundary, removing a label or adding or removing a right
+    transition line updates the arrays in place (LabelArea and
+    SelectionManager report these), so deleting or merging many labels
+    costs no rebuilds. Adding or reordering labels calls `invalidate` and
+    the arrays are rebuilt on the next query.
+    """
+    def __init__(self, datawindow) -> None:
+        """
+        Parameters:
+            datawindow (DataWindow): The DataWindow whose `labels` are indexed.
+        """
+        self.datawindow = datawindow
+        self.dirty: bool = True
+
+        self.starts: NDArray = np.empty(0)  # start time of each label
+        self.ends: NDArray = np.empty(0)  # end time of each label
+        self.has_right: NDArray = np.empty(0, dtype=bool)  # whether each label has a right transition line
+        self.positions: dict = {}  # LabelArea : index in datawindow.labels at the last rebuild
+        self.removed: list[int] = []  # rebuild-time indices of the labels removed since, ascending
+
+        # every transition line, left and right, in time order
+        self.boundaries: NDArray = np.empty(0)  # time of each line
+        self.boundary_owner: NDArray = np.empty(0, dtype=np.intp)  # index of the label owning each line
+        self.boundary_right: NDArray = np.empty(0, dtype=bool)  # whether each line is a right transition line
+        self.boundary_of: NDArray = np.empty(0, dtype=np.intp)  # index of each label's left line in boundaries
+
+    def invalidate(self) -> None:
+        """
+        Marks the index for a rebuild after labels were added, removed or reordered.
+        """
+        self.dirty = True
+
+    def sync(self) -> None:
+        """
+        Rebuilds the arrays from the DataWindow's labels, if invalidated.
+        """
+        if not self.dirty:
+            return
+
+        labels = self.datawindow.labels
+        n = len(labels)
+        self.starts = np.fromiter((la.start_time for la in labels), dtype=np.float64, count=n)
+        durations = np.fromiter((la.duration for la in labels), dtype=np.float64, count=n)
+        self.ends = self.starts + durations
+        self.has_right = np.fromiter((la.has_right_transition_line for la in labels), dtype=bool, count=n)
+        self.positions = {la: i for i, la in enumerate(labels)}
+        self.removed = []
+
+        # labels don't overlap, so interleaving starts and ends keeps times sorted
+        keep = np.column_stack((np.ones(n, dtype=bool), self.has_right)).ravel()
+        self.boundaries = np.column_stack((self.starts, self.ends)).ravel()[keep]
+        self.boundary_owner = np.repeat(np.arange(n), 2)[keep]
+        self.boundary_right = np.tile([False, True], n)[keep]
+        self.boundary_of = np.flatnonzero(~self.boundary_right)
+
+        self.dirty = False
+
+    def update(self, label_area) -> None:
+        """
+        Updates the times of one label in place after its start time or duration changed.
+
+        Parameters:
+            label_area (LabelArea): The label that was edited.
+        """
+        if self.dirty:
+            return
+        i = self._current_position(label_area)
+        if i is None:
+            return  # not in the list yet; adding it invalidates the index
+
+        start = label_area.start_time
+        end = start + label_area.duration
+        self.starts[i] = start
+        self.ends[i] = end
+
+        b = self.boundary_of[i]
+        self.boundaries[b] = start
+        if self.has_right[i]:
+            self.boundaries[b + 1] = end
+
+    def remove(self, label_area) -> None:
+        """
+        Drops one label from the arrays, before or after it is removed from the
+        DataWindow's labels.
+
+        Parameters:
+            label_area (LabelArea): The label being removed.
+        """
+        if self.dirty:
+            return
+        i = self._current_position(label_area)
+        if i is None:
+            return
+        bisect.insort(self.removed, self.positions.pop(label_area))
+
+        b = self.boundary_of[i]
+        lines = slice(b, b + 2 if self.has_right[i] else b + 1)
+        self.boundaries = np.delete(self.boundaries, lines)
+        self.boundary_right = np.delete(self.boundary_right, lines)
+        self.boundary_owner = np.delete(self.boundary_owner, lines)
+        self.boundary_owner[self.boundary_owner > i] -= 1
+        self.boundary_of = np.delete(self.boundary_of, i)
+        self.boundary_of[i:] -= lines.stop - lines.start
+
+        self.starts = np.delete(self.starts, i)
+        self.ends = np.delete(self.ends, i)
+        self.has_right = np.delete(self.has_right, i)
+
+    def set_right(self, label_area, has_right: bool) -> None:
+        """
+        Adds or removes a label's right transition line in the arrays.
+
+        Parameters:
+            label_area (LabelArea): The label whose right transition line changed.
+            has_right (bool): Whether it now has one.
+        """
+        if self.dirty:
+            return
+        i = self._current_position(label_area)
+        if i is None or self.has_right[i] == has_right:
+            return
+        self.has_right[i] = has_right
+
+        b = self.boundary_of[i] + 1
+        if has_right:
+            self.boundaries = np.insert(self.boundaries, b, self.ends[i])
+            self.boundary_right = np.insert(self.boundary_right, b, True)
+            self.boundary_owner = np.insert(self.boundary_owner, b, i)
+            self.boundary_of[i + 1:] += 1
+        else:
+            self.boundaries = np.delete(self.boundaries, b)
+            self.boundary_right = np.delete(self.boundary_right, b)
+            self.boundary_owner = np.delete(self.boundary_owner, b)
+            self.boundary_of[i + 1:] -= 1
+
+    def _current_position(self, label_area) -> int | None:
+        """
+        Returns the index of a LabelArea in the arrays, or None if it isn't indexed.
+        """
+        i = self.positions.get(label_area)
+        if i is None:
+            return None
+        return i - bisect.bisect_left(self.removed, i)
+
+    def position(self, label_area) -> int:
+        """
+        Returns the index of a LabelArea in the DataWindow's labels.
+
+        Raises:
+            ValueError: If the LabelArea is not in the list.
+        """
+        self.sync()
+        i = self._current_position(label_area)
+        if i is None:
+            raise ValueError("LabelArea is not in the label list")
+        return i
+
+    def label_at(self, x: float) -> int | None:
+        """
+        Returns the index of the label covering x (the next label if x is in a
+        gap between two), or None if x is outside all labels.
+
+        Parameters:
+            x (float): ViewBox x-coordinate.
+        """
+        self.sync()
+        if len(self.starts) == 0:
+            return None
+        if x < self.starts[0] or x > self.ends[-1]:
+            return None
+        return min(int(np.searchsorted(self.ends, x)), len(self.ends) - 1)
+
+    def closest_boundary(self, x: float) -> tuple[int, bool, float] | None:
+        """
+        Finds the transition line nearest to x.
+
+        Parameters:
+            x (float): ViewBox x-coordinate.
+        Returns:
+            (int, bool, float): Index of the owning label, whether it is that label's
+                right transition line, and its time. None if there are no labels.
+        """
+        self.sync()
+        if len(self.boundaries) == 0:
+            return None
+
+        b = int(np.searchsorted(self.boundaries, x))
+        if b == len(self.boundaries) or (b > 0 and x - self.boundaries[b - 1] <= self.boundaries[b] - x):
+            b -= 1
+        return int(self.boundary_owner[b]), bool(self.boundary_right[b]), float(self.boundaries[b])
+
+    def line_owner(self, line) -> tuple[int, bool] | None:
+        """
+        Finds the label a transition line belongs to.
+
+        Parameters:
+            line (InfiniteLine): A left or right transition line.
+        Returns:
+            (int, bool): Index of the owning label and whether the line is its
+                right transition line, or None if no label owns the line.
+        """
+        labels = self.datawindow.labels
+        hit = self.closest_boundary(line.value())
+        if hit is not None:
+            i, is_right, _ = hit
+            owned = labels[i].right_transition_line if is_right else labels[i].transition_line
+            if owned is line:
+                return i, is_right
+
+        for i, label in enumerate(labels):  # fallback, e.g. for zero-length labels
+            if label.transition_line is line:
+                return i, False
+            if label.right_transition_line is line:
+                return i, True
+        return None
+
+    def visible_range(self, x_min: float, x_max: float) -> tuple[int, int]:
+        """
+        Returns the slice [lo, hi) of labels overlapping [x_min, x_max].
+        """
+        self.sync()
+        lo = int(np.searchsorted(self.ends, x_min, side="left"))
+        hi = int(np.searchsorted(self.starts, x_max, side="right"))
+        return lo, hi
@@ -0,0 +1,94 @@
+from pyqtgraph import ViewBox, TextItem, InfiniteLine, LinearRegionItem
+from PyQt6.QtWidgets import QGraphicsRectItem
+from PyQt6.QtCore import Qt
+from PyQt6.QtGui import QFont, QFontMetricsF, QPen
+
+
+class LabelItemPool:
+    """
+    Recycles the graphics items that draw LabelAreas.
+
+    Only LabelAreas on screen hold items; the rest are plain interval data.
+    Items handed back are hidden but stay in the viewbox, so scrolling a
+    label back into view reuses them instead of building new scene items.
+    """
+    def __init__(self, viewbox: ViewBox) -> None:
+        """
+        Parameters:
+            viewbox (ViewBox): The ViewBox the label items are rendered in.
+        """
+        self.viewbox: ViewBox = viewbox
+        self.font: QFont = QFont('Sans', 10)
+        self.text_metrics: QFontMetricsF = QFontMetricsF(self.font)
+
+        self.free_areas: list[tuple] = []  # (area, label_text, duration_text, label_background, duration_background)
+        self.free_lines: list[InfiniteLine] = []  # transition lines, left or right
+        self.in_use: set = set()  # LabelAreas currently holding items
+
+    def acquire_area(self) -> tuple[LinearRegionItem, TextItem, TextItem, QGraphicsRectItem, QGraphicsRectItem]:
+        """
+        Returns a free set of area, text and text background items, building one if none is left.
+
+        Returns:
+            tuple: (area, label_text, duration_text, label_background, duration_background)
+        """
+        if self.free_areas:
+            return self.free_areas.pop()
+
+        area = LinearRegionItem(
+            values=(0, 0),
+            orientation='vertical',
+            hoverBrush=None,
+            movable=False,
+        )
+        area.setZValue(-10)
+
+        label_text = TextItem("", anchor=(0.5, 0.5))
+        label_text.setFont(self.font)
+        duration_text = TextItem("", anchor=(0.5, 0.5))
+        duration_text.setFont(self.font)
+
+        label_background = QGraphicsRectItem()
+        duration_background = QGraphicsRectItem()
+        for background in (label_background, duration_background):
+            background.setPen(QPen(Qt.PenStyle.NoPen))
+            # Below the TextItems, which render at Z = 0 regardless
+            background.setZValue(-1)
+
+        items = (area, label_text, duration_text, label_background, duration_background)
+        for item in items:
+            self.viewbox.addItem(item)
+        return items
+
+    def release_area(self, items: tuple) -> None:
+        """
+        Hides a set of items from `acquire_area` and makes it available again.
+        """
+        for item in items:
+            item.setVisible(False)
+        self.free_areas.append(items)
+
+    def acquire_line(self) -> InfiniteLine:
+        """
+        Returns a free vertical transition line, building one if none is left.
+        """
+        if self.free_lines:
+            line = self.free_lines.pop()
+            line.setVisible(True)
+            return line
+
+        line = InfiniteLine(
+            pos=0,
+            angle=90,  # vertical
+            hoverPen=None,
+            movable=False,
+        )
+        self.viewbox.addItem(line)
+        return line
+
+    def release_line(self, line: InfiniteLine) -> None:
+        """
+        Hides a line from `acquire_line` and makes it available again.
+        """
+        line.setVisible(False)
+        self.free_lines.append(line)
@@ -101,6 +101,7 @@ class Labeler(QObject):
         probe_splitter = UNetProbeSplitter()
         probe_splitter.load(r".\models\unet_probesplitter_weights")
 
+        epgdata.materialize_labels(epgdata.current_file)
         data = epgdata.dfs[epgdata.current_file]
         true_str = data["labels"].astype(str).str.upper()
         true_binary = (~true_str.isin(["N", "Z"])).astype(int).to_numpy()
@@ -108,12 +109,12 @@ class Labeler(QObject):
         self.start_labeling_progress.emit(25, 100)
 
         predicted_binary = probe_splitter.predict([data])[0]
-        predicted_str = np.array(["NP" if label == 0 else "P" for label in predicted_binary])
-        predicted_np = np.array(predicted_str, dtype="object")
+        predicted_labels = pd.Categorical.from_codes(np.asarray(predicted_binary, dtype=np.int8), ["NP", "P"])
+        predicted_str = np.asarray(predicted_labels)
 
 
         # assert len(true_binary) == len(predicted_binary)
-        data["labels"] = predicted_np
+        epgdata.set_labels(epgdata.current_file, predicted_labels)
         datawindow.plot_recording(epgdata.current_file)
         self.start_labeling_progress.emit(100, 100)
 
@@ -132,9 +133,10 @@ class Labeler(QObject):
         self.start_labeling_progress.emit(25, 100)
         probes = SimpleProbeSplitter.simple_probe_finder(pre_rect)
         self.start_labeling_progress.emit(50, 100)
-        data['labels'] = 'NP'
+        codes = np.zeros(len(data), dtype=np.int8) # 0 = NP, 1 = P
         for i, (start, end) in enumerate(probes, start=1):
-            data.loc[start:end, 'labels'] = 'P'
+            codes[start:end + 1] = 1
+        epgdata.set_labels(epgdata.current_file, pd.Categorical.from_codes(codes, ["NP", "P"]))
         datawindow.plot_recording(epgdata.current_file)
         self.start_labeling_progress.emit(100, 100)
 
@@ -146,6 +148,7 @@ class Labeler(QObject):
             print("No model loaded!")
             return
         
+        epgdata.materialize_labels(epgdata.current_file)
         current_file = epgdata.dfs[epgdata.current_file]
         # We need to split based on the probe labels
         probe_indices = self.leak_probe_finder(current_file["labels"].values)
@@ -182,10 +185,12 @@ class Labeler(QObject):
         """
         # Fill in only in probing regions
 
-        labels = np.repeat("NP", current_file.shape[0])
+        categories = pd.Index(["NP", *self.model.inv_label_map.values()]).unique()
+        codes = np.zeros(current_file.shape[0], dtype=np.int16) # everything outside a probe is NP
         for i, probe in enumerate(probe_indices):
             start, end = probe
-            labels[start:end + 1] = smoothed[i]
+            codes[start:end + 1] = categories.get_indexer(smoothed[i])
+        labels = pd.Categorical.from_codes(codes, categories)
 
         # Save and write to screen
         epgdata.set_labels(epgdata.current_file, labels)
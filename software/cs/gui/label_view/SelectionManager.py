@@ -92,18 +92,20 @@ class Selection:
         if isinstance(item, InfiniteLine):
             item.setPen(self.selected_style['transition line']) # same as highlighting currently
         if isinstance(item, LabelArea):
+            item.realize()  # selection may reach off-screen labels
             if item.transition_line:
                 item.transition_line.setPen(self.selected_style['transition line'])
                 if item.transition_line not in self.selected_items:
                     self.selected_items.append(item.transition_line)
 
-            idx = labels.index(item)
+            idx = self.datawindow.label_index.position(item)
             if item.right_transition_line:
                 item.right_transition_line.setPen(self.selected_style['transition line'])
                 if item.right_transition_line not in self.selected_items:
                     self.selected_items.append(item.right_transition_line)
             elif idx + 1 < len(labels):
                 next_label = labels[idx + 1]
+                next_label.realize()
                 if next_label.transition_line:
                     next_label.transition_line.setPen(self.selected_style['transition line'])
                     if next_label.transition_line not in self.selected_items:
@@ -138,8 +140,8 @@ class Selection:
         parent = self.selection_parent
 
         try:
-            idx1 = labels.index(parent)
-            idx2 = labels.index(item)
+            idx1 = self.datawindow.label_index.position(parent)
+            idx2 = self.datawindow.label_index.position(item)
         except ValueError:
             return # one of the items isn't in the label list
 
@@ -164,9 +166,6 @@ class Selection:
                 item.setPen(self.default_style['transition line'])      
 
         if isinstance(item, LabelArea):
-            labels = self.datawindow.labels
-            idx = labels.index(item)
-
             item.area.setBrush(mkBrush(color=settings.get_label_color(item.label)))
             item.label_background.setBrush(mkBrush(item.get_background_color()))
             item.duration_background.setBrush(mkBrush(item.get_background_color()))
@@ -187,6 +186,52 @@ class Selection:
             if isinstance(item, LabelArea) and (item.transition_line == line or item.right_transition_line == line)
         ) > 1
 
+    def discard(self, item: InfiniteLine | LabelArea) -> None:
+        """
+        Forgets an item without restyling it, because its graphics items
+        are going back to the LabelItemPool. For a LabelArea this includes
+        its transition lines.
+
+        Parameters:
+            item (InfiniteLine | LabelArea): The item to forget.
+        """
+        items = [item]
+        if isinstance(item, LabelArea):
+            items += [line for line in (item.transition_line, item.right_transition_line) if line is not None]
+
+        for item in items:
+            if item in self.selected_items:
+                self.selected_items.remove(item)
+            if self.highlighted_item is item:
+                self.highlighted_item = None
+            if self.hovered_item is item:
+                self.hovered_item = None
+            if self.dragged_line is item:
+                self.dragged_line = None
+
+    def holds(self, label_area: LabelArea) -> bool:
+        """
+        Checks whether a LabelArea or one of its transition lines is selected,
+        highlighted, hovered or dragged, in which case its graphics items must be kept.
+
+        Parameters:
+            label_area (LabelArea): The LabelArea to check.
+
+        Returns:
+            bool: True if the selection refers to the LabelArea's items.
+        """
+        for item in (label_area, label_area.transition_line, label_area.right_transition_line):
+            if item is None:
+                continue
+            if (
+                item in self.selected_items
+                or item is self.highlighted_item
+                or item is self.hovered_item
+                or item is self.dragged_line
+            ):
+                return True
+        return False
+
     def deselect_all(self) -> None:
         """
         Clears the current selection and resets all selected item styles.
@@ -249,6 +294,9 @@ class Selection:
                 else:
                     self.delete_label_area(label_area)
 
+            if label_areas_to_delete:
+                self.datawindow.update_label_intervals()
+
     def mouse_press_event(self, event: QMouseEvent) -> None:
         """
         Handles mouse click selection logic, including Shift and Ctrl modifiers.
@@ -358,13 +406,8 @@ class Selection:
             else:
                 # Get the index of the label area the dragged line belongs to
                 labels = self.datawindow.labels
-                idx = None
-                for i, label_area in enumerate(labels):
-                    if (
-                        label_area.transition_line == self.dragged_line
-                        or label_area.right_transition_line == self.dragged_line
-                    ):
-                        idx = i
+                owner = self.datawindow.label_index.line_owner(self.dragged_line)
+                idx = owner[0] if owner is not None else None
 
                 if idx is not None:
                     if labels[idx].transition_line == self.dragged_line:
@@ -379,6 +422,7 @@ class Selection:
                         self.highlighted_item = self.dragged_line
                         self.deselect_item(self.dragged_line)
                 self._attempt_snap_and_merge(self.dragged_line)
+                self.datawindow.update_label_intervals()
                 
             self.moving_mode = False
             self.dragged_line = None
@@ -394,21 +438,12 @@ class Selection:
         """
         SNAP_THRESHOLD = 2 * self.datawindow.devicePixelRatioF()
         labels = self.datawindow.labels
-        idx = None
-        line_type = None
-
-        for i, label in enumerate(labels):
-            if label.transition_line == line:
-                idx = i
-                line_type = 'left'
-                break
-            elif label.right_transition_line == line:
-                idx = i
-                line_type = 'right'
-                break
-
-        if idx is None:
+        owner = self.datawindow.label_index.line_owner(line) if line is not None else None
+
+        if owner is None:
             return  # line not associated with a label
+        idx, is_right = owner
+        line_type = 'right' if is_right else 'left'
     
 
         if line_type == "left" and idx > 0:
@@ -467,14 +502,10 @@ class Selection:
             self.datawindow.baseline.setPos(y)
             return
 
-        labels = self.datawindow.labels
-        for i, label in enumerate(labels):
-            if label.transition_line == line:
-                self._apply_drag_transition(i, x, which_line='left')
-                return
-            elif label.right_transition_line == line:
-                self._apply_drag_transition(i, x, which_line='right')
-                return
+        owner = self.datawindow.label_index.line_owner(line)
+        if owner is not None:
+            idx, is_right = owner
+            self._apply_drag_transition(idx, x, which_line='right' if is_right else 'left')
     
     
     def _apply_drag_transition(self, index: int, x: float, which_line: Literal['left', 'right']) -> None:
@@ -557,26 +588,21 @@ class Selection:
             multi_delete (bool): Whether a multi-selection is being deleted.
         """
         labels = self.datawindow.labels
-        idx = labels.index(label_area)
+        idx = self.datawindow.label_index.position(label_area)
 
         # Update left neighbor to add right_transition_line
         if idx > 0:
             left_neighbor = labels[idx - 1]
-            if not left_neighbor.right_transition_line:
-                x = label_area.start_time + label_area.duration
-                left_neighbor.add_right_transition_line()
-
-        
-        # Remove all visual elements
-        for item in label_area.getItems():
-            scene = item.scene()
-            if scene:
-                scene.removeItem(item)
+            left_neighbor.add_right_transition_line()
 
         if self.is_selected(label_area):
             self.deselect_item(label_area)
 
-        self.datawindow.labels.remove(label_area)
+        # Return visual elements to the pool
+        label_area.release()
+
+        self.datawindow.label_index.remove(label_area)
+        del labels[idx]
 
         if self.datawindow.last_cursor_pos:
             view_pos = self.datawindow.window_to_viewbox(self.datawindow.last_cursor_pos)
@@ -597,7 +623,7 @@ class Selection:
         if not labels:
             return
         
-        idx = labels.index(label_area)
+        idx = self.datawindow.label_index.position(label_area)
         before = labels[idx - 1] if idx > 0 else None
         after = labels[idx + 1] if idx + 1 < len(labels) else None
 
@@ -619,15 +645,12 @@ class Selection:
 
         def remove_label_area(area: LabelArea) -> None:
             """Helper function to remove label areas from the viewbox and update labels."""
-            for item in area.getItems():
-                scene = item.scene()
-                if scene is not None:
-                    scene.removeItem(item)
-
             if area in self.datawindow.labels:
                 if self.is_selected(area):
                     self.deselect_item(area)
+                self.datawindow.label_index.remove(area)
                 self.datawindow.labels.remove(area)
+            area.release()
 
         if merging_left and merging_right:
             if self.is_selected(label_area):
@@ -638,9 +661,7 @@ class Selection:
 
             before.duration += + label_area.duration + after.duration
             before.update_label_area()
-
-            if before.right_transition_line:
-                before.remove_right_transition_line()
+            before.remove_right_transition_line()
 
         elif merging_left:
             if self.is_selected(label_area):
@@ -649,17 +670,13 @@ class Selection:
             remove_label_area(label_area)
             before.duration +=  label_area.duration
             before.update_label_area()
-
-            if before.right_transition_line:
-                before.remove_right_transition_line()
+            before.remove_right_transition_line()
 
         elif merging_right:
             remove_label_area(after)
             label_area.duration += after.duration
             label_area.update_label_area()
-
-            if label_area.right_transition_line:
-                label_area.remove_right_transition_line()
+            label_area.remove_right_transition_line()
 
         if self.datawindow.last_cursor_pos:
             view_pos = self.datawindow.window_to_viewbox(self.datawindow.last_cursor_pos)
@@ -746,6 +763,9 @@ class Selection:
         else:
             self.datawindow.setCursor(Qt.CursorShape.ArrowCursor)  # default
 
+        if isinstance(item, LabelArea):
+            item.realize()  # e.g. a label too narrow to be drawn at this zoom
+
         if self.is_selected(item):
             self.unhighlight_item(self.highlighted_item) # unhighlight previous item
             return  # don't highlight already selected items
@@ -838,8 +858,4 @@ class Selection:
             merged = self.merge_adjacent_labels(label_area)
 
         dw.viewbox.update()
-
-        if merged:
-            # kind of brute force, can we make this only update the necessary point in the df?
-            transitions = [(label_area.start_time, label_area.label) for label_area in dw.labels]
-            dw.epgdata.set_transitions(dw.file, transitions, dw.transition_mode)
\ No newline at end of file
+        dw.update_label_intervals()
\ No newline at end of file
@@ -432,7 +432,7 @@ class DevicePanel(QWidget):
             if __name__ == "__main__":
                 return
             index, voltage = (int(x) for x in line.strip().split(','))
-            self.parent().datawindow.buffer_data.append((index / 1e4, voltage / 1000))
+            self.parent().datawindow.bluetooth_ring.push(index / 1e4, voltage / 1000)
             self.parent().datawindow.current_time = index / 1e4
 
         self.bt_io.lineReceived.connect(place_line_in_live_buffer)
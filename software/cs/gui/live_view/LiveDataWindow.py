@@ -7,6 +7,7 @@ import datetime
 import csv
 import os
 import threading
+import time
 import re
 
 from pyqtgraph import PlotWidget, PlotItem, ScatterPlotItem, PlotDataItem, mkPen, InfiniteLine, TextItem
@@ -16,7 +17,11 @@ from PyQt6.QtGui import QWheelEvent, QMouseEvent, QCursor, QKeyEvent, QGuiApplic
 from PyQt6.QtWidgets import QApplication, QDialog, QVBoxLayout, QLabel, QDialogButtonBox, QMessageBox, QFileDialog
 
 from utils.PanZoomViewBox import PanZoomViewBox
+from live_view.SegmentBuffer import SegmentBuffer
+from live_view.SampleRingBuffer import SampleRingBuffer
 from utils.CommentMarker import CommentMarker
+from utils.Instrumentation import Instrumentation
+from utils.PeakKernel import peaks
 from utils.TextEdit import TextEdit
 from utils.ResourcePath import resource_path
 from settings import settings
@@ -59,6 +64,15 @@ class LiveDataWindow(PlotWidget):
         self.compression_text.setPos(QPointF(80, 15))
         self.scene().addItem(self.compression_text)
 
+        # opt-in timing of the render loop, shown below the compression text
+        self.instrumentation = Instrumentation("LiveDataWindow", enabled=settings.get("show_instrumentation"))
+        self.last_frame_ns: int = None  # perf_counter_ns() at the start of the last timed plot update
+        self.instrumentation_refreshed: float = 0  # perf_counter() of the last overlay refresh
+        self.instrumentation_text = TextItem(text="", color="black", anchor=(0, 0))
+        self.instrumentation_text.setPos(QPointF(80, 30))
+        self.instrumentation_text.setVisible(self.instrumentation.enabled)
+        self.scene().addItem(self.instrumentation_text)
+
         # --- INITIAL SETTINGS ---
         if recording_settings:
             self.recording_filename = recording_settings.get("filename")
@@ -108,14 +122,21 @@ class LiveDataWindow(PlotWidget):
         # --- DATA STORAGE ---
         # holds all historical data
         self.epgdata = self.parent().parent().epgdata
-        self.xy_data: list[NDArray] = [np.array([]), np.array([])]
+        self.xy_data: SegmentBuffer = SegmentBuffer(num_columns=2)  # (time, voltage) rows, in fixed-size segments
 
-        # temporary buffer for incoming data, to be added to full xy_data every plot update
-        self.buffer_data: list[tuple[float, float]] = []
-        self.buffer_lock = threading.Lock() # lock to prevent data loss
+        # incoming samples, moved to xy_data every plot update. Each ring has a single
+        # producer: socket samples are pushed by LiveViewTab's receive thread, BLE lines
+        # by the DevicePanel on the GUI thread, and both can be connected at once
+        self.socket_ring: SampleRingBuffer = SampleRingBuffer()
+        self.bluetooth_ring: SampleRingBuffer = SampleRingBuffer()
+        self.sample_rings: tuple[SampleRingBuffer, ...] = (self.socket_ring, self.bluetooth_ring)
 
         # store currently rendered data (downsampled for display)
         self.xy_rendered: list[NDArray] = [np.array([]), np.array([])]
+        # reused output arrays for downsampled frames, two (2, n) buffers of x and y
+        # that frames alternate between (see render_buffers)
+        self.render_buffers_xy: list[NDArray] = [np.empty((2, 2 * 4000)), np.empty((2, 2 * 4000))]
+        self.render_side: int = 0  # index of the buffer the latest frame was written to
 
         # track last rendered state to optimize plot updates
         self.last_rendered_x_range: tuple[float, float] = (0, 0)
@@ -198,6 +219,7 @@ class LiveDataWindow(PlotWidget):
         self.plot_item.setLabel("left", "<b>Voltage [V]</b>", color=plot_theme["FONT_COLOR_1"])
 
         self.compression_text.setColor(plot_theme["FONT_COLOR_1"])
+        self.instrumentation_text.setColor(plot_theme["FONT_COLOR_1"])
 
         self.plot_item.getAxis("left").setPen(plot_theme["AXIS_COLOR"])
         self.plot_item.getAxis("bottom").setPen(plot_theme["AXIS_COLOR"])
@@ -225,6 +247,10 @@ class LiveDataWindow(PlotWidget):
             pen = mkPen(color=color, width=width)
             self.curve.setPen(pen)
             self.scatter.setPen(pen)
+        elif key == "show_instrumentation":
+            self.instrumentation.set_enabled(value)
+            self.instrumentation_text.setText("")
+            self.instrumentation_text.setVisible(value)
 
 
     def closeEvent(self, event):
@@ -315,23 +341,21 @@ class LiveDataWindow(PlotWidget):
         """
         Transfers all buffered data into the full waveform dataset.
 
-        Thread-safe method that locks the buffer to prevent loss
-        during integration. Intended to be called during plot updates
-        or before closing the window.
+        Copies the samples pushed to each ring since the last call straight
+        into the segment store, without locking (every ring has one producer
+        and this is its only consumer). Intended to be called during plot
+        updates or before closing the window.
         """
-        with self.buffer_lock:
-            if not self.buffer_data:
-                return
-            # create local copy of buffer and clear orig, to release lock
-            data_to_process = self.buffer_data.copy()
-            self.buffer_data.clear()
-
-        # convert data to np array
-        new_xy_data = np.array(data_to_process, dtype=float)
-        self.data_modified = True
+        for ring in self.sample_rings:
+            if ring.drain(self.xy_data.append_columns):
+                self.data_modified = True
 
-        self.xy_data[0] = np.concatenate((self.xy_data[0], new_xy_data[:, 0]))
-        self.xy_data[1] = np.concatenate((self.xy_data[1], new_xy_data[:, 1]))
+    def discard_buffered(self) -> None:
+        """
+        Drops the samples waiting in every ring.
+        """
+        for ring in self.sample_rings:
+            ring.discard()
 
     def timed_plot_update(self):
         """
@@ -339,10 +363,35 @@ class LiveDataWindow(PlotWidget):
 
         - Moves data from the buffer to full storage.
         - Calls update_plot()
+        - Times both, if instrumentation is on. A tick that comes two or more
+          intervals after the last one counts the missed ticks as dropped
+          frames; gaps over a second are taken as the timer being stopped.
         """
-        self.integrate_buffer_to_np()
+        start_ns = time.perf_counter_ns()
+        if self.instrumentation.enabled and self.last_frame_ns is not None:
+            gap_ms = (start_ns - self.last_frame_ns) / 1e6
+            missed = int(gap_ms / self.plot_update_timer.interval()) - 1
+            if missed > 0 and gap_ms < 1000:
+                self.instrumentation.drop_frames(missed)
+        self.last_frame_ns = start_ns
+
+        with self.instrumentation.timer("integrate_buffer_to_np"):
+            self.integrate_buffer_to_np()
         self.update_plot()
 
+        self.instrumentation.record("frame", start_ns, time.perf_counter_ns() - start_ns)
+        self.update_instrumentation_text()
+
+    def update_instrumentation_text(self) -> None:
+        """
+        Refreshes the instrumentation overlay, at most 4 times a second.
+        """
+        now = time.perf_counter()
+        if not self.instrumentation.enabled or now - self.instrumentation_refreshed < 0.25:
+            return
+        self.instrumentation_refreshed = now
+        self.instrumentation_text.setText(self.instrumentation.summary())
+
     def trigger_periodic_save(self):
         """
         Periodically triggers a background save of waveform and comment data.
@@ -367,14 +416,14 @@ class LiveDataWindow(PlotWidget):
         with self.save_lock:
             self.is_saving = True
             
-            # want stable snapshot
-            times = self.xy_data[0].copy()
-            volts = self.xy_data[1].copy()
+            # want stable snapshot; stored rows never change, so only the unsaved ones are read
+            saved_length = len(self.xy_data)
+            times, volts = self.xy_data.columns(self.last_saved_data_index, saved_length)
             comments = self.comments.copy()
         
             try:
                 current_utc_time = datetime.datetime.now(datetime.timezone.utc).strftime('%Y%m%d_%H%M%S')
-                df_to_append = pd.DataFrame({'time': times[self.last_saved_data_index:], 'voltage': volts[self.last_saved_data_index:]})
+                df_to_append = pd.DataFrame({'time': times, 'voltage': volts})
                 comments_list = [{'time': t, 'comment': c.text} for t, c in comments.items()]
 
                 if not df_to_append.empty:
@@ -384,7 +433,7 @@ class LiveDataWindow(PlotWidget):
                     )
                     os.rename(self.waveform_backup_path, new_waveform_filename)
                     self.waveform_backup_path = new_waveform_filename
-                    self.last_saved_data_index = len(times)
+                    self.last_saved_data_index = saved_length
                     if not self.backup_renamed:
                         self.backup_renamed = True
                 
@@ -442,10 +491,12 @@ class LiveDataWindow(PlotWidget):
             start = end - self.auto_scroll_window
             offset = 0.1 # when zoomed in, leading line lags with plotting so need offset to keep hidden
             self.viewbox.setXRange(start, end, padding=0)
-            self.downsample_visible(self.xy_data, x_range=(start, end))
+            with self.instrumentation.timer("downsample_visible"):
+                self.downsample_visible(self.visible_xy((start, end)), x_range=(start, end))
             self.leading_line.setPos(end+offset)
         else:
-            self.downsample_visible(self.xy_data, x_range=current_x_range)
+            with self.instrumentation.timer("downsample_visible"):
+                self.downsample_visible(self.visible_xy(current_x_range), x_range=current_x_range)
             self.leading_line.setPos(self.current_time)
 
         # SCATTER
@@ -455,14 +506,15 @@ class LiveDataWindow(PlotWidget):
         default_pix_per_second = plot_width / self.default_scroll_window
         self.zoom_level = pix_per_second / default_pix_per_second
 
-        # scatter if zoom is greater than 300%
-        self.scatter.setVisible(self.zoom_level >= 3)
-        if self.scatter.isVisible():
-            self.scatter.setData(self.xy_rendered[0], self.xy_rendered[1])
-        else:
-            self.scatter.setData([], []) # clear scatter data when not visible
+        with self.instrumentation.timer("curve.setData"):
+            # scatter if zoom is greater than 300%
+            self.scatter.setVisible(self.zoom_level >= 3)
+            if self.scatter.isVisible():
+                self.scatter.setData(self.xy_rendered[0], self.xy_rendered[1])
+            else:
+                self.scatter.setData([], []) # clear scatter data when not visible
 
-        self.curve.setData(self.xy_rendered[0], self.xy_rendered[1])
+            self.curve.setData(self.xy_rendered[0], self.xy_rendered[1])
         self.viewbox.update()
 
         # update last rendered range
@@ -513,16 +565,30 @@ class LiveDataWindow(PlotWidget):
         self.update_plot()
         return
     
+    def visible_xy(self, x_range: tuple[float, float]) -> tuple[NDArray, NDArray]:
+        """
+        Returns x and y of the stored samples in x_range, plus one on each
+        side, read from the segment store without touching the rest of the
+        recording.
+
+        Parameters:
+            x_range (tuple[float, float]): Visible x-axis range.
+        """
+        start = max(0, self.xy_data.searchsorted(x_range[0], side="left") - 1)
+        stop = self.xy_data.searchsorted(x_range[1], side="right") + 1
+        return self.xy_data.columns(start, stop)
+
     def downsample_visible(
         self, full_xy_data: NDArray, x_range: tuple[float, float] = None, max_points=4000, method = 'peak'
     ) -> None:
         """
         Downsamples waveform data in the visible x range using the selected method.
-        Modifies self.xy_rendered and sorts it (efficient for comment insertion idx
-        finding).
+        Points self.xy_rendered at views of the data, or of one of the window's
+        reused render buffers when downsampling. Since the data is time-sorted, so is
+        xy_rendered (efficient for comment insertion idx finding).
 
         Parameters:
-            xy (NDArray): full xy data array.
+            xy (NDArray): x and y of the samples, at least covering x_range.
             x_range (tuple[float, float]): Optional x-axis range to downsample.
             max_points (int): Max number of points to plot.
             method (str): 'subsample', 'mean', or 'peak' downsampling method.
@@ -545,68 +611,35 @@ class LiveDataWindow(PlotWidget):
                 # render additional point on each side at very high zooms
                 left_idx = max(0, left_idx - 1)
                 right_idx = min(len(x), right_idx + 1)
-  
-  
-            x_sliced = x[left_idx:right_idx].copy()
-            y_sliced = y[left_idx:right_idx].copy()   
-        else:
-            x_sliced = x.copy()
-            y_sliced = y.copy()   
+
+            x = x[left_idx:right_idx]
+            y = y[left_idx:right_idx]
     
-        num_points = len(x_sliced)
+        num_points = len(x)
+        self.instrumentation.count("samples", num_points)
 
         if num_points <= max_points:  # no downsampling needed
             # referencing self.xy_data
-            self.xy_rendered[0] = x_sliced
-            self.xy_rendered[1] = y_sliced
+            self.xy_rendered[0] = x
+            self.xy_rendered[1] = y
             return
 
         if method == 'subsampling': 
             stride = num_points // max_points
-            x_out = x_sliced[::stride].copy()
-            y_out = y_sliced[::stride].copy()
-
+            num_windows = -(-num_points // stride)  # ceil division
+            x_out, y_out = self.render_buffers(num_windows)
+            np.copyto(x_out, x[::stride])
+            np.copyto(y_out, y[::stride])
         elif method == 'mean':
             stride = num_points // max_points
             num_windows = num_points // stride
             start_idx = stride // 2
-            x_out = x_sliced[start_idx : start_idx + num_windows * stride : stride].copy()
-            y_out = y_sliced[:num_windows * stride].reshape(num_windows, stride).mean(axis = 1)
+            x_out, y_out = self.render_buffers(num_windows)
+            np.copyto(x_out, x[start_idx : start_idx + num_windows * stride : stride])
+            np.mean(y[:num_windows * stride].reshape(num_windows, stride), axis=1, out=y_out)
         elif method == 'peak':
             stride = max(1, num_points // (max_points // 2))  # each window gives 2 points
-            num_windows = num_points // stride
-
-            x_win = x_sliced[stride // 2 : stride // 2 + num_windows * stride : stride]
-            y_reshaped = y_sliced[: num_windows * stride].reshape(num_windows, stride)
-
-            # create output arrays for peaks
-            x_out = np.empty(num_windows * 2)
-            y_out = np.empty(num_windows * 2)
-
-            # assign peaks
-            y_out[::2] = y_reshaped.max(axis=1)
-            y_out[1::2] = y_reshaped.min(axis=1)
-            x_out[::2] = x_win
-            x_out[1::2] = x_win
-
-            # if receive another mismatched shape error try this
-                # # Safely calculate number of full windows
-                # stride = max(1, num_points // (max_points // 2))
-                # num_windows = num_points // stride
-                # total_pts = num_windows * stride
-
-                # # Slice to full window size
-                # x_window = x[:total_pts]
-                # y_window = y[:total_pts]
-
-                # x_win = x_window[stride // 2::stride][:num_windows]  # in case of rounding issues
-                # y_reshaped = y_window.reshape(num_windows, stride)
-
-                # # Now generate x and y downsampled
-                # x_out = np.repeat(x_win, 2)
-                # y_out = np.empty(num_windows * 2)
-                # y_out[::2] = y_reshaped.max(axis=1)
-                # y_out[1::2] = y_reshaped.min(axis=1)
+            x_out, y_out = peaks(x, y, stride, *self.render_buffers(2 * (num_points // stride)))
         else:
             raise ValueError(
                 'Invalid "method" arugment. ' \
@@ -616,10 +649,28 @@ class LiveDataWindow(PlotWidget):
         self.xy_rendered[0] = x_out
         self.xy_rendered[1] = y_out
 
-        # sort xy_rendered for ability to add comment to past and move comment
-        sort_idx = np.argsort(self.xy_rendered[0])
-        self.xy_rendered[0] = self.xy_rendered[0][sort_idx]
-        self.xy_rendered[1] = self.xy_rendered[1][sort_idx]
+    def render_buffers(self, num_points: int) -> tuple[NDArray, NDArray]:
+        """
+        Returns x and y views of exactly `num_points` into one of the window's
+        two render buffers, growing it if needed, so nothing is allocated per
+        frame once the buffers are big enough.
+
+        Frames alternate between the buffers (double buffering) rather than
+        overwriting the previous frame's points: pyqtgraph (0.13 / 0.14) keeps
+        views of the arrays passed to setData, not copies, and computes the
+        curve's path, its bounds for autorange and the clipToView slice from
+        them lazily. Writing into those arrays before the next setData would
+        let them disagree with the caches built from them. With two buffers,
+        a frame only writes into arrays setData has already replaced.
+
+        Parameters:
+            num_points (int): Number of points the frame will render.
+        """
+        self.render_side ^= 1
+        buffer = self.render_buffers_xy[self.render_side]
+        if buffer.shape[1] < num_points:
+            buffer = self.render_buffers_xy[self.render_side] = np.empty((2, num_points))
+        return buffer[0, :num_points], buffer[1, :num_points]
 
     def add_comment_dialog(self, comment_time: float) -> str | None:
         """
@@ -834,24 +885,20 @@ class LiveDataWindow(PlotWidget):
         QGuiApplication.setOverrideCursor(QCursor(Qt.CursorShape.WaitCursor))
         self.file = file
         times, volts = self.epgdata.get_recording(self.file)
-        self.xy_data[0] = times
-        self.xy_data[1] = volts
-        self.downsample_visible(self.xy_data)
-        #init_x, init_y = self.xy_data[0].copy(), self.xy_data[1].copy()
-        self.curve.setData(self.xy_data[0], self.xy_data[1])
+        self.xy_data.clear()
+        self.xy_data.append(np.column_stack((times, volts)))
+        self.downsample_visible((times, volts))
+        #init_x, init_y = times.copy(), volts.copy()
+        self.curve.setData(times, volts)
         #self.initial_downsampled_data = [init_x, init_y]
         self.df = self.epgdata.dfs[file]  
 
         self.viewbox.setRange(
-            xRange=(np.min(self.xy_data[0]), np.max(self.xy_data[0])), 
-            yRange=(np.min(self.xy_data[1]), np.max(self.xy_data[1])), 
+            xRange=(np.min(times), np.max(times)), 
+            yRange=(np.min(volts), np.max(volts)), 
             padding=0
         )
 
-        # create a comments column if doesn't yet exist in df
-        if 'comments' not in self.df.columns:
-            self.df['comments'] = None
-
         self.current_time = self.df['time'].iloc[-1]
         
         self.update_plot()
@@ -874,9 +921,9 @@ class LiveDataWindow(PlotWidget):
             marker.remove()
         self.comments.clear()
         
-        comments_df = self.df[~self.df["comments"].isnull()]
+        rows, texts = self.epgdata.comment_rows(self.file)
         icon_path = resource_path("icons/message.svg")
-        for time, text in zip(comments_df["time"], comments_df["comments"]):
+        for time, text in zip(self.df["time"].to_numpy()[rows].tolist(), texts):
             marker = CommentMarker(time, text, self, icon_path=icon_path)
             self.comments[time] = marker
         
@@ -922,7 +969,7 @@ class LiveDataWindow(PlotWidget):
         """
         self.integrate_buffer_to_np()
 
-        if not len(self.xy_data[0]) > 0:
+        if not len(self.xy_data) > 0:
             msg_box = QMessageBox(self)
             msg_box.setWindowTitle("No Data")
             msg_box.setText("There is no data to export from this live viewing.")
@@ -940,8 +987,8 @@ class LiveDataWindow(PlotWidget):
         if not filename:
             return False
 
-        times = np.round(self.xy_data[0], 4)
-        volts = self.xy_data[1]
+        times, volts = self.xy_data.columns()
+        times = np.round(times, 4)
         
         df = DataFrame({
             "time": times,
@@ -968,7 +1015,7 @@ class LiveDataWindow(PlotWidget):
         """
         self.integrate_buffer_to_np()
 
-        if not len(self.xy_data[0]) > 0:
+        if not len(self.xy_data) > 0:
             msg_box = QMessageBox(self)
             msg_box.setWindowTitle("No Data")
             msg_box.setText("There is no data to save from this live viewing.")
@@ -988,8 +1035,8 @@ class LiveDataWindow(PlotWidget):
 
             self.recording_filename = filename # set filename so save only occurs once
         
-        times = np.round(self.xy_data[0], 4)
-        volts = self.xy_data[1]
+        times, volts = self.xy_data.columns()
+        times = np.round(times, 4)
         
         df = DataFrame({
             "time": times,
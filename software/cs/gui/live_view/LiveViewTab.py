@@ -268,10 +268,10 @@ class LiveViewTab(QWidget):
         self.slider_panel.stop_button.setEnabled(True)
 
 
-        dw.xy_data = [np.array([]), np.array([])]
+        dw.xy_data.clear()
         dw.curve.clear()
         dw.scatter.clear()
-        dw.buffer_data.clear()
+        dw.discard_buffered()
         self.socket_client.recv_queue.queue.clear()
 
         self.initial_timestamp = time.time()
@@ -313,7 +313,7 @@ class LiveViewTab(QWidget):
 
     def stop_recording(self):
         self.datawindow.plot_update_timer.stop()
-        self.datawindow.buffer_data.clear()
+        self.datawindow.discard_buffered()
 
         self.datawindow.live_mode = False
         self.pause_live_button.setEnabled(False)
@@ -358,7 +358,7 @@ class LiveViewTab(QWidget):
 
                     message_type = message['type']
 
-                    if message_type == 'data':
+                    if message_type in ('data', 'data_frame'):
                         # skip when not plotting
                         try:
                             if not self.datawindow.plot_update_timer.isActive():
@@ -366,7 +366,10 @@ class LiveViewTab(QWidget):
                         except RuntimeError:
                             break  # app closed
 
-                        result = self.process_data_message(message)
+                        if message_type == 'data':
+                            result = self.process_data_message(message)
+                        else:
+                            result = self.process_data_frame(message)
                         if result is None:
                             continue
                     elif message_type == "control":
@@ -398,11 +401,35 @@ class LiveViewTab(QWidget):
         if timestamp < 0 or device_time < self.initial_timestamp:
             return None # skip stale/negative data (if any)
 
-        with self.datawindow.buffer_lock:
-            self.datawindow.buffer_data.append((round(timestamp, 4), volt))
-            
+        self.datawindow.socket_ring.push(round(timestamp, 4), volt)
+
         self.datawindow.current_time = timestamp
         return True
+
+    def process_data_frame(self, message: dict):
+        """
+        Batch version of process_data_message for a binary data frame, whose
+        value is an array of (unix timestamp, voltage) samples.
+
+        Returns `None` if `continue` should be given to the while loop of _socket_recv_loop,
+        returns `True` otherwise.
+        """
+        if self.initial_timestamp is None:
+            return None
+
+        samples = message['value']
+        device_times = samples['time']
+        timestamps = device_times - self.initial_timestamp - self.total_pause_time
+
+        keep = (timestamps >= 0) & (device_times >= self.initial_timestamp) # skip stale/negative data (if any)
+        timestamps = np.round(timestamps[keep], 4)
+        if len(timestamps) == 0:
+            return None
+
+        self.datawindow.socket_ring.push_many(timestamps, samples['volt'][keep])
+
+        self.datawindow.current_time = float(timestamps[-1])
+        return True
         
     
     def process_control_message(self, message: str):
@@ -0,0 +1,122 @@
+import threading
+
+import numpy as np
+from numpy.typing import NDArray
+
+
+class SampleRingBuffer:
+    """
+    Single-producer, single-consumer ring of (time, voltage) samples
+    between a receive thread and the LiveDataWindow render timer.
+
+    Samples are written straight into preallocated float arrays. `head`
+    counts samples written and is only advanced by the producer, after the
+    sample is stored; `tail` counts samples read and is only advanced by
+    the consumer, after it is done with them. Each side only reads the
+    other's counter, and rebinding an int attribute is atomic under the
+    GIL, so no lock is needed as long as there is one producer thread. The
+    first push binds the ring to its thread and pushes from any other thread
+    fail an assertion; give each source of samples its own ring instead.
+
+    When the ring is full, new samples are dropped (and counted) rather
+    than overwriting ones the consumer has not read.
+    """
+    def __init__(self, capacity: int = 1 << 20) -> None:
+        """
+        Parameters:
+            capacity (int): Number of samples held, rounded up to a power of two.
+                The default holds about 100 s at 10 kHz.
+        """
+        capacity = 1 << max(0, int(capacity) - 1).bit_length()
+        self.capacity = capacity
+        self.mask = capacity - 1
+        self.times: NDArray = np.empty(capacity)
+        self.volts: NDArray = np.empty(capacity)
+        self.head: int = 0  # samples written, producer only
+        self.tail: int = 0  # samples read, consumer only
+        self.dropped: int = 0  # samples lost to a full ring, producer only
+        self.producer: int | None = None  # thread id of the producer, bound by its first push
+
+    def __len__(self) -> int:
+        return self.head - self.tail
+
+    def push(self, time: float, volt: float) -> bool:
+        """
+        Adds one sample. Producer only.
+
+        Returns:
+            bool: False if the ring was full and the sample was dropped.
+        """
+        self._check_producer()
+        head = self.head
+        if head - self.tail >= self.capacity:
+            self.dropped += 1
+            return False
+        i = head & self.mask
+        self.times[i] = time
+        self.volts[i] = volt
+        self.head = head + 1  # publish after the sample is stored
+        return True
+
+    def push_many(self, times: NDArray, volts: NDArray) -> int:
+        """
+        Adds a batch of samples, e.g. a decoded data frame, with at most two
+        array copies. Samples that don't fit are dropped. Producer only.
+
+        Returns:
+            int: Number of samples added.
+        """
+        self._check_producer()
+        head = self.head
+        n = min(len(times), self.capacity - (head - self.tail))
+        self.dropped += len(times) - n
+        if n <= 0:
+            return 0
+
+        start = head & self.mask
+        first = min(n, self.capacity - start)
+        self.times[start:start + first] = times[:first]
+        self.volts[start:start + first] = volts[:first]
+        self.times[:n - first] = times[first:n]
+        self.volts[:n - first] = volts[first:n]
+        self.head = head + n  # publish after the samples are stored
+        return n
+
+    def _check_producer(self) -> None:
+        thread = threading.get_ident()
+        if self.producer is None:
+            self.producer = thread
+        assert self.producer == thread, "SampleRingBuffer pushed to from a second producer thread"
+
+    def drain(self, sink) -> int:
+        """
+        Passes every unread sample to `sink(times, volts)` as views of the
+        ring, in one call or two if the unread part wraps around the end,
+        then frees their slots. `sink` must copy what it keeps. Consumer only.
+
+        Parameters:
+            sink (Callable[[NDArray, NDArray], None]): Receives each run of samples.
+
+        Returns:
+            int: Number of samples drained.
+        """
+        tail = self.tail
+        head = self.head  # samples up to here are fully written
+        n = head - tail
+        if n == 0:
+            return 0
+
+        start = tail & self.mask
+        first = min(n, self.capacity - start)
+        sink(self.times[start:start + first], self.volts[start:start + first])
+        if first < n:
+            sink(self.times[:n - first], self.volts[:n - first])
+
+        self.tail = head  # slots are reusable only after the sink is done with them
+        return n
+
+    def discard(self) -> None:
+        """
+        Drops every unread sample. Consumer only.
+        """
+        self.tail = self.head
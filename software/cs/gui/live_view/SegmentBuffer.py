@@ -0,0 +1,135 @@
+import bisect
+
+import numpy as np
+from numpy.typing import NDArray
+
+
+class SegmentBuffer:
+    """
+    Append-only column store for a live recording.
+
+    Rows are copied into fixed-size NumPy segments, allocated as the
+    recording grows, so appending costs only the rows appended, however
+    long the recording already is. Row i lives in segment
+    i // segment_size, and the first time of every segment is kept so time
+    windows are found with two binary searches.
+
+    Reading a range within one segment returns views; a range spanning
+    segments is gathered into new arrays, costing only the rows in the
+    range. Stored rows never move or change, so a reader on another thread
+    (the periodic backup) may read rows below a length it read earlier
+    while the GUI thread appends.
+    """
+    def __init__(self, num_columns: int = 2, segment_size: int = 1 << 20) -> None:
+        """
+        Parameters:
+            num_columns (int): Values per row, e.g. 2 for (time, voltage).
+                Column 0 must be non-decreasing for the time lookups.
+            segment_size (int): Rows per segment.
+        """
+        self.num_columns = num_columns
+        self.segment_size = segment_size
+        self.clear()
+
+    def clear(self) -> None:
+        """
+        Drops all rows. New lists are made rather than emptied, so a reader
+        holding the old ones is unaffected.
+        """
+        self.segments: list[NDArray] = []  # (num_columns, segment_size) arrays
+        self.segment_starts: list[float] = []  # column 0 of each segment's first row
+        self.length: int = 0
+
+    def __len__(self) -> int:
+        return self.length
+
+    def append(self, rows: NDArray) -> None:
+        """
+        Appends rows to the end of the store.
+
+        Parameters:
+            rows (NDArray): Array of shape (n, num_columns).
+        """
+        rows = np.asarray(rows, dtype=np.float64).reshape(-1, self.num_columns)
+        self.append_columns(*rows.T)
+
+    def append_columns(self, *columns: NDArray) -> None:
+        """
+        Appends rows given column by column, e.g. append_columns(times, volts).
+
+        Parameters:
+            columns (NDArray): num_columns arrays of the same length.
+        """
+        total = len(columns[0])
+        done = 0
+        while done < total:
+            segment, offset = divmod(self.length, self.segment_size)
+            if segment == len(self.segments):
+                self.segments.append(np.empty((self.num_columns, self.segment_size)))
+                self.segment_starts.append(float(columns[0][done]))
+            n = min(total - done, self.segment_size - offset)
+            for c, column in enumerate(columns):
+                self.segments[segment][c, offset:offset + n] = column[done:done + n]
+            done += n
+            # published last, so readers never see rows that aren't written yet
+            self.length += n
+
+    def columns(self, start: int = 0, stop: int = None) -> tuple[NDArray, ...]:
+        """
+        Returns each column of rows [start, stop), as views if the range is
+        within one segment and as new arrays otherwise.
+
+        Parameters:
+            start (int): First row.
+            stop (int): One past the last row, the current length if omitted.
+        """
+        length = self.length
+        stop = length if stop is None else min(stop, length)
+        start = max(0, min(start, stop))
+        segments = self.segments
+
+        first = start // self.segment_size
+        last = (stop - 1) // self.segment_size if stop > start else first
+        if first == last:
+            if first == len(segments):  # empty range at the end
+                return tuple(np.empty(0) for _ in range(self.num_columns))
+            offset = first * self.segment_size
+            return tuple(segments[first][:, start - offset:stop - offset])
+
+        out = np.empty((self.num_columns, stop - start))
+        pos = start
+        while pos < stop:
+            segment, offset = divmod(pos, self.segment_size)
+            n = min(stop - pos, self.segment_size - offset)
+            out[:, pos - start:pos - start + n] = segments[segment][:, offset:offset + n]
+            pos += n
+        return tuple(out)
+
+    def searchsorted(self, value: float, side: str = "left") -> int:
+        """
+        Returns the row where `value` would be inserted into column 0 to keep it sorted.
+        """
+        length = self.length
+        if length == 0:
+            return 0
+        if side == "left":
+            segment = bisect.bisect_left(self.segment_starts, value) - 1
+        else:
+            segment = bisect.bisect_right(self.segment_starts, value) - 1
+        segment = min(max(segment, 0), (length - 1) // self.segment_size)
+
+        offset = segment * self.segment_size
+        rows = min(self.segment_size, length - offset)
+        return offset + int(np.searchsorted(self.segments[segment][0, :rows], value, side=side))
+
+    def last(self) -> NDArray:
+        """
+        Returns the values of the last row.
+
+        Raises:
+            IndexError: If the store is empty.
+        """
+        if self.length == 0:
+            raise IndexError("SegmentBuffer is empty")
+        segment, offset = divmod(self.length - 1, self.segment_size)
+        return self.segments[segment][:, offset].copy()
@@ -5,7 +5,10 @@ import queue
 import time
 import sys
 import logging
+import struct
 
+import numpy as np
+from numpy.typing import NDArray
 from PyQt6.QtCore import QObject, pyqtSignal
 
 # Log output to console even if running in background thread
@@ -17,6 +20,60 @@ logging.basicConfig(
     force=True
 )
 
+# Data can be sent as binary frames instead of one JSON line per sample, if
+# both ends agree to it at the client_id handshake. A frame is a zero byte,
+# which never starts a UTF-8 JSON line, then the payload length and the
+# packed (timestamp, voltage) samples, decoded without a copy by np.frombuffer.
+DATA_FRAME_MARKER = b"\x00"
+FRAME_HEADER = struct.Struct("<cI")  # marker, payload length in bytes
+SAMPLE_DTYPE = np.dtype([("time", "<f8"), ("volt", "<f4")])  # unix timestamp, voltage
+RECV_SIZE = 1 << 16  # bytes read per recv call
+
+
+def pack_data_frame(times, volts) -> bytes:
+    """
+    Packs (timestamp, voltage) samples into one binary data frame.
+
+    Parameters:
+        times (ArrayLike): Unix timestamps.
+        volts (ArrayLike): Voltage of each sample.
+    """
+    samples = np.empty(len(times), dtype=SAMPLE_DTYPE)
+    samples["time"] = times
+    samples["volt"] = volts
+    return FRAME_HEADER.pack(DATA_FRAME_MARKER, samples.nbytes) + samples.tobytes()
+
+
+def split_messages(buffer: bytearray) -> list:
+    """
+    Removes every complete message from the front of a receive buffer,
+    leaving a trailing partial message for the next recv.
+
+    Returns:
+        list: Decoded text lines (str) and data frames (NDArray of SAMPLE_DTYPE), in arrival order.
+    """
+    messages = []
+    pos = 0
+    while pos < len(buffer):
+        if buffer[pos] == DATA_FRAME_MARKER[0]:
+            if len(buffer) - pos < FRAME_HEADER.size:
+                break
+            _, length = FRAME_HEADER.unpack_from(buffer, pos)
+            end = pos + FRAME_HEADER.size + length
+            if end > len(buffer):
+                break
+            messages.append(np.frombuffer(buffer[pos + FRAME_HEADER.size:end], dtype=SAMPLE_DTYPE))
+            pos = end
+        else:
+            newline = buffer.find(b"\n", pos)
+            if newline == -1:
+                break
+            messages.append(buffer[pos:newline].decode("utf-8"))
+            pos = newline + 1
+    del buffer[:pos]
+    return messages
+
+
 class SocketServer:
     """
     A bidirectional socket to connect the CS and ENGR UIs.
@@ -26,6 +83,7 @@ class SocketServer:
         self.host: str = host                                                   # use "localhost" for interal socket
         self.port: int = port                                                   # arbitrary port
         self.clients: dict[str, socket.socket] = {"CS": None, "ENGR": None}     # map of client IDs to their connection objects
+        self.frame_clients: set[str] = set()                                    # IDs of clients that receive data as binary frames
         self.running = False                                                    # whether the server is running
         self.ready_event = threading.Event()                                    # event to signal that the server is ready to receive connections
         self._server_socket: socket.socket = None                               # the socket connection
@@ -54,13 +112,14 @@ class SocketServer:
         for client_id, client_sock in list(self.clients.items()):
             if client_sock:
                 try:
-                    client_sock.sendall('SERVER SHUTDOWN'.encode('utf-8'))
+                    client_sock.sendall('SERVER SHUTDOWN\n'.encode('utf-8'))
                     logging.info(f"[SOCKET] Disconnected {client_id}")
                 except Exception as e:
                     logging.warning(f"[SOCKET] Error closing {client_id}: {e}")
 
 
         self.clients = {"CS": None, "ENGR": None}
+        self.frame_clients.clear()
 
         # Close server socket
         if self._server_socket:
@@ -95,17 +154,32 @@ class SocketServer:
     def _handle_client(self, sock: socket.socket, addr):
         """
         Processes new client connections and begins reading messages from it.
+
+        The handshake line is "client_id=<id>", optionally followed by
+        ";frames=1" if the client can send and receive binary data frames,
+        which the server accepts by replying "ack;frames=1" instead of "ack".
         """
         client_id = None
         try:
-            client_id = sock.recv(1024).decode().strip().split("=")[1]
-            sock.sendall(b"ack\n")  # client acknowledged 
+            handshake = bytearray()
+            while b"\n" not in handshake:
+                chunk = sock.recv(1024)
+                if not chunk:
+                    return
+                handshake += chunk
+            line, _, rest = bytes(handshake).partition(b"\n")
+            fields = dict(field.split("=", 1) for field in line.decode().strip().split(";"))
+            client_id = fields["client_id"]
+            frames = fields.get("frames") == "1"
+            sock.sendall(b"ack;frames=1\n" if frames else b"ack\n")  # client acknowledged 
             if self.clients.get(client_id) is not None:  # duplicate connection
                 sock.close()
                 logging.info(f"[SOCKET] Ignoring duplicate client connection request from \"{client_id}\"")
                 return
 
             self.clients[client_id] = sock
+            if frames:
+                self.frame_clients.add(client_id)
 
             # Get status of already-connected clients
             for peer_id, peer_sock in self.clients.items():
@@ -115,12 +189,13 @@ class SocketServer:
             # Notify other cilents of succesful connection
             self.broadcast_peer_status(client_id, "connected")
             logging.info(f"[SOCKET] Client \"{client_id}\" connected from {addr}")
-            self._receive_loop(sock, client_id)
+            self._receive_loop(sock, client_id, rest)
         except Exception as e:
             logging.warning(f"[SOCKET] Error in _handle_client: {e}")
         finally:
-            if client_id:
-                self.clients[client_id] = None         
+            if client_id and self.clients.get(client_id) is sock:
+                self.clients[client_id] = None
+                self.frame_clients.discard(client_id)
                 self.broadcast_peer_status(client_id, "disconnected")   
             try:
                 sock.close()
@@ -157,27 +232,36 @@ class SocketServer:
                     except:
                         pass
     
-    def _receive_loop(self, sock: socket.socket, client_id: str):
+    def _receive_loop(self, sock: socket.socket, client_id: str, buffer: bytes = b""):
         """
-        Backgroung loop to read newline-delimited JSON messages from the given client connection
-        and dispatch them to the appropriate handler.
+        Backgroung loop to read newline-delimited JSON messages and binary data frames
+        from the given client connection and dispatch them to the appropriate handler.
+        The data received by each recv is forwarded to CS as one batch.
         """
-        buffer = ""
+        buffer = bytearray(buffer)
         try:
             while True:
                 if not self.clients.get(client_id):  # already removed externally
                     break
 
-                chunk = sock.recv(1024)
+                times, volts = [], []  # data of this chunk
+                for message in split_messages(buffer):
+                    if isinstance(message, np.ndarray):  # binary data frame
+                        times.append(message["time"])
+                        volts.append(message["volt"])
+                        continue
+                    sample = self._process_message(message.strip(), client_id)
+                    if sample is not None:
+                        times.append(sample[:1])
+                        volts.append(sample[1:])
+                if times:
+                    self._forward_data(np.concatenate(times), np.concatenate(volts))
+
+                chunk = sock.recv(RECV_SIZE)
                 if not chunk:
                     logging.info(f"[SOCKET] Client \"{client_id}\" disconnected")
                     break
-
-                buffer += chunk.decode('utf-8')
-                
-                while "\n" in buffer:
-                    line, buffer = buffer.split("\n", 1)
-                    self._process_message(line.strip(), client_id)
+                buffer += chunk
         except ConnectionResetError:
             logging.info(f"[SOCKET] Client \"{client_id}\" disconnected abruptly (reset)")
         except Exception as e:
@@ -185,20 +269,24 @@ class SocketServer:
 
 
 
-    def _process_message(self, message: str, client_id: str):
+    def _process_message(self, message: str, client_id: str) -> tuple[float, float] | None:
         """
         Processes a single JSON-formatted message from a client.
-        Delegates to control or data handlers based on message type.
+        Delegates to control handlers based on message type.
+
+        Returns:
+            tuple[float, float] | None: The (unix timestamp, voltage) of a data
+                message, for the caller to forward in its batch; None otherwise.
         """
         try:
             message_dict = json.loads(message)
         except json.JSONDecodeError:
             logging.warning(f"[SOCKET] Invalid JSON from {client_id}: {message}")
-            return
+            return None
         
         message_type = message_dict["type"] 
         if message_type == "data": # time-voltage data
-            self._forward_data(message_dict)
+            return (float(message_dict["value"][0]), float(message_dict["value"][1]))
 
         elif message_type  == "control": # control value        
             if message_dict.get("source") == client_id:
@@ -218,10 +306,12 @@ class SocketServer:
 
         else:
             logging.warning(f"[{client_id}] Unknown message type: {message_dict['type']}")
+        return None
     
-    def _forward_data(self, data: dict):
+    def _forward_data(self, times: NDArray, volts: NDArray):
         """
-        Forwards a simplified (timestamp, voltage) message from ENGR to CS.
+        Forwards (timestamp, voltage) samples from ENGR to CS, as one binary
+        frame if CS accepted them and as one JSON message per sample otherwise.
         If CS is not connected, logs a warning.
         """
         cs_sock = self.clients.get("CS")
@@ -231,12 +321,18 @@ class SocketServer:
                 self._current_time = time.perf_counter()
             return
         
-        msg = {
-            "source": "ENGR",
-            "type": "data",
-            "value": (data["value"][0], data["value"][1]),  # (unix timestamp, voltage)
-        }
-        cs_sock.sendall((json.dumps(msg) + "\n").encode("utf-8"))
+        if "CS" in self.frame_clients:
+            cs_sock.sendall(pack_data_frame(times, volts))
+            return
+
+        cs_sock.sendall("".join(
+            json.dumps({
+                "source": "ENGR",
+                "type": "data",
+                "value": (timestamp, voltage),  # (unix timestamp, voltage)
+            }) + "\n"
+            for timestamp, voltage in zip(times.tolist(), volts.tolist())
+        ).encode("utf-8"))
 
 
     def _broadcast(self, message: dict, exclude: str = None):
@@ -279,12 +375,13 @@ class SocketClient(QObject):
         self.send_queue: queue = queue.Queue()  # queue to send data to other client
         self.recv_queue: queue = queue.Queue()  # queue to receive data from other client
         self.connected: bool = False            # whether the client is connected to the socket
+        self.frames: bool = False               # whether the server accepted binary data frames
         self._sock: socket.socket = None        # the socket connection
     def connect(self):
         """
         Attempts to connect to the server and begin communication.
         Starts background threads for sending and receiving data.
-        Sends the client ID immediately upon connection.
+        Sends the client ID immediately upon connection, offering binary data frames.
         Emits `connectionChanged(True)` on success or `connectionChanged(False)` on failure.
         """
         try:
@@ -292,7 +389,7 @@ class SocketClient(QObject):
             self._sock.connect((self.host, self.port))
 
             # send initial message with client ID to socket
-            self._sock.sendall(f"client_id={self.client_id}\n".encode('utf-8'))
+            self._sock.sendall(f"client_id={self.client_id};frames=1\n".encode('utf-8'))
             self.connected = True
             self.connectionChanged.emit(True)
     
@@ -353,14 +450,19 @@ class SocketClient(QObject):
     def _send_loop(self):
         """
         Internal method: runs in a background thread.
-        Continuously reads from the send queue and transmits messages to the server.
+        Continuously reads from the send queue and transmits messages to the server,
+        everything queued so far in one write.
         Terminates if the socket is closed or an error occurs.
         """
         while self.connected:
             try:
-                msg = self.send_queue.get(timeout=0.1)
-                json_str = json.dumps(msg) + "\n"
-                self._sock.sendall(json_str.encode("utf-8"))
+                messages = [self.send_queue.get(timeout=0.1)]
+                while True:
+                    try:
+                        messages.append(self.send_queue.get_nowait())
+                    except queue.Empty:
+                        break
+                self._sock.sendall(self._encode(messages))
             except queue.Empty:
                 continue
             except Exception as e:
@@ -368,21 +470,47 @@ class SocketClient(QObject):
                 self.connected = False
                 break
 
+    def _encode(self, messages: list[dict]) -> bytes:
+        """
+        Serializes queued messages as JSON lines, packing each run of data
+        messages into one binary frame if the server accepted them.
+        """
+        out = []
+        times, volts = [], []
+        for msg in messages:
+            if self.frames and msg.get("type") == "data":
+                times.append(msg["value"][0])
+                volts.append(msg["value"][1])
+                continue
+            if times:
+                out.append(pack_data_frame(times, volts))
+                times, volts = [], []
+            out.append((json.dumps(msg) + "\n").encode("utf-8"))
+        if times:
+            out.append(pack_data_frame(times, volts))
+        return b"".join(out)
+
     def _recv_loop(self):
         """
         Internal method: runs in a background thread.
         Continuously reads from the socket and places incoming messages into the receive queue.
+        Binary data frames are queued as {"type": "data_frame"} messages whose value is the
+        decoded array of SAMPLE_DTYPE samples.
         Also handles peer connection status updates and filters self-originating messages.
         Terminates if the socket is closed or an error occurs.
         """
-        buffer = ""
+        buffer = bytearray()
         while self.connected:
             try:
-                message = self._sock.recv(1024).decode('utf-8')
-                
-                buffer += message
-                while '\n' in buffer:
-                    line, buffer = buffer.split("\n", 1)
+                chunk = self._sock.recv(RECV_SIZE)
+                if not chunk:
+                    break
+
+                buffer += chunk
+                for line in split_messages(buffer):
+                    if isinstance(line, np.ndarray):  # binary data frame
+                        self.recv_queue.put_nowait({"source": "ENGR", "type": "data_frame", "value": line})
+                        continue
                     line = line.strip()
                     if not line:
                         continue
@@ -390,8 +518,9 @@ class SocketClient(QObject):
                     if "SERVER SHUTDOWN" in line:
                         self.disconnect()
                         break
-                    elif line.strip() == "ack": # server acknowledgement
-                        self.recv_queue.put_nowait(line)
+                    elif line.split(";")[0] == "ack": # server acknowledgement
+                        self.frames = "frames=1" in line.split(";")[1:]
+                        self.recv_queue.put_nowait("ack")
                         continue
 
                     
@@ -38,10 +38,13 @@ class Settings(QObject):
         "show_labels": True,
         "show_durations": True,
         "show_comments": True,
+        "show_instrumentation": False,
         "default_recording_directory": os.getcwd(),
         "backup_recording_directory": os.getcwd(),
         "default_min_voltage": -1.0,
         "default_max_voltage": 1.0,
+        "recording_cache_mb": 2048,
+        "undo_history_mb": 64,
     }
 
     SETTINGS_TYPE_MAP = { 
@@ -54,10 +57,13 @@ class Settings(QObject):
         "show_labels": bool,
         "show_durations": bool,
         "show_comments": bool,
+        "show_instrumentation": bool,
         "default_recording_directory": str,
         "backup_recording_directory": str,
         "default_min_voltage": float,
         "default_max_voltage": float,
+        "recording_cache_mb": int,
+        "undo_history_mb": int,
     }
 
     def __init__(self):
@@ -94,7 +94,8 @@ class AppearanceTab(QWidget):
             "Show Vertical Grid Lines": "show_v_grid",
             "Show Waveform Labels": "show_labels",
             "Show Waveform Durations": "show_durations",
-            "Show Comments": "show_comments"
+            "Show Comments": "show_comments",
+            "Show Performance Overlay": "show_instrumentation",
         }
         for label_text, attr in bool_settings.items():
             checkbox = QCheckBox(label_text)
@@ -530,6 +531,46 @@ class EPGSettingsTab(QWidget):
         for r in self.rows:
             layout.addWidget(r)
 
+        memory_header = QLabel("Memory")
+        memory_header.setStyleSheet("font-weight: bold;")
+        layout.addWidget(memory_header)
+
+        # recordings beyond this budget are dropped or spilled to disk, least recently used first
+        cache_label = QLabel("Recording Cache:")
+        cache_label.setSizePolicy(QSizePolicy.Policy.Fixed, QSizePolicy.Policy.Fixed)
+
+        self.cache_spinbox = QSpinBox()
+        self.cache_spinbox.setRange(256, 65536)
+        self.cache_spinbox.setSingleStep(256)
+        self.cache_spinbox.setSuffix(" MB")
+        self.cache_spinbox.setValue(settings.get("recording_cache_mb"))
+        self.cache_spinbox.valueChanged.connect(lambda value: settings.set("recording_cache_mb", value))
+
+        cache_row = QHBoxLayout()
+        cache_row.setSpacing(12)
+        cache_row.addWidget(cache_label)
+        cache_row.addWidget(self.cache_spinbox)
+        cache_row.addStretch()
+        layout.addLayout(cache_row)
+
+        # label and comment edits beyond this budget can no longer be undone, oldest first
+        undo_label = QLabel("Undo History:")
+        undo_label.setSizePolicy(QSizePolicy.Policy.Fixed, QSizePolicy.Policy.Fixed)
+
+        self.undo_spinbox = QSpinBox()
+        self.undo_spinbox.setRange(8, 4096)
+        self.undo_spinbox.setSingleStep(8)
+        self.undo_spinbox.setSuffix(" MB")
+        self.undo_spinbox.setValue(settings.get("undo_history_mb"))
+        self.undo_spinbox.valueChanged.connect(lambda value: settings.set("undo_history_mb", value))
+
+        undo_row = QHBoxLayout()
+        undo_row.setSpacing(12)
+        undo_row.addWidget(undo_label)
+        undo_row.addWidget(self.undo_spinbox)
+        undo_row.addStretch()
+        layout.addLayout(undo_row)
+
         layout.addStretch()
 
     def sync_ui_from_settings(self):
@@ -537,6 +578,14 @@ class EPGSettingsTab(QWidget):
             new_path = settings.get(row.setting_attr)
             row.path_edit.setText(new_path)
 
+        self.cache_spinbox.blockSignals(True)
+        self.cache_spinbox.setValue(settings.get("recording_cache_mb"))
+        self.cache_spinbox.blockSignals(False)
+
+        self.undo_spinbox.blockSignals(True)
+        self.undo_spinbox.setValue(settings.get("undo_history_mb"))
+        self.undo_spinbox.blockSignals(False)
+
 class SidebarButton(QToolButton):
     def __init__(self, text: str, index: int, icon_path: str = None, parent=None):
         super().__init__(parent)
@@ -0,0 +1,39 @@
+import os
+import sys
+
+import numpy as np
+import pandas as pd
+import pytest
+
+# modules import each other relative to the gui directory, as when running main.py
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+@pytest.fixture
+def recording(tmp_path):
+    """
+    An EPGData with a labelled and commented 20 s, 100 Hz recording loaded from Parquet.
+    Returns (epgdata, filename).
+    """
+    pytest.importorskip("PyQt6")  # EPGData reads its cache budget from the Qt settings
+    from EPGData import EPGData
+
+    n = 2000
+    labels = np.full(n, None, dtype=object)
+    labels[100:800] = "N"
+    labels[800:1500] = "P"
+    labels[1600:] = "C"
+    comments = np.full(n, None, dtype=object)
+    comments[250] = "probe in"
+    comments[1700] = "end"
+    file = str(tmp_path / "recording.parquet")
+    pd.DataFrame({
+        "time": np.arange(n) / 100,
+        "voltage": np.sin(np.arange(n) / 50),
+        "labels": labels,
+        "comments": comments,
+    }).to_parquet(file, engine="pyarrow", index=False)
+
+    epgdata = EPGData()
+    assert epgdata.load_data(file)
+    return epgdata, file
@@ -0,0 +1,43 @@
+import numpy as np
+import pandas as pd
+
+
+def test_comments_are_kept_out_of_the_dataframe(recording):
+    epgdata, file = recording
+    assert "comments" not in epgdata.dfs[file]
+    assert epgdata.comments[file] == {250: "probe in", 1700: "end"}
+
+
+def test_set_comment(recording):
+    epgdata, file = recording
+    epgdata.set_comment(file, 1000, "new")
+    epgdata.set_comment(file, 250, "moved")
+    epgdata.set_comment(file, 1700, None)
+    epgdata.set_comment(file, 5, None)  # removing a missing comment is a no-op
+
+    assert epgdata.get_comment(file, 250) == "moved"
+    assert epgdata.get_comment(file, 1700) is None
+    rows, texts = epgdata.comment_rows(file)
+    np.testing.assert_array_equal(rows, [250, 1000])
+    assert texts == ["moved", "new"]
+
+
+def test_comment_column(recording):
+    epgdata, file = recording
+    column = epgdata.comment_column(file)
+    assert len(column) == len(epgdata.dfs[file])
+    assert column[250] == "probe in" and column[1700] == "end"
+    assert pd.isna(np.delete(column, [250, 1700])).all()
+
+
+def test_exports_write_comments_back(recording, tmp_path):
+    epgdata, file = recording
+    epgdata.set_comment(file, 1000, "new")
+
+    for name in ("out.parquet", "out.csv"):
+        destination = str(tmp_path / name)
+        export = epgdata.export_parquet if name.endswith(".parquet") else epgdata.export_csv
+        assert export(file, destination)
+        df, comments = epgdata.read_recording(destination)
+        assert "comments" not in df
+        assert comments == {250: "probe in", 1000: "new", 1700: "end"}
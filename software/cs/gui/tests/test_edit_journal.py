@@ -0,0 +1,83 @@
+import numpy as np
+
+from EditJournal import CommentEdit, EditJournal, LabelEdit
+from LabelIntervals import LabelIntervals
+
+
+def test_undo_all_restores_original_labels(recording):
+    epgdata, file = recording
+    rng = np.random.default_rng(0)
+    history = [epgdata.get_label_intervals(file).copy()]
+
+    for _ in range(30):
+        intervals = epgdata.get_label_intervals(file)
+        labels = intervals.labels()
+        i = int(rng.integers(len(labels)))
+        labels[i] = rng.choice(["N", "P", "C", "G"])
+        ends = intervals.ends.copy()
+        if i + 1 < len(ends):
+            ends[i] = rng.uniform(intervals.starts[i], intervals.starts[i + 1])
+        epgdata.set_label_intervals(file, intervals.starts, ends, labels)
+        if epgdata.get_label_intervals(file) != history[-1]:
+            history.append(epgdata.get_label_intervals(file).copy())
+
+    assert len(history) > 10
+    for expected in reversed(history[:-1]):
+        assert isinstance(epgdata.undo(file), LabelEdit)
+        assert epgdata.get_label_intervals(file) == expected
+    assert epgdata.undo(file) is None
+
+    for expected in history[1:]:
+        assert isinstance(epgdata.redo(file), LabelEdit)
+        assert epgdata.get_label_intervals(file) == expected
+    assert epgdata.redo(file) is None
+
+
+def test_new_edit_clears_redo(recording):
+    epgdata, file = recording
+    intervals = epgdata.get_label_intervals(file)
+    labels = intervals.labels()
+    labels[0] = "G"
+    epgdata.set_label_intervals(file, intervals.starts, intervals.ends, labels)
+    epgdata.undo(file)
+    assert epgdata.journal.can_redo(file)
+
+    labels[0] = "C"
+    epgdata.set_label_intervals(file, intervals.starts, intervals.ends, labels)
+    assert not epgdata.journal.can_redo(file)
+
+
+def test_label_edit_only_keeps_changed_segments():
+    before = LabelIntervals(np.arange(100.0), np.arange(1.0, 101.0), ["N"] * 100)
+    labels = before.labels()
+    labels[50] = "P"
+    after = LabelIntervals(before.starts, before.ends, labels)
+
+    edit = LabelEdit.between(before, after)
+    assert edit.index == 50 and len(edit.before) == 1 and len(edit.after) == 1
+    assert edit.undo(after) == before
+    assert edit.redo(before) == after
+
+
+def test_budget_drops_oldest_commands_first():
+    command = CommentEdit({1.0: None}, {1.0: "text"})
+    journal = EditJournal(budget_bytes=3 * command.nbytes)
+    for file in ["a", "b", "a", "b"]:
+        journal.record(file, CommentEdit({1.0: None}, {1.0: "text"}))
+
+    assert journal._bytes <= journal.budget_bytes
+    assert len(journal._undo["a"]) == 1 and len(journal._undo["b"]) == 2
+
+    journal.forget("b")
+    assert not journal.can_undo("b")
+    assert journal._bytes == command.nbytes
+
+
+def test_lowering_the_budget_evicts(recording):
+    epgdata, file = recording
+    for i in range(4):
+        epgdata.journal.record(file, CommentEdit({float(i): None}, {float(i): "text"}))
+    assert len(epgdata.journal._undo[file]) == 4
+
+    epgdata.on_setting_changed("undo_history_mb", 0)  # as when the setting is changed
+    assert epgdata.journal.budget_bytes == 0 and not epgdata.journal.can_undo(file)
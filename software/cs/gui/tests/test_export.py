@@ -0,0 +1,20 @@
+import pandas as pd
+import pytest
+
+
+@pytest.mark.parametrize("name", ["out.csv", "out.parquet"])
+def test_export_to_a_missing_folder_fails(recording, tmp_path, name):
+    epgdata, file = recording
+    export = epgdata.export_parquet if name.endswith(".parquet") else epgdata.export_csv
+    assert not export(file, str(tmp_path / "missing" / name))
+
+
+def test_export_csv_writes_row_numbers(recording, tmp_path):
+    epgdata, file = recording
+    destination = str(tmp_path / "out.csv")
+    assert epgdata.export_csv(file, destination)
+
+    written = pd.read_csv(destination, index_col=0)
+    assert list(written.columns) == ["time", "voltage", "labels", "comments"]
+    assert written.index.tolist() == list(range(len(epgdata.dfs[file])))
+    assert written["comments"].dropna().to_dict() == {250: "probe in", 1700: "end"}
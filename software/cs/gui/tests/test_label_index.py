@@ -0,0 +1,66 @@
+import random
+
+import numpy as np
+import pytest
+
+from label_view.LabelIndex import LabelIndex
+
+
+class FakeDataWindow:
+    def __init__(self, labels):
+        self.labels = labels
+
+
+class FakeLabelArea:
+    def __init__(self, start_time, duration, has_right_transition_line=False):
+        self.start_time = start_time
+        self.duration = duration
+        self.has_right_transition_line = has_right_transition_line
+
+
+def assert_matches_rebuild(index: LabelIndex, dw: FakeDataWindow) -> None:
+    rebuilt = LabelIndex(dw)
+    rebuilt.sync()
+    for name in ("starts", "ends", "has_right", "boundaries", "boundary_owner", "boundary_right", "boundary_of"):
+        np.testing.assert_array_equal(getattr(index, name), getattr(rebuilt, name), err_msg=name)
+    for i, label_area in enumerate(dw.labels):
+        assert index.position(label_area) == i
+
+
+def test_in_place_edits_match_rebuild():
+    rng = random.Random(0)
+    for _ in range(100):
+        dw = FakeDataWindow([
+            FakeLabelArea(i * 10.0, 10.0, has_right_transition_line=rng.random() < 0.3)
+            for i in range(rng.randint(1, 30))
+        ])
+        index = LabelIndex(dw)
+        index.sync()
+        for _ in range(20):
+            if not dw.labels:
+                break
+            label_area = rng.choice(dw.labels)
+            op = rng.random()
+            if op < 0.4:
+                index.remove(label_area)
+                dw.labels.remove(label_area)
+            elif op < 0.8:
+                label_area.has_right_transition_line = not label_area.has_right_transition_line
+                index.set_right(label_area, label_area.has_right_transition_line)
+            else:
+                label_area.duration /= 2
+                index.update(label_area)
+            assert not index.dirty
+            assert_matches_rebuild(index, dw)
+
+
+def test_removed_label_has_no_position():
+    dw = FakeDataWindow([FakeLabelArea(0.0, 1.0), FakeLabelArea(1.0, 1.0)])
+    index = LabelIndex(dw)
+    index.sync()
+    removed = dw.labels[0]
+    index.remove(removed)
+    del dw.labels[0]
+    with pytest.raises(ValueError):
+        index.position(removed)
+    assert index.position(dw.labels[0]) == 0
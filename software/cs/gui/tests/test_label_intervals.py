@@ -0,0 +1,79 @@
+import numpy as np
+import pandas as pd
+
+from LabelIntervals import LabelIntervals
+
+LABELS = np.array(["N", "P", "C", "G"], dtype=object)
+
+
+def random_intervals(rng, duration: float) -> LabelIntervals:
+    """
+    Non-overlapping segments with random labels and random gaps between them.
+    """
+    bounds = np.sort(rng.uniform(0, duration, 2 * rng.integers(1, 12)))
+    starts, ends = bounds[0::2], bounds[1::2]
+    if rng.random() < 0.5:  # no gap after most segments
+        ends[:-1] = starts[1:]
+    return LabelIntervals(starts, ends, rng.choice(LABELS, len(starts)))
+
+
+def dense(intervals: LabelIntervals, times) -> np.ndarray:
+    """
+    The label string of every sample, None where unlabeled.
+    """
+    labels = np.asarray(intervals.to_categorical(times), dtype=object)
+    return np.where(pd.isna(labels), None, labels)
+
+
+def test_from_codes_round_trips():
+    times = np.arange(100) / 10
+    labels = pd.Categorical(["N"] * 20 + [None] * 10 + ["P"] * 30 + ["N"] * 40)
+    intervals = LabelIntervals.from_codes(times, labels.codes, labels.categories)
+
+    assert len(intervals) == 3
+    np.testing.assert_array_equal(intervals.starts, [0.0, 3.0, 6.0])
+    np.testing.assert_array_equal(intervals.ends, [2.0, 6.0, 9.9])
+    expected = np.asarray(labels, dtype=object)
+    np.testing.assert_array_equal(dense(intervals, times), np.where(pd.isna(expected), None, expected))
+
+
+def test_transitions_mark_gaps():
+    intervals = LabelIntervals([1.0, 5.0], [3.0, 9.0], ["N", "P"])
+    transitions = intervals.transitions(0.0, 9.0)
+    assert [tuple(row) for row in transitions] == [(0.0, None), (1.0, "N"), (3.0, None), (5.0, "P")]
+
+
+def test_changed_span_covers_every_changed_sample():
+    rng = np.random.default_rng(0)
+    times = np.arange(2000) / 100
+    for _ in range(200):
+        before = random_intervals(rng, times[-1])
+        after = before.copy()
+        # move one boundary and relabel one segment
+        i = int(rng.integers(len(after)))
+        after.ends[i] = min(after.ends[i] + rng.uniform(-0.5, 0.5), times[-1])
+        after.ends[i] = max(after.ends[i], after.starts[i])
+        if i + 1 < len(after):
+            after.ends[i] = min(after.ends[i], after.starts[i + 1])
+        after = after.splice(i, 1, LabelIntervals([after.starts[i]], [after.ends[i]], [rng.choice(LABELS)]))
+
+        changed = np.flatnonzero(dense(before, times) != dense(after, times))
+        span = before.changed_span(after)
+        if len(changed) == 0:
+            continue
+        assert span is not None
+        assert span[0] <= times[changed[0]] and times[changed[-1]] <= span[1]
+
+
+def test_changed_slice_of_identical_intervals():
+    intervals = LabelIntervals([0.0, 1.0, 2.0], [1.0, 2.0, 3.0], ["N", "P", "N"])
+    prefix, suffix = intervals.changed_slice(intervals.copy())
+    assert prefix + suffix == 3
+    assert intervals.changed_span(intervals.copy()) is None
+
+
+def test_splice_replaces_segments():
+    intervals = LabelIntervals([0.0, 1.0, 2.0], [1.0, 2.0, 3.0], ["N", "P", "N"])
+    spliced = intervals.splice(1, 1, LabelIntervals([1.0, 1.5], [1.5, 2.0], ["C", "G"]))
+    np.testing.assert_array_equal(spliced.starts, [0.0, 1.0, 1.5, 2.0])
+    np.testing.assert_array_equal(spliced.labels(), ["N", "C", "G", "N"])
@@ -0,0 +1,52 @@
+import numpy as np
+import pandas as pd
+
+LABELS = np.array(["N", "P", "C", "G"], dtype=object)
+
+
+def dense_labels(epgdata, file) -> np.ndarray:
+    labels = np.asarray(epgdata.dfs[file]["labels"], dtype=object)
+    return np.where(pd.isna(labels), None, labels)
+
+
+def full_rebuild(epgdata, file) -> np.ndarray:
+    times = epgdata.dfs[file]["time"].values
+    labels = np.asarray(epgdata.get_label_intervals(file).to_categorical(times), dtype=object)
+    return np.where(pd.isna(labels), None, labels)
+
+
+def test_partial_materialize_matches_full_rebuild(recording):
+    epgdata, file = recording
+    rng = np.random.default_rng(0)
+
+    for _ in range(50):
+        intervals = epgdata.get_label_intervals(file)
+        starts, ends, labels = intervals.starts.copy(), intervals.ends.copy(), intervals.labels()
+        i = int(rng.integers(len(starts)))
+        op = rng.random()
+        if op < 0.4:  # move a boundary, staying clear of the neighbours
+            starts[i] = rng.uniform(ends[i - 1] if i > 0 else 0.0, ends[i])
+        elif op < 0.7:  # relabel
+            labels[i] = rng.choice(LABELS)
+        elif len(starts) > 1:  # delete
+            starts, ends, labels = np.delete(starts, i), np.delete(ends, i), np.delete(labels, i)
+        epgdata.set_label_intervals(file, starts, ends, labels)
+
+        if rng.random() < 0.5:  # several edits may pile up before the column is read
+            epgdata.materialize_labels(file)
+            np.testing.assert_array_equal(dense_labels(epgdata, file), full_rebuild(epgdata, file))
+
+    epgdata.materialize_labels(file)
+    np.testing.assert_array_equal(dense_labels(epgdata, file), full_rebuild(epgdata, file))
+
+
+def test_new_label_rebuilds_column(recording):
+    epgdata, file = recording
+    intervals = epgdata.get_label_intervals(file)
+    labels = intervals.labels()
+    labels[0] = "new"
+    epgdata.set_label_intervals(file, intervals.starts, intervals.ends, labels)
+    epgdata.materialize_labels(file)
+
+    assert "new" in epgdata.dfs[file]["labels"].cat.categories
+    np.testing.assert_array_equal(dense_labels(epgdata, file), full_rebuild(epgdata, file))
@@ -0,0 +1,87 @@
+import numpy as np
+import pytest
+
+from utils.MinMaxPyramid import MinMaxPyramid, downsample
+
+
+@pytest.fixture
+def waveform():
+    rng = np.random.default_rng(0)
+    n = 100_003
+    return np.arange(n) / 100, rng.normal(size=n)
+
+
+def test_levels_hold_block_min_max(waveform):
+    _, y = waveform
+    pyramid = MinMaxPyramid(y, min_level=2)
+    for level, (mins, maxs) in pyramid.levels.items():
+        num_bins = len(y) >> level
+        blocks = y[:num_bins << level].reshape(num_bins, 1 << level)
+        np.testing.assert_array_equal(mins, blocks.min(axis=1))
+        np.testing.assert_array_equal(maxs, blocks.max(axis=1))
+    assert len(pyramid.levels[max(pyramid.levels)][0]) == 1
+
+
+def test_default_levels_are_small_next_to_the_waveform(waveform):
+    _, y = waveform
+    assert MinMaxPyramid(y).nbytes() <= y.nbytes / 16
+    assert MinMaxPyramid(y[:10]).levels == {}
+
+
+def test_level_for(waveform):
+    _, y = waveform
+    pyramid = MinMaxPyramid(y)
+    assert pyramid.level_for(1) is None
+    assert pyramid.level_for(32) is None  # finer than min_level: raw samples
+    assert pyramid.level_for(40) == 6
+    assert pyramid.level_for(64) == 6
+    assert pyramid.level_for(65) == 7
+    assert pyramid.level_for(10 ** 9) == max(pyramid.levels)
+
+
+@pytest.mark.parametrize("start, stop", [(0, 100_003), (1000, 5000), (1001, 4999), (99_000, 100_003)])
+def test_peaks_cover_the_range(waveform, start, stop):
+    x, y = waveform
+    pyramid = MinMaxPyramid(y)
+    x_out, y_out = pyramid.peaks(x, start, stop, 7)
+
+    first, last = start >> 7, min(len(y) >> 7, -(-stop >> 7))
+    assert len(y_out) == 2 * (last - first)
+    maxs, mins = y_out[0::2], y_out[1::2]
+    for i, block in enumerate(range(first, last)):
+        samples = y[block << 7:(block + 1) << 7]
+        assert maxs[i] == samples.max() and mins[i] == samples.min()
+        assert x_out[2 * i] == x_out[2 * i + 1] == x[(block << 7) + 64]
+
+
+def test_downsample_with_pyramid_keeps_the_envelope(waveform):
+    x, y = waveform
+    x_range = (100.0, 900.0)
+    raw = downsample(x, y, x_range, max_points=1000)
+    fast = downsample(x, y, x_range, max_points=1000, pyramid=MinMaxPyramid(y))
+
+    visible = y[np.searchsorted(x, 100.0):np.searchsorted(x, 900.0, side="right")]
+    for x_out, y_out in (raw, fast):
+        assert len(y_out) <= 2000
+        assert y_out.max() == visible.max() and y_out.min() == visible.min()
+        assert x_out[0] >= 99.0 and x_out[-1] <= 901.0
+
+
+def test_downsample_small_ranges_are_not_decimated(waveform):
+    x, y = waveform
+    x_out, y_out = downsample(x, y, (10.0, 11.0), pyramid=MinMaxPyramid(y))
+    np.testing.assert_array_equal(x_out, x[999:1102])  # one extra sample on each side
+    np.testing.assert_array_equal(y_out, y[999:1102])
+
+
+@pytest.mark.parametrize("method", ["subsampling", "mean", "peak"])
+def test_downsample_methods_respect_max_points(waveform, method):
+    x, y = waveform
+    x_out, y_out = downsample(x, y, max_points=4000, method=method)
+    assert len(x_out) == len(y_out) <= 4000 + 2 * 4000 // 50
+
+
+def test_downsample_rejects_unknown_method(waveform):
+    x, y = waveform
+    with pytest.raises(ValueError):
+        downsample(x, y, method="median")
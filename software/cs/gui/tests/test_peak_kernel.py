@@ -0,0 +1,70 @@
+import numpy as np
+import pytest
+
+from utils import PeakKernel
+from utils.PeakKernel import peaks
+
+
+def reference(x, y, stride):
+    num_windows = len(y) // stride
+    blocks = y[:num_windows * stride].reshape(num_windows, stride)
+    x_win = x[stride // 2::stride][:num_windows]
+    return np.repeat(x_win, 2), np.column_stack((blocks.max(axis=1), blocks.min(axis=1))).ravel()
+
+
+def run(kernel, x, y, stride):
+    num_windows = len(y) // stride
+    x_out, y_out = np.empty(2 * num_windows), np.empty(2 * num_windows)
+    kernel(x, y, stride, num_windows, x_out, y_out)
+    return x_out, y_out
+
+
+@pytest.fixture
+def waveform():
+    rng = np.random.default_rng(0)
+    x = np.arange(1003) / 100
+    return x, rng.normal(size=len(x))
+
+
+@pytest.mark.parametrize("kernel", [PeakKernel._peaks_loop, PeakKernel._peaks_numpy])
+@pytest.mark.parametrize("stride", [1, 2, 7, 1003, 2000])
+def test_kernels_match_reference(kernel, waveform, stride):
+    x, y = waveform
+    x_out, y_out = run(kernel, x, y, stride)
+    x_ref, y_ref = reference(x, y, stride)
+    np.testing.assert_array_equal(x_out, x_ref)
+    np.testing.assert_array_equal(y_out, y_ref)
+
+
+@pytest.mark.parametrize("kernel", [PeakKernel._peaks_loop, PeakKernel._peaks_numpy])
+def test_nan_propagates_per_window(kernel, waveform):
+    x, y = waveform
+    y = y.copy()
+    y[0] = np.nan  # first sample of window 0
+    y[13] = np.nan  # middle of window 1
+    y[29] = np.nan  # last sample of window 2
+
+    _, y_out = run(kernel, x, y, 10)
+    assert np.isnan(y_out[:6]).all()
+    assert not np.isnan(y_out[6:]).any()
+    np.testing.assert_array_equal(y_out, reference(x, y, 10)[1])
+
+
+def test_peaks_reuses_buffers(waveform):
+    x, y = waveform
+    x_buf, y_buf = np.empty(1000), np.empty(1000)
+    x_out, y_out = peaks(x, y, 10, x_buf, y_buf)
+    assert len(x_out) == len(y_out) == 200
+    assert np.shares_memory(x_out, x_buf) and np.shares_memory(y_out, y_buf)
+
+    x_out, y_out = peaks(x, y, 2, x_buf, y_buf)  # too small: allocated instead
+    assert len(y_out) == 1002 and not np.shares_memory(y_out, y_buf)
+
+
+def test_peaks_of_strided_input(waveform):
+    # non-contiguous slices always take the NumPy path
+    x, y = waveform
+    x_out, y_out = peaks(x[::2], y[::2], 5)
+    x_ref, y_ref = reference(x[::2], y[::2], 5)
+    np.testing.assert_array_equal(x_out, x_ref)
+    np.testing.assert_array_equal(y_out, y_ref)
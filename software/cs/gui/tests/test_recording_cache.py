@@ -0,0 +1,59 @@
+import numpy as np
+import pandas as pd
+
+from RecordingCache import RecordingCache
+
+
+def recording(value: float, n: int = 1000) -> pd.DataFrame:
+    return pd.DataFrame({"time": np.arange(n) / 100, "pre_rect": np.full(n, value)})
+
+
+def test_evicts_least_recently_used_and_reloads():
+    size = RecordingCache.nbytes(recording(0))
+    reads = []
+    cache = RecordingCache(budget_bytes=2 * size)
+    for i, key in enumerate(["a", "b", "c"]):
+        cache.add(key, recording(i), reload=lambda i=i, key=key: reads.append(key) or recording(i))
+
+    assert cache.resident_bytes() <= 2 * size
+    assert "a" in cache and len(cache) == 3
+    assert cache["a"]["pre_rect"].iloc[0] == 0
+    assert reads == ["a"]
+
+
+def test_pinned_recording_is_kept():
+    size = RecordingCache.nbytes(recording(0))
+    cache = RecordingCache(budget_bytes=size, pinned=lambda key: key == "a")
+    for i, key in enumerate(["a", "b", "c"]):
+        cache.add(key, recording(i), reload=lambda i=i: recording(i))
+    assert "a" in cache._resident
+
+
+def test_modified_recording_is_spilled_and_restored():
+    size = RecordingCache.nbytes(recording(0))
+    cache = RecordingCache(budget_bytes=size)
+    cache.add("a", recording(1), reload=lambda: recording(0))
+    cache["a"].loc[0, "pre_rect"] = 5.0
+    cache.mark_modified("a")
+    cache.add("b", recording(2), reload=lambda: recording(2))
+
+    assert "a" in cache._spilled
+    df = cache["a"]
+    assert df["pre_rect"].iloc[0] == 5.0 and df["pre_rect"].iloc[1] == 1.0
+
+
+def test_spills_with_same_basename_are_kept_apart():
+    size = RecordingCache.nbytes(recording(0))
+    cache = RecordingCache(budget_bytes=size)
+    keys = ["dir1/x.wdq", "dir2/x.wdq", "dir3/x.wdq"]
+
+    # each modified recording is spilled when the next one is added
+    cache.add("first", recording(-1))
+    cache.add(keys[0], recording(0))
+    cache["first"]  # reads "first" back, so a spill file is freed
+    cache.add(keys[1], recording(1))
+    cache.add(keys[2], recording(2))
+    cache.add("last", recording(3))
+
+    for i, key in enumerate(keys):
+        assert cache[key]["pre_rect"].iloc[0] == i
@@ -0,0 +1,32 @@
+from types import SimpleNamespace
+
+import numpy as np
+import pytest
+
+
+@pytest.fixture
+def render_buffers():
+    pytest.importorskip("PyQt6")
+    from live_view.LiveDataWindow import LiveDataWindow
+
+    window = SimpleNamespace(render_side=0, render_buffers_xy=[np.empty((2, 100)), np.empty((2, 100))])
+    return lambda num_points: LiveDataWindow.render_buffers(window, num_points)
+
+
+def test_consecutive_frames_use_different_buffers(render_buffers):
+    x1, y1 = render_buffers(80)
+    x2, y2 = render_buffers(80)
+    assert len(x1) == len(y1) == 80
+    assert not np.shares_memory(x1, x2) and not np.shares_memory(y1, y2)
+    assert not np.shares_memory(x1, y1)
+
+    x3, _ = render_buffers(80)
+    assert np.shares_memory(x3, x1)  # the frame before last is reused
+
+
+def test_buffers_grow(render_buffers):
+    x1, _ = render_buffers(50)
+    x2, _ = render_buffers(500)
+    assert len(x2) == 500 and not np.shares_memory(x1, x2)
+    x3, _ = render_buffers(50)
+    assert np.shares_memory(x3, x1)
@@ -0,0 +1,118 @@
+import threading
+
+import numpy as np
+
+from live_view.SampleRingBuffer import SampleRingBuffer
+
+
+def drained(ring: SampleRingBuffer) -> tuple[list, list]:
+    times, volts = [], []
+    ring.drain(lambda t, v: (times.extend(t.tolist()), volts.extend(v.tolist())))
+    return times, volts
+
+
+def test_capacity_rounds_up_to_power_of_two():
+    assert SampleRingBuffer(5).capacity == 8
+    assert SampleRingBuffer(8).capacity == 8
+
+
+def test_drain_across_wrap_around():
+    ring = SampleRingBuffer(8)
+    for i in range(6):
+        ring.push(i, -i)
+    assert drained(ring) == ([0, 1, 2, 3, 4, 5], [0, -1, -2, -3, -4, -5])
+
+    calls = []
+    for i in range(6, 12):  # slots 6, 7, then 0..3
+        ring.push(i, -i)
+    ring.drain(lambda t, v: calls.append(t.tolist()))
+    assert calls == [[6, 7], [8, 9, 10, 11]]
+    assert len(ring) == 0
+
+
+def test_overflow_drops_and_counts_new_samples():
+    ring = SampleRingBuffer(4)
+    assert all(ring.push(i, i) for i in range(4))
+    assert not ring.push(4, 4)
+    assert ring.push_many(np.arange(5.0, 8.0), np.arange(5.0, 8.0)) == 0
+    assert ring.dropped == 4
+    assert drained(ring)[0] == [0, 1, 2, 3]
+
+
+def test_push_many_wraps_and_partially_fits():
+    ring = SampleRingBuffer(8)
+    ring.push_many(np.arange(6.0), np.arange(6.0))
+    drained(ring)
+    assert ring.push_many(np.arange(10.0), -np.arange(10.0)) == 8
+    assert ring.dropped == 2
+    assert drained(ring) == (list(range(8)), [-i for i in range(8)])
+
+
+def test_discard_drops_unread_samples():
+    ring = SampleRingBuffer(8)
+    ring.push(1, 1)
+    ring.discard()
+    assert len(ring) == 0 and drained(ring) == ([], [])
+
+
+def test_concurrent_producer_loses_nothing():
+    ring = SampleRingBuffer(1 << 10)
+    n = 50_000
+    received = []
+
+    def produce():
+        i = 0
+        while i < n:
+            if ring.push(i, i):
+                i += 1
+            else:
+                ring.dropped -= 1  # full: retry the same sample
+
+    producer = threading.Thread(target=produce)
+    producer.start()
+    while producer.is_alive() or len(ring):
+        ring.drain(lambda t, v: received.extend(t.tolist()))
+    producer.join()
+    assert received == list(range(n))
+
+
+def test_second_producer_thread_is_rejected():
+    ring = SampleRingBuffer(16)
+    ring.push(0.0, 0.0)
+    errors = []
+
+    def produce():
+        try:
+            ring.push_many(np.ones(2), np.ones(2))
+        except AssertionError as e:
+            errors.append(e)
+
+    producer = threading.Thread(target=produce)
+    producer.start()
+    producer.join()
+    assert len(errors) == 1 and len(ring) == 1
+
+
+def test_concurrent_producers_with_a_ring_each():
+    # as LiveDataWindow does for the socket thread and the BLE lines
+    rings = (SampleRingBuffer(1 << 8), SampleRingBuffer(1 << 8))
+    n = 20_000
+    received = ([], [])
+
+    def produce(ring, offset):
+        i = 0
+        while i < n:
+            if ring.push(offset + i, i):
+                i += 1
+            else:
+                ring.dropped -= 1  # full: retry the same sample
+
+    producers = [threading.Thread(target=produce, args=(ring, k * n)) for k, ring in enumerate(rings)]
+    for producer in producers:
+        producer.start()
+    while any(p.is_alive() for p in producers) or any(len(ring) for ring in rings):
+        for ring, out in zip(rings, received):
+            ring.drain(lambda t, v: out.extend(t.tolist()))
+    for producer in producers:
+        producer.join()
+    assert received == (list(range(n)), list(range(n, 2 * n)))
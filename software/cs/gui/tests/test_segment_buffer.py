@@ -0,0 +1,55 @@
+import numpy as np
+import pytest
+
+from live_view.SegmentBuffer import SegmentBuffer
+
+
+def filled(n: int, segment_size: int = 8) -> tuple[SegmentBuffer, np.ndarray]:
+    store = SegmentBuffer(num_columns=2, segment_size=segment_size)
+    rows = np.column_stack((np.arange(n) / 10, np.arange(n) * 2.0))
+    rng = np.random.default_rng(0)
+    pos = 0
+    while pos < n:  # appends of random size, some crossing segment boundaries
+        step = int(rng.integers(1, 20))
+        store.append(rows[pos:pos + step])
+        pos += step
+    return store, rows
+
+
+def test_columns_match_reference_across_segments():
+    store, rows = filled(100)
+    assert len(store) == 100 and len(store.segments) == 13
+    for start, stop in [(0, 100), (3, 5), (6, 10), (7, 25), (8, 16), (95, 100), (50, 50), (90, 200)]:
+        times, volts = store.columns(start, stop)
+        np.testing.assert_array_equal(times, rows[start:stop, 0])
+        np.testing.assert_array_equal(volts, rows[start:stop, 1])
+
+
+def test_columns_within_one_segment_are_views():
+    store, _ = filled(100)
+    times, _ = store.columns(8, 16)
+    assert np.shares_memory(times, store.segments[1])
+
+
+def test_searchsorted_matches_numpy():
+    store, rows = filled(100)
+    for value in [-1.0, 0.0, 0.75, 0.8, 3.2, 9.9, 20.0]:
+        for side in ("left", "right"):
+            assert store.searchsorted(value, side) == np.searchsorted(rows[:, 0], value, side)
+
+
+def test_append_columns_and_last():
+    store = SegmentBuffer(num_columns=2, segment_size=4)
+    store.append_columns(np.arange(10.0), -np.arange(10.0))
+    np.testing.assert_array_equal(store.last(), [9.0, -9.0])
+    np.testing.assert_array_equal(store.columns(2, 7)[1], -np.arange(2.0, 7.0))
+
+
+def test_clear_keeps_old_reads_valid():
+    store, rows = filled(20)
+    segments = store.segments
+    store.clear()
+    assert len(store) == 0 and store.searchsorted(1.0) == 0
+    np.testing.assert_array_equal(segments[0][0], rows[:8, 0])
+    with pytest.raises(IndexError):
+        store.last()
@@ -0,0 +1,149 @@
+import numpy as np
+import pytest
+
+import windaq
+from wdq_writer import write_wdq
+
+SCALING = [0.5, 2.0, -1.0]
+INTERCEPT = [0.0, 1.0, 10.0]
+
+
+@pytest.fixture
+def counts():
+    rng = np.random.default_rng(0)
+    return rng.integers(-8000, 8000, size=(1000, 3)).astype(np.int16)
+
+
+@pytest.fixture
+def wdq_path(tmp_path, counts):
+    path = tmp_path / "recording.WDQ"
+    write_wdq(path, counts, SCALING, INTERCEPT, time_step=0.01, annotations=["pre", "post", "aux"])
+    return str(path)
+
+
+def expected(counts, channel: int) -> np.ndarray:
+    # 14-bit data: the two low bits are flags, dropped by an arithmetic shift
+    return np.floor(counts[:, channel - 1] * 0.25) * SCALING[channel - 1] + INTERCEPT[channel - 1]
+
+
+@pytest.mark.parametrize("use_mmap", [True, False])
+def test_header_and_data(wdq_path, counts, use_mmap):
+    with windaq.windaq(wdq_path, use_mmap=use_mmap) as daq:
+        assert daq.nChannels == 3 and daq.nSample == 1000
+        np.testing.assert_allclose(daq.time(), np.arange(1000) * 0.01)
+        assert daq.chAnnotation(2) == "post"
+        for channel in (1, 2, 3):
+            np.testing.assert_array_equal(daq.raw(channel), counts[:, channel - 1])
+            np.testing.assert_allclose(daq.data(channel), expected(counts, channel))
+            np.testing.assert_allclose(daq.data(channel, 10, 20), expected(counts, channel)[10:20])
+
+
+def test_close_releases_mapping(wdq_path):
+    daq = windaq.windaq(wdq_path)
+    daq.close()
+    assert daq.npdata is None and daq._fcontents.closed
+
+
+def test_data_many_matches_data(wdq_path, counts):
+    with windaq.windaq(wdq_path) as daq:
+        block = daq.data_many([3, 1])
+        assert block.shape == (1000, 2) and block.dtype == np.float32 and block.flags.c_contiguous
+        np.testing.assert_allclose(block[:, 0], expected(counts, 3), rtol=1e-6)
+        np.testing.assert_allclose(block[:, 1], expected(counts, 1), rtol=1e-6)
+        np.testing.assert_allclose(daq.to_array()[:, 1], expected(counts, 2), rtol=1e-6)
+
+
+def test_iter_chunks_covers_all_samples(wdq_path, counts):
+    with windaq.windaq(wdq_path) as daq:
+        chunks = list(daq.iter_chunks(2, chunk_samples=300))
+        assert [len(chunk) for chunk in chunks] == [300, 300, 300, 100]
+        np.testing.assert_allclose(np.concatenate(chunks), expected(counts, 2), rtol=1e-6)
+
+        blocks = list(daq.iter_chunks([1, 3], chunk_samples=400))
+        assert blocks[0].shape == (400, 2)
+        np.testing.assert_array_equal(np.concatenate(blocks), daq.data_many([1, 3]))
+
+
+def test_hires_data_is_not_shifted(tmp_path, counts):
+    path = tmp_path / "hires.WDQ"
+    write_wdq(path, counts, SCALING, INTERCEPT, hires=True)
+    with windaq.windaq(str(path)) as daq:
+        np.testing.assert_allclose(daq.data(1), counts[:, 0] * 0.25 * SCALING[0])
+        np.testing.assert_allclose(daq.data_many([1])[:, 0], counts[:, 0] * 0.25 * SCALING[0], rtol=1e-6)
+
+
+def test_read_recording_closes_file(wdq_path, counts, monkeypatch):
+    pytest.importorskip("PyQt6")  # EPGData reads its cache budget from the Qt settings
+    from EPGData import EPGData
+
+    opened = []
+    monkeypatch.setattr(windaq.windaq, "__enter__", lambda daq: opened.append(daq) or daq)
+    df, comments = EPGData().read_recording(wdq_path, channel_index=2)
+
+    assert len(opened) == 1 and opened[0].npdata is None
+    np.testing.assert_allclose(df["voltage"], expected(counts, 2))
+    assert comments == {}
+
+
+@pytest.fixture
+def marked_path(tmp_path, counts):
+    # ADC data point 3 * sample, since the 3 channels are interleaved;
+    # the stamps have bit 30 set, like any stamp after 2004
+    trailer = [
+        30,                                                        # plain
+        windaq._EVENT_STAMPED | 60, 1_600_000_100,                 # time stamped
+        windaq._EVENT_COMMENT | 90, 0,                             # commented
+        windaq._EVENT_STAMPED | windaq._EVENT_COMMENT | 120, 1_600_000_200, 6,  # both
+    ]
+    path = tmp_path / "marked.WDQ"
+    write_wdq(path, counts, SCALING, INTERCEPT, trailer=trailer, annotations=["pre", "post", "aux"],
+              comments=b"first\x00second\x00")
+    return str(path)
+
+
+def test_event_markers(marked_path):
+    with windaq.windaq(marked_path) as daq:
+        markers = daq.event_markers()
+    assert markers["index"].tolist() == [10, 20, 30, 40]
+    assert markers["timestamp"].tolist() == [-1, 1_600_000_100, -1, 1_600_000_200]
+    assert markers["comment"].tolist() == [None, None, "first", "second"]
+
+
+def test_event_markers_without_trailer(wdq_path):
+    with windaq.windaq(wdq_path) as daq:
+        assert len(daq.event_markers()) == 0
+
+
+def test_read_recording_comments(marked_path):
+    pytest.importorskip("PyQt6")
+    from EPGData import EPGData
+
+    df, comments = EPGData().read_recording(marked_path, channel_index=1)
+    assert "comments" not in df
+    assert comments == {10: "", 20: "2020-09-13 12:28:20", 30: "first", 40: "second"}
+
+
+def test_probe_matches_header(wdq_path):
+    info = windaq.probe(wdq_path)
+    with windaq.windaq(wdq_path) as daq:
+        assert info.nChannels == daq.nChannels == 3
+        assert info.sampleRate == pytest.approx(100.0)
+        assert info.duration == pytest.approx(daq.nSample * daq.timeStep)
+        assert info.annotations == ["pre", "post", "aux"]
+        assert info.fileCreated == daq.fileCreated
+
+
+def test_probe_pads_missing_annotations(tmp_path, counts):
+    path = tmp_path / "bare.WDQ"
+    write_wdq(path, counts, SCALING, INTERCEPT, annotations=["only"])
+    assert windaq.probe(str(path)).annotations == ["only", "", ""]
+
+
+def test_probe_is_cached_until_the_file_changes(wdq_path, counts):
+    first = windaq.probe(wdq_path)
+    assert windaq.probe(wdq_path) is first
+
+    write_wdq(wdq_path, counts[:500], SCALING, INTERCEPT, annotations=["a", "b", "c"])
+    changed = windaq.probe(wdq_path)
+    assert changed is not first
+    assert changed.duration == pytest.approx(5.0) and changed.annotations == ["a", "b", "c"]
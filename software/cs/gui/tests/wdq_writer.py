@@ -0,0 +1,52 @@
+import struct
+
+import numpy as np
+
+CHANNEL_TABLE = 112  # offset of the channel info tables
+CHANNEL_ENTRY = 36  # bytes per channel info entry
+
+
+def write_wdq(path, counts, cal_scaling, cal_intercept, time_step=0.01, trailer=(), annotations=(),
+              comments=b"", hires=False, created=1_600_000_000) -> None:
+    """
+    Writes a minimal WinDaq file with the header fields windaq.py reads.
+
+    Parameters:
+        path: Destination file.
+        counts (NDArray): Raw int16 ADC counts, shape (samples, channels).
+        cal_scaling (list[float]): Calibration slope of each channel.
+        cal_intercept (list[float]): Calibration intercept of each channel.
+        time_step (float): Seconds between samples of one channel.
+        trailer (list[int]): Event marker longs of the trailer.
+        annotations (list[str]): Annotation of each channel.
+        comments (bytes): Null-terminated event marker comments the trailer points into.
+        hires (bool): Whether the counts are 16-bit HiRes data.
+        created (int): Unix time the file was opened by acquisition.
+    """
+    counts = np.asarray(counts, dtype="<i2")
+    num_channels = counts.shape[1]
+    head_size = CHANNEL_TABLE + CHANNEL_ENTRY * num_channels
+    data = counts.tobytes()
+    trailer = np.asarray(trailer, dtype="<u4").tobytes()
+    anno = b"".join(a.encode() + b"\x00" for a in annotations)
+
+    head = bytearray(head_size)
+    struct.pack_into("B", head, 0, num_channels)
+    struct.pack_into("B", head, 4, CHANNEL_TABLE)
+    struct.pack_into("B", head, 5, CHANNEL_ENTRY)
+    struct.pack_into("<h", head, 6, head_size)
+    struct.pack_into("<L", head, 8, len(data))
+    struct.pack_into("<L", head, 12, len(trailer))
+    struct.pack_into("<H", head, 16, len(anno))
+    struct.pack_into("<d", head, 28, time_step)
+    struct.pack_into("<l", head, 36, created)
+    struct.pack_into("<l", head, 40, created)
+    struct.pack_into("<H", head, 100, 2 if hires else 0)
+    for c in range(num_channels):
+        offset = CHANNEL_TABLE + CHANNEL_ENTRY * c
+        struct.pack_into("<ffdd", head, offset, 1.0, 0.0, cal_scaling[c], cal_intercept[c])
+        head[offset + 24:offset + 30] = b"V\x00\x00\x00\x00\x00"
+        struct.pack_into("B", head, offset + 32, c + 1)
+
+    with open(path, "wb") as f:
+        f.write(bytes(head) + data + trailer + anno + comments)
@@ -0,0 +1,187 @@
+import json
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+
+import numpy as np
+
+
+class Instrumentation:
+    """
+    Opt-in timing of a plot window's hot paths.
+
+    Named timers keep a rolling window of their latest durations, from
+    which the overlay text and histograms are computed, and every timed
+    call is also kept (up to `trace_length` of them) as a trace event that
+    `export_trace` writes in the Chrome trace event format, readable by
+    chrome://tracing or Perfetto.
+
+    While disabled, timers and counters return immediately and nothing is
+    kept.
+    """
+    def __init__(self, name: str, enabled: bool = False, window: int = 600, trace_length: int = 100_000) -> None:
+        """
+        Parameters:
+            name (str): Name of the instrumented window, used in the trace.
+            enabled (bool): Whether to start recording right away.
+            window (int): Number of latest values kept per timer or counter.
+            trace_length (int): Number of latest trace events kept.
+        """
+        self.name = name
+        self.enabled = enabled
+        self.window = window
+        self.durations: dict[str, deque] = {}  # timer name : latest durations in seconds
+        self.counts: dict[str, deque] = {}  # counter name : latest values
+        self.dropped_frames: int = 0
+        self.trace: deque = deque(maxlen=trace_length)  # (name, start ns, duration ns, thread id)
+        self.origin_ns: int = time.perf_counter_ns()
+
+    def set_enabled(self, enabled: bool) -> None:
+        """
+        Starts or stops recording. Turning it on starts from an empty history.
+        """
+        if enabled and not self.enabled:
+            self.reset()
+        self.enabled = enabled
+
+    def reset(self) -> None:
+        self.durations.clear()
+        self.counts.clear()
+        self.trace.clear()
+        self.dropped_frames = 0
+        self.origin_ns = time.perf_counter_ns()
+
+    @contextmanager
+    def timer(self, name: str):
+        """
+        Times the body of a `with` block under `name`.
+        """
+        if not self.enabled:
+            yield
+            return
+        start = time.perf_counter_ns()
+        try:
+            yield
+        finally:
+            self.record(name, start, time.perf_counter_ns() - start)
+
+    def record(self, name: str, start_ns: int, duration_ns: int) -> None:
+        """
+        Records one timed call, for code that can't be wrapped in `timer`
+        (e.g. a span that ends in another method).
+
+        Parameters:
+            name (str): Timer name.
+            start_ns (int): perf_counter_ns() at the start of the call.
+            duration_ns (int): Duration of the call in nanoseconds.
+        """
+        if not self.enabled:
+            return
+        durations = self.durations.get(name)
+        if durations is None:
+            durations = self.durations.setdefault(name, deque(maxlen=self.window))
+        durations.append(duration_ns / 1e9)
+        self.trace.append((name, start_ns, duration_ns, threading.get_ident()))
+
+    def count(self, name: str, value: int) -> None:
+        """
+        Records the latest value of a counter, e.g. samples processed by a frame.
+        """
+        if not self.enabled:
+            return
+        counts = self.counts.get(name)
+        if counts is None:
+            counts = self.counts.setdefault(name, deque(maxlen=self.window))
+        counts.append(value)
+
+    def drop_frames(self, n: int = 1) -> None:
+        """
+        Counts frames that were skipped or late.
+        """
+        if self.enabled:
+            self.dropped_frames += n
+
+    def stats(self, name: str) -> dict[str, float] | None:
+        """
+        Returns mean, median, 95th percentile and max of a timer's rolling
+        window, in milliseconds, or None if it has no values.
+        """
+        durations = self.durations.get(name)
+        if not durations:
+            return None
+        ms = np.fromiter(durations, dtype=np.float64) * 1000
+        return {
+            "mean": float(ms.mean()),
+            "p50": float(np.percentile(ms, 50)),
+            "p95": float(np.percentile(ms, 95)),
+            "max": float(ms.max()),
+        }
+
+    def histogram(self, name: str, bins: int = 20) -> tuple[np.ndarray, np.ndarray] | None:
+        """
+        Returns (counts, bin edges in ms) of a timer's rolling window, or None if it has no values.
+        """
+        durations = self.durations.get(name)
+        if not durations:
+            return None
+        return np.histogram(np.fromiter(durations, dtype=np.float64) * 1000, bins=bins)
+
+    def summary(self, frame_timer: str = "frame") -> str:
+        """
+        Returns the overlay text: frame time, samples processed, dropped
+        frames, then the median and 95th percentile of every other timer.
+        """
+        lines = []
+        frame = self.stats(frame_timer)
+        if frame is not None:
+            lines.append(f"Frame: {frame['p50']:.1f} ms (p95 {frame['p95']:.1f}, max {frame['max']:.1f})")
+        samples = self.counts.get("samples")
+        if samples:
+            lines.append(f"Samples: {samples[-1]:,}")
+        lines.append(f"Dropped Frames: {self.dropped_frames}")
+        for name in sorted(self.durations):
+            if name == frame_timer:
+                continue
+            stats = self.stats(name)
+            lines.append(f"{name}: {stats['p50']:.2f} ms (p95 {stats['p95']:.2f})")
+        return "\n".join(lines)
+
+    def export_trace(self, path: str) -> None:
+        """
+        Writes the kept trace events, plus a histogram of each timer's
+        rolling window, as Chrome trace event JSON.
+
+        Parameters:
+            path (str): Destination file.
+
+        Raises:
+            OSError: If the file can't be written.
+        """
+        events = [
+            {
+                "name": name,
+                "cat": self.name,
+                "ph": "X",  # complete event
+                "ts": (start - self.origin_ns) / 1000,  # microseconds
+                "dur": duration / 1000,
+                "pid": 0,
+                "tid": tid,
+            }
+            for name, start, duration, tid in list(self.trace)
+        ]
+        histograms = {}
+        for name in list(self.durations):
+            counts, edges = self.histogram(name)
+            histograms[name] = {"bin_edges_ms": edges.tolist(), "counts": counts.tolist()}
+
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump({
+                "traceEvents": events,
+                "displayTimeUnit": "ms",
+                "otherData": {
+                    "window": self.name,
+                    "dropped_frames": self.dropped_frames,
+                    "histograms": histograms,
+                },
+            }, f)
@@ -0,0 +1,164 @@
+import numpy as np
+from numpy.typing import NDArray
+
+from utils.PeakKernel import peaks
+
+
+class MinMaxPyramid:
+    """
+    Precomputed min/max decimation of a waveform. Level k holds the min
+    and max of every block of 2**k samples, so a view spanning millions
+    of samples can be drawn from a few thousand precomputed bins.
+    """
+
+    def __init__(self, y: NDArray, min_level: int = 6) -> None:
+        """
+        Builds every level once, each from the one below it.
+
+        Parameters:
+            y (NDArray): The full waveform.
+            min_level (int): Smallest level kept. Views that would use a
+                finer level are cheap enough to decimate from raw samples.
+                The levels hold about 4 * len(y) / 2**min_level values in
+                all, so the default of 6 adds 1/16 of the waveform's memory
+                on top of it, and raw decimation is only used for windows
+                of up to 32 samples (views of about 64k samples at most).
+        """
+        self.min_level = min_level
+        self.levels: dict[int, tuple[NDArray, NDArray]] = {}  # level : (mins, maxs)
+
+        num_bins = len(y) >> min_level
+        if num_bins == 0:
+            return
+
+        blocks = y[:num_bins << min_level].reshape(num_bins, 1 << min_level)
+        mins, maxs = blocks.min(axis=1), blocks.max(axis=1)
+        level = min_level
+        while True:
+            self.levels[level] = (mins, maxs)
+            num_bins = len(mins) // 2
+            if num_bins == 0:
+                break
+            mins = np.minimum(mins[0:2 * num_bins:2], mins[1:2 * num_bins:2])
+            maxs = np.maximum(maxs[0:2 * num_bins:2], maxs[1:2 * num_bins:2])
+            level += 1
+
+    def nbytes(self) -> int:
+        """
+        Returns the memory held by all levels.
+        """
+        return sum(mins.nbytes + maxs.nbytes for mins, maxs in self.levels.values())
+
+    def level_for(self, stride: int) -> int | None:
+        """
+        Returns the finest level whose blocks are at least `stride` samples
+        wide, or None if raw samples should be used instead.
+        """
+        if not self.levels or stride <= 1:
+            return None
+        level = int(np.ceil(np.log2(stride)))
+        if level < self.min_level:
+            return None
+        return min(level, max(self.levels))
+
+    def peaks(self, x: NDArray, start: int, stop: int, level: int) -> tuple[NDArray, NDArray]:
+        """
+        Returns interleaved (max, min) points for the samples in [start, stop),
+        using the blocks of `level` that overlap that range.
+
+        Parameters:
+            x (NDArray): Sample times of the full waveform.
+            start (int): Index of the first visible sample.
+            stop (int): Index one past the last visible sample.
+            level (int): Pyramid level to read from.
+
+        Returns:
+            tuple[NDArray, NDArray]: x and y of the points to plot, two per block,
+            with x at the center of each block.
+        """
+        mins, maxs = self.levels[level]
+        first = start >> level
+        last = min(len(mins), -(-stop >> level))  # ceil division
+
+        block = 1 << level
+        centers = np.minimum(np.arange(first, last) * block + block // 2, len(x) - 1)
+        x_out = np.repeat(x[centers], 2)
+
+        y_out = np.empty(2 * (last - first), dtype=maxs.dtype)
+        y_out[::2] = maxs[first:last]
+        y_out[1::2] = mins[first:last]
+        return x_out, y_out
+
+
+def downsample(
+    x: NDArray, y: NDArray, x_range: tuple[float, float] = None, max_points=4000, method = 'peak',
+    pyramid: MinMaxPyramid = None
+) -> tuple[NDArray, NDArray]:
+    """
+    Downsamples waveform data in the visible range using the selected method.
+    Pure function of its inputs, so it can run off the GUI thread.
+
+    Parameters:
+        x (NDArray): Sample times of the full waveform.
+        y (NDArray): The full waveform.
+        x_range (tuple[float, float]): Optional x-axis range to downsample.
+        max_points (int): Max number of points to plot.
+        method (str): 'subsample', 'mean', or 'peak' downsampling method.
+        pyramid (MinMaxPyramid): Optional precomputed levels of y for 'peak'.
+
+    Returns:
+        tuple[NDArray, NDArray]: x and y of the points to plot.
+    
+    NOTE: 
+        `subsample` samples the first point of each bin (fastest)
+        `mean` averages each bin
+        `peak` returns the min and max point of each bin (slowest, best looking)
+    """
+    left_idx, right_idx = 0, len(x)
+
+    # Filter to x_range if provided
+    if x_range is not None:
+        x_min, x_max = x_range
+
+        left_idx = np.searchsorted(x, x_min, side="left")
+        right_idx = np.searchsorted(x, x_max, side="right")
+
+        if right_idx - left_idx <= 250: 
+            # render additional point on each side at very high zooms
+            left_idx = max(0, left_idx - 1)
+            right_idx = min(len(x), right_idx + 1)
+  
+    num_points = right_idx - left_idx
+
+    if num_points <= max_points or num_points < 2:  # no downsampling needed
+        return x[left_idx:right_idx], y[left_idx:right_idx]
+
+    if method == 'peak' and pyramid is not None:
+        # read precomputed blocks instead of touching every visible sample
+        level = pyramid.level_for(max(1, num_points // (max_points // 2)))
+        if level is not None:
+            return pyramid.peaks(x, left_idx, right_idx, level)
+
+    x = x[left_idx:right_idx]
+    y = y[left_idx:right_idx]
+
+    if method == 'subsampling': 
+        stride = num_points // max_points
+        x_out = x[::stride]
+        y_out = y[::stride]
+    elif method == 'mean':
+        stride = num_points // max_points
+        num_windows = num_points // stride
+        start_idx = stride // 2
+        x_out = x[start_idx : start_idx + num_windows * stride : stride] 
+        y_out = y[:num_windows * stride].reshape(num_windows,stride).mean(axis=1)
+    elif method == 'peak':
+        stride = max(1, num_points // (max_points // 2))  # each window gives 2 points
+        x_out, y_out = peaks(x, y, stride)
+    else:
+        raise ValueError(
+            'Invalid "method" arugment. ' \
+            'Please select either "subsampling", "mean", or "peak".'
+        )
+
+    return x_out, y_out
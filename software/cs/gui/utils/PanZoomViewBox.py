@@ -175,8 +175,8 @@ class PanZoomViewBox(ViewBox):
                     right_limit = float("inf")
             else:
                 xy_data = self.datawindow.xy_data
-                if xy_data[0].shape[0] > 0:
-                    data_max = self.datawindow.xy_data[0][-1]    
+                if len(xy_data) > 0:
+                    data_max = xy_data.last()[0]
                     right_limit = data_max + self.zoom_viewbox_limit * view_width
                 else:
                     right_limit = float("inf")
@@ -299,7 +299,7 @@ class PanZoomViewBox(ViewBox):
         snap_right.setShortcut(QKeySequence("Ctrl+]"))
 
         # Find which (if any) snaps to disable
-        idx = self.datawindow.labels.index(label_area)
+        idx = self.datawindow.label_index.position(label_area)
         left_touching = False
         right_touching = False
 
@@ -336,9 +336,11 @@ class PanZoomViewBox(ViewBox):
         elif selected_action == snap_left:
             label_area.set_transition_line("left", left_end)
             self.datawindow.selection._attempt_snap_and_merge(label_area.transition_line)
+            self.datawindow.update_label_intervals()
         elif selected_action == snap_right:
             label_area.set_transition_line("right", right_start)
             self.datawindow.selection._attempt_snap_and_merge(label_area.right_transition_line)
+            self.datawindow.update_label_intervals()
         else:
             pass
     
@@ -0,0 +1,88 @@
+import numpy as np
+from numpy.typing import NDArray
+
+try:
+    from numba import njit
+except ImportError:  # numba is optional, the NumPy path below is used instead
+    njit = None
+
+
+def _peaks_loop(x: NDArray, y: NDArray, stride: int, num_windows: int, x_out: NDArray, y_out: NDArray) -> None:
+    # one pass over y: each window's max and min are found together and
+    # written straight into their interleaved slots
+    center = stride // 2
+    for w in range(num_windows):
+        start = w * stride
+        hi = y[start]
+        lo = hi
+        for i in range(start + 1, start + stride):
+            v = y[i]
+            if v != v:  # NaN, which comparisons would skip: propagate it like np.max / np.min
+                hi = v
+                lo = v
+                break
+            if v > hi:
+                hi = v
+            elif v < lo:
+                lo = v
+        x_out[2 * w] = x[start + center]
+        x_out[2 * w + 1] = x[start + center]
+        y_out[2 * w] = hi
+        y_out[2 * w + 1] = lo
+
+
+_peaks_compiled = njit(cache=True, nogil=True)(_peaks_loop) if njit is not None else None
+
+
+def _peaks_numpy(x: NDArray, y: NDArray, stride: int, num_windows: int, x_out: NDArray, y_out: NDArray) -> None:
+    # reductions over a reshaped view of y, written into strided views of
+    # the outputs, so nothing the size of the input is copied
+    blocks = y[:num_windows * stride].reshape(num_windows, stride)
+    np.max(blocks, axis=1, out=y_out[0::2])
+    np.min(blocks, axis=1, out=y_out[1::2])
+    x_win = x[stride // 2 : stride // 2 + num_windows * stride : stride]
+    x_out[0::2] = x_win
+    x_out[1::2] = x_win
+
+
+def peaks(
+    x: NDArray, y: NDArray, stride: int, x_out: NDArray = None, y_out: NDArray = None
+) -> tuple[NDArray, NDArray]:
+    """
+    Peak-decimates y into interleaved (max, min) points, one pair per
+    window of `stride` samples, with x at the center of each window.
+    Trailing samples that don't fill a whole window are dropped. A window
+    holding a NaN (e.g. a gap in the recording) yields NaN for both its
+    max and min, on either path, as np.max / np.min and MinMaxPyramid do.
+
+    Compiled with numba when it is installed; otherwise falls back to
+    NumPy reductions over views of the input.
+
+    Parameters:
+        x (NDArray): Sample times, already sliced to the visible range.
+        y (NDArray): Samples, already sliced to the visible range.
+        stride (int): Samples per window (>= 1).
+        x_out (NDArray): Optional float64 buffer of at least 2 * windows
+            points to write x into; allocated if not given.
+        y_out (NDArray): Optional buffer for y, as for x_out.
+
+    Returns:
+        tuple[NDArray, NDArray]: Views of x_out and y_out holding exactly
+        2 * windows points.
+    """
+    num_windows = len(y) // stride
+    n = 2 * num_windows
+    if x_out is None or len(x_out) < n:
+        x_out = np.empty(n, dtype=np.float64)
+    if y_out is None or len(y_out) < n:
+        y_out = np.empty(n, dtype=np.float64)
+    x_out, y_out = x_out[:n], y_out[:n]
+
+    if num_windows == 0:
+        return x_out, y_out
+
+    if _peaks_compiled is not None and x.flags.c_contiguous and y.flags.c_contiguous:
+        _peaks_compiled(x, y, stride, num_windows, x_out, y_out)
+    else:
+        _peaks_numpy(x, y, stride, num_windows, x_out, y_out)
+    return x_out, y_out
@@ -17,14 +17,19 @@ class WindaqFileDialog(QDialog):
         self.setMinimumWidth(500)
         self.setModal(True)
 
-        # find list of winDAQ Channels
-        daq = wdq.windaq(filepath)
-        numOfChannels = len(daq._annotations)
-        channel_annotations = [f"{x+1}: {daq.chAnnotation(x+1)}" for x in range(numOfChannels-1)]
+        # find list of winDAQ Channels (header only, doesn't read the recording)
+        info = wdq.probe(filepath)
+        channel_annotations = [f"{x+1}: {info.annotations[x]}" for x in range(info.nChannels)]
         self.selected_channel_index = -1
 
         main_layout = QVBoxLayout(self)
 
+        recording_label = QLabel(
+            f"{os.path.basename(filepath)}: {info.nChannels} channels, "
+            f"{info.sampleRate:g} Hz, {info.duration / 3600:.2f} h, created {info.fileCreated}"
+        )
+        main_layout.addWidget(recording_label)
+
         info_label = QLabel("Please select the channel you wish to load as 'Voltage':")
         main_layout.addWidget(info_label)
 